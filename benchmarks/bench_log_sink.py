@@ -0,0 +1,138 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Compares the log records throughput of the buffered log sink against the
+previous implementation of MotionBuilderEngine._emit_log_message, which
+created a new formatter and printed each record as it was emitted.
+
+Usage::
+
+    python benchmarks/bench_log_sink.py [--records 100000]
+"""
+
+import argparse
+import importlib.util
+import io
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakes"))
+
+import pyfbsdk  # noqa: E402 - the stand-in from the fakes folder.
+
+
+def _load_log_sink():
+    """
+    Load the log_sink module on its own, without importing the whole
+    tk_motionbuilder package.
+    """
+    path = os.path.join(ROOT, "python", "tk_motionbuilder", "log_sink.py")
+    spec = importlib.util.spec_from_file_location("log_sink", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _make_records(count):
+    """
+    Build log records similar to the ones emitted by toolkit when debug
+    logging is enabled: mostly debug, some info and a few errors.
+    """
+    records = []
+    for i in range(count):
+        if i % 1000 == 999:
+            level = logging.ERROR
+        elif i % 10 == 0:
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        record = logging.LogRecord(
+            "sgtk.env.project.tk-motionbuilder",
+            level,
+            __file__,
+            i,
+            "Resolving template %s for context %s",
+            ("maya_shot_work", i),
+            None,
+        )
+        record.basename = "tk-motionbuilder"
+        records.append(record)
+    return records
+
+
+def _legacy_emit(record, stream):
+    """
+    The previous MotionBuilderEngine._emit_log_message implementation.
+    """
+    if record.levelno < logging.INFO:
+        formatter = logging.Formatter("Debug: PTR %(basename)s: %(message)s")
+    else:
+        formatter = logging.Formatter("PTR %(basename)s: %(message)s")
+
+    msg = formatter.format(record)
+
+    if record.levelno < logging.ERROR:
+        print(msg, file=stream)
+    else:
+        pyfbsdk.FBMessageBox("PTR Error", str(msg), "OK")
+
+
+def bench_legacy(records):
+    stream = io.StringIO()
+    start = time.perf_counter()
+    for record in records:
+        _legacy_emit(record, stream)
+    return time.perf_counter() - start
+
+
+def bench_buffered(records, max_batch_size):
+    log_sink = _load_log_sink()
+    stream = io.StringIO()
+    sink = log_sink.BufferedLogSink(
+        lambda msg: print(msg, file=stream),
+        logging.Formatter("PTR %(basename)s: %(message)s"),
+        debug_formatter=logging.Formatter("Debug: PTR %(basename)s: %(message)s"),
+        error_handler=lambda msg, record: pyfbsdk.FBMessageBox("PTR Error", msg, "OK"),
+        max_batch_size=max_batch_size,
+        buffer_size=len(records),
+    )
+    # Pretend the flush timer is running, and flush by hand as it would.
+    sink._timer = object()
+    start = time.perf_counter()
+    for i, record in enumerate(records, 1):
+        sink.emit(record)
+        if i % max_batch_size == 0:
+            sink.flush(max_batch_size)
+    sink.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    records = _make_records(args.records)
+    for name, duration in (
+        ("legacy", bench_legacy(records)),
+        ("buffered", bench_buffered(records, args.batch_size)),
+    ):
+        print(
+            "%-10s %8.3fs %12.0f records/s" % (name, duration, len(records) / duration)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the Motionbuilder ``pyfbsdk`` module, used by the benchmarks.
+
+Only implements what the engine uses, and records the calls made to it
+instead of displaying anything.
+"""
+
+# Messages passed to FBMessageBox, as (title, message) tuples.
+message_boxes = []
+
+
+def FBMessageBox(title, message, button1, button2=None, button3=None):
+    message_boxes.append((title, message))
+    return 1
+
+
+class FBSystem(object):
+    Version = 26000.0
+
+
+class FBEvent(object):
+    """
+    Motionbuilder event a handler can be added to.
+    """
+
+    def __init__(self):
+        self.handlers = []
+
+    def Add(self, handler):
+        self.handlers.append(handler)
+
+    def Remove(self, handler):
+        self.handlers.remove(handler)
+
+    def RemoveAll(self):
+        del self.handlers[:]
+
+    def fire(self, control, event):
+        for handler in list(self.handlers):
+            handler(control, event)
+
+
+class FBTime(object):
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def GetSecondDouble(self):
+        return self.seconds
+
+    def GetFrame(self):
+        return int(round(self.seconds * 30))
+
+
+class FBFCurveKey(object):
+    def __init__(self, time, value):
+        self.Time = FBTime(time)
+        self.Value = value
+        self.Interpolation = 2
+        self.TangentMode = 0
+        self.TangentClampMode = 0
+        self.TangentConstantMode = 0
+        self.TangentBreak = False
+        self.LeftDerivative = 0.0
+        self.RightDerivative = 0.0
+        self.LeftTangentWeight = 0.333
+        self.RightTangentWeight = 0.333
+        self.Tension = 0.0
+        self.Continuity = 0.0
+        self.Bias = 0.0
+
+
+class FBFCurve(object):
+    def __init__(self, keys=()):
+        self.Keys = [FBFCurveKey(time, value) for time, value in keys]
+
+
+class FBTake(object):
+    def __init__(self, name):
+        self.Name = name
+
+
+class FBAnimationNode(object):
+    def __init__(self, name, parent=None, fcurve=None):
+        self.Name = name
+        self.Parent = parent
+        self.FCurve = fcurve
+        self.Nodes = []
+
+
+class FBModel(object):
+    def __init__(self, name):
+        self.Name = self.LongName = name
+        self.AnimationNode = FBAnimationNode(name)
+
+
+class FBScene(object):
+    def __init__(self):
+        self.Takes = []
+        self.Characters = []
+        self.Cameras = []
+        self.Components = []
+        self.OnChange = FBEvent()
+
+
+FBSystem.Scene = FBScene()
+FBSystem.CurrentTake = None
+FBSystem.OnConnectionDataNotify = FBEvent()
+
+
+class FBStoryFolder(object):
+    def __init__(self):
+        self.Tracks = []
+        self.Childs = []
+
+
+class FBStory(object):
+    RootFolder = FBStoryFolder()
+
+
+class FBEventMenu(object):
+    def __init__(self, name, id):
+        self.Name = name
+        self.Id = id
+
+
+class FBGenericMenuItem(object):
+    def __init__(self, caption, id, menu=None):
+        self.Caption = caption
+        self.Id = id
+        self.Menu = menu
+
+
+class FBGenericMenu(object):
+    """
+    Menu holding a list of items, recording the number of calls made to it.
+    """
+
+    # Number of calls made to menu methods, across all menus.
+    call_count = 0
+
+    def __init__(self):
+        self.items = []
+        self.OnMenuActivate = FBEvent()
+
+    @classmethod
+    def _count(cls):
+        cls.call_count += 1
+
+    def _insert(self, index, name, id, submenu):
+        self._count()
+        item = FBGenericMenuItem(name, id, submenu)
+        self.items.insert(index, item)
+        return item
+
+    def InsertFirst(self, name, id, submenu=None):
+        return self._insert(0, name, id, submenu)
+
+    def InsertLast(self, name, id, submenu=None):
+        return self._insert(len(self.items), name, id, submenu)
+
+    def InsertBefore(self, before_item, name, id, submenu=None):
+        return self._insert(self.items.index(before_item), name, id, submenu)
+
+    def InsertAfter(self, after_item, name, id, submenu=None):
+        return self._insert(self.items.index(after_item) + 1, name, id, submenu)
+
+    def DeleteItem(self, item):
+        self._count()
+        self.items.remove(item)
+
+    def GetFirstItem(self):
+        self._count()
+        return self.items[0] if self.items else None
+
+    def GetNextItem(self, item):
+        self._count()
+        index = self.items.index(item) + 1
+        return self.items[index] if index < len(self.items) else None
+
+    def GetItem(self, id):
+        self._count()
+        for item in self.items:
+            if item.Id == id:
+                return item
+        return None
+
+    def click(self, name):
+        """
+        Simulate a click on the item with the given name.
+        """
+        for item in self.items:
+            if item.Caption == name:
+                self.OnMenuActivate.fire(self, FBEventMenu(name, item.Id))
+                return
+        raise KeyError(name)
+
+    def dump(self, indent=0):
+        """
+        :returns: A list of strings describing the menu hierarchy.
+        """
+        lines = []
+        for item in self.items:
+            lines.append("%s%s" % ("  " * indent, item.Caption or "----"))
+            if item.Menu:
+                lines.extend(item.Menu.dump(indent + 1))
+        return lines
+
+
+class FBMenuManager(object):
+    # Menus of the main menu bar, by name.
+    menus = {}
+
+    def GetMenu(self, name):
+        FBGenericMenu._count()
+        return self.menus.get(name)
+
+    def InsertBefore(self, before_menu, before_name, name):
+        FBGenericMenu._count()
+        self.menus[name] = FBGenericMenu()
+
+
+class FBApplication(object):
+    FBXFileName = ""
+    OnFileNewCompleted = FBEvent()
+    OnFileOpenCompleted = FBEvent()
+
+    def FileSave(self, path, options=None):
+        with open(path, "wb") as fh:
+            fh.write(b"FBX")
+        FBApplication.FBXFileName = path
+        return True
+
+
+class FBElementAction(object):
+    kFBElementActionSave = 0
+    kFBElementActionAppend = 1
+    kFBElementActionMerge = 2
+    kFBElementActionDiscard = 3
+
+
+class FBFbxOptions(object):
+    def __init__(self, load, filename=None):
+        self.load = load
+        self.EmbedMedia = True
+        self.UseASCIIFormat = False
+        self.SaveSelectedModelsOnly = False
+        self.ShowFileDialog = False
+        self.ShowOptionsDialog = False
+
+
+class FBFilePopupStyle(object):
+    kFBFilePopupSave = 1
+
+
+class FBFilePopup(object):
+    def Execute(self):
+        return False
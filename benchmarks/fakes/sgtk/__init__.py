@@ -0,0 +1,33 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the Toolkit ``sgtk`` package, used by the benchmarks.
+
+Only implements what the engine and its hooks use.
+"""
+
+from . import util
+from . import platform
+from .platform import Context
+
+support_url = "https://www.autodesk.com/support"
+
+
+class TankError(Exception):
+    pass
+
+
+class TankEngineInitError(TankError):
+    pass
+
+
+def get_hook_baseclass():
+    return platform.HookBase
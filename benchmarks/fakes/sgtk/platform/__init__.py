@@ -0,0 +1,278 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for ``sgtk.platform``: a simplified engine running the same
+initialization sequence as Toolkit core.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import tempfile
+
+from . import constants
+
+_current_engine = None
+
+
+def get_logger(name):
+    return logging.getLogger("sgtk.%s" % name)
+
+
+def current_engine():
+    return _current_engine
+
+
+def start_engine(engine_name, tk, context):
+    env_name = tk.execute_core_hook("pick_environment", context=context)
+    env = tk.pipeline_configuration.get_environment(env_name, context)
+    return tk.engine_class(tk, context, engine_name, env)
+
+
+def change_context(new_context):
+    _current_engine.change_context(new_context)
+
+
+class Context(object):
+    def __init__(self, project=None, entity=None, step=None, task=None, tk=None):
+        self.project = project
+        self.entity = entity
+        self.step = step
+        self.task = task
+        self.user = None
+        self.tk = tk
+        self.additional_entities = []
+        self.source_entity = None
+
+    def __str__(self):
+        parts = [e["name"] for e in (self.project, self.entity, self.task) if e]
+        return ", ".join(parts)
+
+    def __eq__(self, other):
+        return isinstance(other, Context) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(str(self.to_dict()))
+
+    def to_dict(self):
+        return {
+            "project": self.project,
+            "entity": self.entity,
+            "step": self.step,
+            "task": self.task,
+        }
+
+    @classmethod
+    def from_dict(cls, tk, data):
+        return cls(tk=tk, **data)
+
+    @property
+    def sgtk(self):
+        return self.tk
+
+    @property
+    def shotgun_url(self):
+        entity = self.task or self.entity or self.project
+        return "https://example.shotgrid.autodesk.com/detail/%s/%d" % (
+            entity["type"],
+            entity["id"],
+        )
+
+    @property
+    def filesystem_locations(self):
+        return [os.path.join("/projects", str(self))]
+
+
+class Descriptor(object):
+    def __init__(self, uri):
+        self._uri = uri
+
+    def get_uri(self):
+        return self._uri
+
+
+class Environment(object):
+    """
+    An environment: the engine settings and the apps it runs, each app being
+    described by a dictionary with ``class``, ``settings`` and ``uri`` keys.
+    """
+
+    def __init__(self, name, engine_name, engine_settings, apps, disk_location=None):
+        self.name = name
+        self.disk_location = disk_location
+        self.engine_name = engine_name
+        self.engine_settings = engine_settings
+        self.apps = apps
+
+    def get_engines(self):
+        return [self.engine_name]
+
+    def get_engine_descriptor(self, engine_name):
+        return Descriptor("sgtk:descriptor:path?path=tk-motionbuilder")
+
+    def get_engine_settings(self, engine_name):
+        return self.engine_settings
+
+    def get_apps(self, engine_name):
+        return list(self.apps)
+
+    def get_app_descriptor(self, engine_name, app_name):
+        return Descriptor(self.apps[app_name].get("uri", app_name))
+
+
+class _LogHandler(logging.Handler):
+    def __init__(self, engine):
+        logging.Handler.__init__(self)
+        self._engine = engine
+
+    def emit(self, record):
+        record.basename = record.name.rsplit(".", 1)[-1]
+        self._engine._emit_log_message(self, record)
+
+
+class TankBundle(object):
+    disk_location = None
+
+    def import_module(self, module_name):
+        python_folder = os.path.join(self.disk_location, "python")
+        if python_folder not in sys.path:
+            sys.path.insert(0, python_folder)
+        return importlib.import_module(module_name)
+
+    def get_setting(self, name, default=None):
+        return self.settings.get(name, default)
+
+
+class Application(TankBundle):
+    def __init__(self, engine, instance_name, settings):
+        self.engine = engine
+        self.instance_name = instance_name
+        self.settings = settings
+        self.display_name = instance_name.replace("tk-multi-", "").title()
+        self.documentation_url = "https://help.autodesk.com"
+        self.disk_location = engine.disk_location
+        self.logger = get_logger("env.%s" % instance_name)
+
+    def init_app(self):
+        pass
+
+    def destroy_app(self):
+        pass
+
+
+class Engine(TankBundle):
+    def __init__(self, tk, context, engine_instance_name, env):
+        global _current_engine
+
+        self.tk = tk
+        self.sgtk = tk
+        self.context = context
+        self.instance_name = engine_instance_name
+        self.env = env
+        self.descriptor = env.get_engine_descriptor(engine_instance_name)
+        self.settings = dict(env.engine_settings)
+        self.has_ui = True
+        self.commands = {}
+        self.apps = {}
+        self._currently_initializing_app = None
+        self.logger = get_logger("env.%s.%s" % (env.name, engine_instance_name))
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self._log_handler = _LogHandler(self)
+        self.logger.addHandler(self._log_handler)
+
+        _current_engine = self
+        self.init_engine()
+        self.pre_app_init()
+        self._load_apps()
+        self.post_app_init()
+
+    @property
+    def environment(self):
+        return {"name": self.env.name, "disk_location": self.env.disk_location}
+
+    @property
+    def cache_location(self):
+        return os.path.join(
+            tempfile.gettempdir(), "tk-motionbuilder-benchmarks", self.instance_name
+        )
+
+    @property
+    def shotgun(self):
+        return self.tk.shotgun
+
+    def _load_apps(self):
+        for app_name, app_info in self.env.apps.items():
+            if app_name in self.apps:
+                continue
+            app = app_info["class"](self, app_name, app_info.get("settings", {}))
+            app.descriptor = self.env.get_app_descriptor(self.instance_name, app_name)
+            self._currently_initializing_app = app
+            try:
+                app.init_app()
+            finally:
+                self._currently_initializing_app = None
+            self.apps[app_name] = app
+
+    def register_command(self, name, callback, properties=None):
+        properties = dict(properties or {})
+        if self._currently_initializing_app:
+            properties["app"] = self._currently_initializing_app
+        self.commands[name] = {"callback": callback, "properties": properties}
+
+    def change_context(self, new_context):
+        old_context = self.context
+        self.context = new_context
+        self.post_context_change(old_context, new_context)
+
+    def destroy(self):
+        global _current_engine
+
+        for app in self.apps.values():
+            app.destroy_app()
+        self.destroy_engine()
+        self.logger.removeHandler(self._log_handler)
+        if _current_engine is self:
+            _current_engine = None
+
+    def log_debug(self, msg, *args, **kwargs):
+        self.logger.debug(msg, *args, **kwargs)
+
+    def _initialize_dark_look_and_feel(self):
+        pass
+
+    # hooks implemented by the engines
+    def init_engine(self):
+        pass
+
+    def pre_app_init(self):
+        pass
+
+    def post_app_init(self):
+        pass
+
+    def post_context_change(self, old_context, new_context):
+        pass
+
+    def destroy_engine(self):
+        pass
+
+    def _emit_log_message(self, handler, record):
+        pass
+
+
+class HookBase(object):
+    def __init__(self, parent=None):
+        self.parent = parent
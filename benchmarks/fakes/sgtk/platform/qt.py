@@ -0,0 +1,151 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Minimal QtCore/QtGui stand-ins. Timers are queued in a fake event loop run
+with :func:`process_events`.
+"""
+
+import heapq
+import itertools
+import time
+
+_queue = []
+_counter = itertools.count()
+_timers = []
+
+
+def process_events(duration=0.0):
+    """
+    Run the due timer callbacks, for the given duration in seconds.
+    """
+    end = time.perf_counter() + duration
+    while True:
+        now = time.perf_counter()
+        for timer in list(_timers):
+            if timer.active and now >= timer.due:
+                timer.due = now + timer.interval / 1000.0
+                timer.timeout.emit()
+        if _queue and _queue[0][0] <= now:
+            _, _, callback = heapq.heappop(_queue)
+            callback()
+            continue
+        if now >= end:
+            return
+        time.sleep(0.0005)
+
+
+class Signal(object):
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            del self._slots[:]
+        else:
+            self._slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class _QTimer(object):
+    def __init__(self, parent=None):
+        self.interval = 0
+        self.active = False
+        self.due = 0
+        self.timeout = Signal()
+
+    @staticmethod
+    def singleShot(msec, callback):
+        heapq.heappush(
+            _queue, (time.perf_counter() + msec / 1000.0, next(_counter), callback)
+        )
+
+    def setInterval(self, msec):
+        self.interval = msec
+
+    def start(self, msec=None):
+        if msec is not None:
+            self.interval = msec
+        self.active = True
+        self.due = time.perf_counter() + self.interval / 1000.0
+        if self not in _timers:
+            _timers.append(self)
+
+    def stop(self):
+        self.active = False
+        if self in _timers:
+            _timers.remove(self)
+
+    def isActive(self):
+        return self.active
+
+
+class _QCoreApplication(object):
+    @staticmethod
+    def processEvents():
+        process_events()
+
+
+class QtCore(object):
+    QTimer = _QTimer
+    Signal = Signal
+    QCoreApplication = _QCoreApplication
+
+    class Qt(object):
+        NonModal = 0
+        ApplicationModal = 2
+
+
+class _QProgressDialog(object):
+    def __init__(self, label, cancel_label, minimum, maximum, parent=None):
+        self.value = minimum
+        self.maximum = maximum
+        self.visible = False
+        self.canceled = False
+
+    def setWindowTitle(self, title):
+        pass
+
+    def setWindowModality(self, modality):
+        pass
+
+    def setMinimumDuration(self, msec):
+        pass
+
+    def setAutoClose(self, close):
+        pass
+
+    def setAutoReset(self, reset):
+        pass
+
+    def setValue(self, value):
+        self.value = value
+
+    def wasCanceled(self):
+        return self.canceled
+
+    def show(self):
+        self.visible = True
+
+    def close(self):
+        self.visible = False
+
+    def deleteLater(self):
+        pass
+
+
+class QtGui(object):
+    QProgressDialog = _QProgressDialog
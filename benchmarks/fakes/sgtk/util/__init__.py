@@ -0,0 +1,44 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import sys
+
+from . import filesystem
+
+
+def is_linux():
+    return sys.platform.startswith("linux")
+
+
+def is_windows():
+    return sys.platform == "win32"
+
+
+def is_macos():
+    return sys.platform == "darwin"
+
+
+class ShotgunPath(object):
+    @staticmethod
+    def normalize(path):
+        return os.path.normpath(path)
+
+
+class LocalFileStorageManager(object):
+    CACHE = "cache"
+    PREFERENCES = "preferences"
+    LOGGING = "logging"
+
+    root = None
+
+    @classmethod
+    def get_site_root(cls, hostname, path_type, generation=None):
+        return os.path.join(cls.root, path_type, "site")
@@ -0,0 +1,34 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Stand-in for the Motionbuilder batch process exporting a take, used by the
+benchmarks.
+
+Reads its job like the take export script, spends
+``TK_MOTIONBUILDER_STAND_IN_DELAY`` seconds exporting, and writes the take
+name to the destination.
+"""
+
+import json
+import os
+import time
+
+with open(os.environ["TK_MOTIONBUILDER_TAKE_EXPORT_JOB"], "r") as fh:
+    job = json.load(fh)
+
+time.sleep(float(os.environ.get("TK_MOTIONBUILDER_STAND_IN_DELAY", "0.2")))
+
+os.makedirs(os.path.dirname(job["destination"]), exist_ok=True)
+with open(job["destination"], "w") as fh:
+    fh.write(job["take"])
+
+with open(job["result"], "w") as fh:
+    json.dump({"destination": job["destination"]}, fh)
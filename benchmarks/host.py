@@ -0,0 +1,249 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Simulated Motionbuilder host for the benchmarks.
+
+Importing this module puts the stand-in ``pyfbsdk`` and ``sgtk`` modules
+from the ``fakes`` folder on the path and loads the engine. The helpers
+below build synthetic configurations and start the engine with them.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS_ROOT = os.path.dirname(os.path.abspath(__file__))
+ENGINE_ROOT = os.path.dirname(BENCHMARKS_ROOT)
+
+sys.path.insert(0, os.path.join(BENCHMARKS_ROOT, "fakes"))
+
+import pyfbsdk  # noqa: E402
+import sgtk  # noqa: E402
+from sgtk.platform import qt  # noqa: E402
+
+ENGINE_INSTANCE_NAME = "tk-motionbuilder"
+MENU_NAME = "Flow Production Tracking"
+
+# Default values of the engine settings, from info.yml.
+ENGINE_SETTINGS = {
+    "menu_favourites": [],
+    "compatibility_dialog_min_version": 2027,
+    "log_flush_interval": 250,
+    "log_max_batch_size": 500,
+    "log_buffer_size": 10000,
+    "error_report_interval": 30,
+    "context_cache_size": 32,
+    "context_cache_persist": False,
+    "follow_file_open": False,
+    "context_prefetch": True,
+    "launcher_max_workers": 4,
+    "save_staging_folder": "",
+    "save_transfer_retries": 3,
+    "usage_stats": True,
+    "usage_stats_max_size": 512,
+    "menu_recent_commands": 0,
+    "command_palette_shortcut": "",
+    "menu_layout_cache": True,
+}
+
+
+def _load_engine_module():
+    spec = importlib.util.spec_from_file_location(
+        "tk_motionbuilder_engine", os.path.join(ENGINE_ROOT, "engine.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+engine_module = _load_engine_module()
+
+
+class SimulatedEngine(engine_module.MotionBuilderEngine):
+    """
+    The Motionbuilder engine, running from this repository.
+    """
+
+    disk_location = ENGINE_ROOT
+
+    def _initialize_dark_look_and_feel(self):
+        # the stand-in Qt modules have no application or palette.
+        pass
+
+    def _get_dialog_parent(self):
+        return None
+
+
+def make_app_class(command_count, context_command_count=0):
+    """
+    Build an app class registering the given number of commands.
+    """
+
+    class SimulatedApp(sgtk.platform.Application):
+        def init_app(self):
+            for i in range(command_count):
+                self.engine.register_command(
+                    "%s command %d" % (self.instance_name, i), lambda: None
+                )
+            for i in range(context_command_count):
+                self.engine.register_command(
+                    "%s context command %d" % (self.instance_name, i),
+                    lambda: None,
+                    {"type": "context_menu"},
+                )
+
+    return SimulatedApp
+
+
+def make_environment(command_count, commands_per_app=10, name="shot_step"):
+    """
+    Build an environment whose apps register the given number of commands.
+
+    Every fifth app registers a single command, displayed at the root of the
+    menu, and the first app adds a command to the context menu. The first
+    command of every third app is a favourite.
+    """
+    apps = {}
+    favourites = []
+    remaining = command_count
+    index = 0
+    while remaining > 0:
+        app_name = "tk-multi-app%04d" % index
+        count = 1 if index % 5 == 4 else min(commands_per_app, remaining)
+        apps[app_name] = {
+            "class": make_app_class(count, 1 if index == 0 else 0),
+            "uri": "sgtk:descriptor:app_store?name=%s&version=v1.0.0" % app_name,
+        }
+        if index % 3 == 0:
+            favourites.append(
+                {"app_instance": app_name, "name": "%s command 0" % app_name}
+            )
+        remaining -= count
+        index += 1
+
+    settings = dict(ENGINE_SETTINGS, menu_favourites=favourites)
+    return sgtk.platform.Environment(
+        name,
+        ENGINE_INSTANCE_NAME,
+        settings,
+        apps,
+        disk_location=_write_environment_file(name, settings, apps),
+    )
+
+
+def _write_environment_file(name, settings, apps):
+    """
+    Write a configuration file for an environment, only touching it when its
+    content changes so the menu layout cache stays valid across runs.
+
+    :returns: Path to the file.
+    """
+    content = json.dumps(
+        {"settings": settings, "apps": sorted(apps)}, indent=2, sort_keys=True
+    )
+    folder = os.path.join(
+        tempfile.gettempdir(),
+        "tk-motionbuilder-benchmarks",
+        "env",
+        hashlib.sha1(content.encode("utf-8")).hexdigest()[:8],
+    )
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "%s.yml" % name)
+    if not os.path.exists(path):
+        with open(path, "w") as fh:
+            fh.write(content)
+    return path
+
+
+class SimulatedPipelineConfiguration(object):
+    def __init__(self, environments, config_location):
+        self._environments = environments
+        self._config_location = config_location
+
+    def get_environment(self, env_name, context=None, writable=False):
+        return self._environments[env_name]
+
+    def get_config_location(self):
+        return self._config_location
+
+
+class SimulatedShotgun(object):
+    """
+    Flow Production Tracking connection answering queries after a delay.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def find_one(self, entity_type, filters, fields=None):
+        time.sleep(self.latency)
+        return {"type": entity_type, "id": filters[0][2]}
+
+
+class SimulatedTk(object):
+    """
+    Toolkit API instance picking the environment from the context, shots
+    using ``shot_step`` and assets ``asset_step``.
+    """
+
+    engine_class = SimulatedEngine
+    shotgun_url = "https://example.shotgrid.autodesk.com"
+
+    def __init__(self, environments, config_location=ENGINE_ROOT, latency=0.0):
+        self.shotgun = SimulatedShotgun(latency)
+        self.pipeline_configuration = SimulatedPipelineConfiguration(
+            dict((env.name, env) for env in environments), config_location
+        )
+
+    def execute_core_hook(self, hook_name, context=None, **kwargs):
+        if context.entity and context.entity["type"] == "Asset":
+            return "asset_step"
+        return "shot_step"
+
+    def context_from_path(self, path, previous_context=None):
+        name = os.path.splitext(os.path.basename(path))[0]
+        return make_context(sum(ord(c) for c in name), tk=self)
+
+
+def make_context(entity_id, entity_type="Shot", tk=None):
+    """
+    Build a context for the given shot or asset.
+    """
+    return sgtk.Context(
+        {"type": "Project", "id": 1, "name": "Project"},
+        {
+            "type": entity_type,
+            "id": entity_id,
+            "name": "%s%04d" % (entity_type, entity_id),
+        },
+        tk=tk,
+    )
+
+
+def start_engine(tk, context):
+    """
+    Start the engine for the given context, destroying the running one.
+    """
+    engine = sgtk.platform.current_engine()
+    if engine:
+        engine.destroy()
+    return sgtk.platform.start_engine(ENGINE_INSTANCE_NAME, tk, context)
+
+
+def get_menu():
+    """
+    :returns: The stand-in FBGenericMenu of the engine.
+    """
+    return pyfbsdk.FBMenuManager.menus.get(MENU_NAME)
@@ -0,0 +1,509 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Times the engine startup, menu build, context switch, log output and engine
+refresh against a simulated Motionbuilder host, and writes the results as
+json so runs can be compared across releases.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py [--output results.json] [--sizes 10 100 1000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import host
+from host import pyfbsdk, qt, sgtk
+
+
+def _time(func, repeat):
+    """
+    Call the given function several times.
+
+    :returns: A dictionary with the minimum and median durations in ms.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1e3)
+    return {
+        "repeat": repeat,
+        "min_ms": min(durations),
+        "median_ms": statistics.median(durations),
+    }
+
+
+def bench_startup(command_count, repeat):
+    tk = host.SimulatedTk([host.make_environment(command_count)])
+    context = host.make_context(1, tk=tk)
+    result = _time(lambda: host.start_engine(tk, context), repeat)
+    sgtk.platform.current_engine().destroy()
+    return result
+
+
+def bench_menu(command_count, repeat):
+    tk = host.SimulatedTk([host.make_environment(command_count)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    generator = engine._menu_generator
+
+    def build():
+        generator.destroy_menu()
+        generator.create_menu()
+
+    pyfbsdk.FBGenericMenu.call_count = 0
+    create = _time(build, repeat)
+    create["menu_calls"] = pyfbsdk.FBGenericMenu.call_count // repeat
+
+    pyfbsdk.FBGenericMenu.call_count = 0
+    destroy = _time(generator.destroy_menu, 1)
+    destroy["menu_calls"] = pyfbsdk.FBGenericMenu.call_count
+    generator.create_menu()
+
+    contexts = [host.make_context(i + 2, tk=tk) for i in range(repeat)]
+    contexts = iter(contexts)
+    pyfbsdk.FBGenericMenu.call_count = 0
+    switch = _time(lambda: engine.change_context(next(contexts)), repeat)
+    switch["menu_calls"] = pyfbsdk.FBGenericMenu.call_count // repeat
+
+    engine.destroy()
+    return {
+        "create_menu": create,
+        "destroy_menu": destroy,
+        "post_context_change": switch,
+    }
+
+
+def bench_command_index(command_count, query="app0 command 1"):
+    """
+    Time the command palette searches, one per keystroke, and the index
+    update after a context change.
+    """
+    tk = host.SimulatedTk([host.make_environment(command_count)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    generator = engine._menu_generator
+
+    start = time.perf_counter()
+    index = generator.command_index
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    keystrokes = []
+    for i in range(1, len(query) + 1):
+        start = time.perf_counter()
+        index.search(query[:i])
+        keystrokes.append((time.perf_counter() - start) * 1e3)
+
+    engine.change_context(host.make_context(2, tk=tk))
+    start = time.perf_counter()
+    generator.command_index
+    update_ms = (time.perf_counter() - start) * 1e3
+
+    engine.destroy()
+    return {
+        "entries": len(index),
+        "build_ms": build_ms,
+        "update_ms": update_ms,
+        "max_keystroke_ms": max(keystrokes),
+        "median_keystroke_ms": statistics.median(keystrokes),
+    }
+
+
+def bench_log(record_count):
+    tk = host.SimulatedTk([host.make_environment(10)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    # the records are printed by the sink, keep them out of the output.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(record_count):
+            engine.logger.debug("Resolving template %s for %d", "shot_work", i)
+            if i % 500 == 499:
+                # the flush timer firing
+                engine._log_sink.flush(500)
+        engine._log_sink.flush()
+        duration = time.perf_counter() - start
+    result = {
+        "records": record_count,
+        "duration_ms": duration * 1e3,
+        "records_per_second": record_count / duration,
+        "dropped": engine._log_sink.dropped_count,
+    }
+    engine.destroy()
+    return result
+
+
+def bench_engine_refresh(command_count, repeat):
+    tk_motionbuilder = sgtk.platform.TankBundle.import_module(
+        host.SimulatedEngine, "tk_motionbuilder"
+    )
+    engine_refresh = getattr(tk_motionbuilder, "__engine_refresh")
+    shot_env = host.make_environment(command_count, name="shot_step")
+    asset_env = host.make_environment(command_count // 2 or 1, name="asset_step")
+    for env in (shot_env, asset_env):
+        env.engine_settings = dict(env.engine_settings, follow_file_open=True)
+    tk = host.SimulatedTk([shot_env, asset_env])
+    os.environ["TANK_MOTIONBUILDER_ENGINE_INIT_NAME"] = host.ENGINE_INSTANCE_NAME
+    host.start_engine(tk, host.make_context(1, tk=tk))
+
+    # opening a file of another shot switches the context in place.
+    ids = iter(range(2, repeat * 2 + 2))
+
+    def open_file():
+        pyfbsdk.FBApplication.FBXFileName = "/shots/%s.fbx" % chr(next(ids))
+        pyfbsdk.FBApplication.OnFileOpenCompleted.fire(None, None)
+
+    in_place = _time(open_file, repeat)
+
+    # switching between shots and assets changes the apps, the engine restarts.
+    types = iter(["Asset", "Shot"] * repeat)
+    restart = _time(
+        lambda: engine_refresh(tk, host.make_context(next(ids), next(types), tk=tk)),
+        repeat,
+    )
+    sgtk.platform.current_engine().destroy()
+    pyfbsdk.FBApplication.FBXFileName = ""
+    return {"in_place": in_place, "restart": restart}
+
+
+def bench_context_prefetch(switch_count, latency):
+    """
+    Switch context and read the context values a menu command would need,
+    prefetched in the background and then computed on demand.
+    """
+    results = {}
+    for prefetch in (True, False):
+        env = host.make_environment(10)
+        env.engine_settings = dict(env.engine_settings, context_prefetch=prefetch)
+        tk = host.SimulatedTk([env], latency=latency)
+        engine = host.start_engine(tk, host.make_context(1, tk=tk))
+        durations = []
+        for i in range(switch_count):
+            engine.change_context(host.make_context(i + 2, tk=tk))
+            # the user picking the command in the menu
+            time.sleep(latency * 2)
+            start = time.perf_counter()
+            engine.context_prefetcher.get(engine.context, "entity_details")
+            durations.append((time.perf_counter() - start) * 1e3)
+        results["prefetch" if prefetch else "on_demand"] = {
+            "shotgun_latency_ms": latency * 1e3,
+            "median_get_ms": statistics.median(durations),
+            "metrics": engine.get_context_prefetch_metrics(),
+        }
+        engine.destroy()
+    return results
+
+
+def bench_fingerprint(curve_count, key_count=100, edit_count=10):
+    """
+    Time fingerprinting a take of a synthetic scene, the first time, again
+    without changes and again after a few curves were edited.
+    """
+    tk = host.SimulatedTk([host.make_environment(10)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    fingerprinter = engine.take_fingerprinter
+
+    scene = pyfbsdk.FBSystem().Scene
+    keys = [(i / 30.0, float(i % 7)) for i in range(key_count)]
+    curves = []
+    for i in range(curve_count // 10):
+        model = pyfbsdk.FBModel("Model%05d" % i)
+        for name in ("Lcl Translation", "Lcl Rotation", "Lcl Scaling"):
+            node = pyfbsdk.FBAnimationNode(name, model.AnimationNode)
+            model.AnimationNode.Nodes.append(node)
+            for axis in "XYZ":
+                curve = pyfbsdk.FBAnimationNode(axis, node, pyfbsdk.FBFCurve(keys))
+                node.Nodes.append(curve)
+                curves.append(curve)
+        curve = pyfbsdk.FBAnimationNode(
+            "Visibility", model.AnimationNode, pyfbsdk.FBFCurve(keys)
+        )
+        model.AnimationNode.Nodes.append(curve)
+        curves.append(curve)
+        scene.Components.append(model)
+    scene.Takes.append(pyfbsdk.FBTake("Take 001"))
+
+    def fingerprint():
+        curves_read = fingerprinter.curves_read
+        start = time.perf_counter()
+        result = fingerprinter.fingerprint_takes(["Take 001"])["Take 001"]
+        return (
+            result,
+            (time.perf_counter() - start) * 1e3,
+            fingerprinter.curves_read - curves_read,
+        )
+
+    cold, cold_ms, cold_read = fingerprint()
+    warm, warm_ms, warm_read = fingerprint()
+    for curve in curves[:: len(curves) // edit_count][:edit_count]:
+        curve.FCurve.Keys[0].Value += 1.0
+        pyfbsdk.FBSystem.OnConnectionDataNotify.fire(
+            None, type("Event", (), {"Plug": curve})()
+        )
+    edited, edited_ms, edited_read = fingerprint()
+
+    del scene.Components[:]
+    del scene.Takes[:]
+    engine.destroy()
+    return {
+        "curves": len(curves),
+        "keys_per_curve": key_count,
+        "cold_ms": cold_ms,
+        "cold_curves_read": cold_read,
+        "unchanged_ms": warm_ms,
+        "unchanged_curves_read": warm_read,
+        "edited_ms": edited_ms,
+        "edited_curves_read": edited_read,
+        "edit_detected": cold == warm and edited != warm,
+    }
+
+
+def bench_take_export(take_count, delay, worker_counts=(1, 4)):
+    """
+    Time exporting takes from worker processes, running the stand-in
+    exporter, for each number of workers.
+    """
+    tk = host.SimulatedTk([host.make_environment(10)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    tk_motionbuilder = engine.import_module("tk_motionbuilder")
+    command = [
+        sys.executable,
+        os.path.join(os.path.dirname(__file__), "fakes", "take_export_stand_in.py"),
+    ]
+    os.environ["TK_MOTIONBUILDER_STAND_IN_DELAY"] = str(delay)
+
+    results = {"takes": take_count, "worker_delay_s": delay}
+    output_folder = tempfile.mkdtemp(prefix="tk-motionbuilder-benchmarks-")
+    for worker_count in worker_counts:
+        pool = tk_motionbuilder.TakeExportPool(command, max_workers=worker_count)
+        for i in range(take_count):
+            pool.add(
+                "Take %03d" % i,
+                os.path.join(output_folder, str(worker_count), "take%03d.fbx" % i),
+            )
+        start = time.perf_counter()
+        pool.start(os.path.join(output_folder, "scene.fbx"))
+        for i in range(take_count):
+            pool.wait("Take %03d" % i)
+        results["%d_workers_s" % worker_count] = time.perf_counter() - start
+        pool.shutdown()
+
+    engine.destroy()
+    return results
+
+
+def bench_publish_hash(size_mb, publish_delay):
+    """
+    Time hashing a published session file in the background while the
+    publish goes on, a sleep standing in for the copy and registration,
+    against hashing it before publishing, and check the next version of an
+    identical file is detected.
+    """
+    tk = host.SimulatedTk([host.make_environment(10)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    tk_motionbuilder = engine.import_module("tk_motionbuilder")
+    folder = tempfile.mkdtemp(prefix="tk-motionbuilder-benchmarks-")
+    hash_index = tk_motionbuilder.PublishHashIndex(
+        os.path.join(folder, "publish_hashes.json")
+    )
+    paths = [os.path.join(folder, "scene_v%03d.fbx" % i) for i in (1, 2)]
+    chunk = os.urandom(1024 * 1024)
+    for path in paths:
+        with open(path, "wb") as fh:
+            for _ in range(size_mb):
+                fh.write(chunk)
+
+    start = time.perf_counter()
+    digest = tk_motionbuilder.hash_file(paths[0])
+    time.sleep(publish_delay)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    future = hash_index.hash_file_async(paths[0])
+    time.sleep(publish_delay)
+    future.result()
+    overlapped = time.perf_counter() - start
+
+    hash_index.set(paths[0], digest, os.path.getsize(paths[0]), {"id": 1})
+    hash_index.save()
+    previous = tk_motionbuilder.PublishHashIndex(hash_index.path).get(paths[1])
+    identical = (
+        previous is not None
+        and hash_index.hash_file_async(paths[1]).result() == previous["hash"]
+    )
+
+    hash_index.shutdown()
+    engine.destroy()
+    for path in paths + [hash_index.path]:
+        os.remove(path)
+    os.rmdir(folder)
+    return {
+        "file_mb": size_mb,
+        "publish_delay_s": publish_delay,
+        "sequential_s": sequential,
+        "overlapped_s": overlapped,
+        "identical_detected": identical,
+    }
+
+
+def check_event_handlers(switch_count):
+    """
+    Switch context many times and check the menu event handlers don't pile up.
+    """
+    tk = host.SimulatedTk([host.make_environment(50)])
+    engine = host.start_engine(tk, host.make_context(1, tk=tk))
+    menu = host.get_menu()
+    initial = len(menu.OnMenuActivate.handlers)
+    initial_registered = engine._menu_generator.event_handler_count
+    for i in range(switch_count):
+        engine.change_context(host.make_context(i % 10 + 2, tk=tk))
+    result = {
+        "context_switches": switch_count,
+        "root_handlers_before": initial,
+        "root_handlers_after": len(menu.OnMenuActivate.handlers),
+        "registered_before": initial_registered,
+        "registered_after": engine._menu_generator.event_handler_count,
+    }
+    engine.destroy()
+    result["root_handlers_after_destroy"] = len(menu.OnMenuActivate.handlers)
+    result["passed"] = (
+        result["root_handlers_after"] == initial
+        and result["registered_after"] == initial_registered
+        and result["root_handlers_after_destroy"] == 0
+    )
+    return result
+
+
+def _git_revision():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=host.ENGINE_ROOT,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--log-records", type=int, default=50000)
+    args = parser.parse_args()
+
+    # keep the engine log output out of the way
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "git_revision": _git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+            },
+            "sizes": {},
+            "log": bench_log(args.log_records),
+            "event_handlers": check_event_handlers(1000),
+            "context_prefetch": bench_context_prefetch(10, 0.02),
+            "take_export": bench_take_export(16, 0.2),
+            "fingerprint": bench_fingerprint(10000),
+            "publish_hash": bench_publish_hash(256, 0.5),
+        }
+        for size in args.sizes:
+            results["sizes"][str(size)] = {
+                "startup": bench_startup(size, args.repeat),
+                "menu": bench_menu(size, args.repeat),
+                "engine_refresh": bench_engine_refresh(size, args.repeat),
+                "command_index": bench_command_index(size),
+            }
+
+    with open(args.output, "w") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+
+    for size, size_results in results["sizes"].items():
+        print(
+            "%5s commands: startup %.2f ms, create_menu %.2f ms, "
+            "post_context_change %.2f ms, in-place refresh %.2f ms, restart %.2f ms, "
+            "palette keystroke %.2f ms"
+            % (
+                size,
+                size_results["startup"]["median_ms"],
+                size_results["menu"]["create_menu"]["median_ms"],
+                size_results["menu"]["post_context_change"]["median_ms"],
+                size_results["engine_refresh"]["in_place"]["median_ms"],
+                size_results["engine_refresh"]["restart"]["median_ms"],
+                size_results["command_index"]["max_keystroke_ms"],
+            )
+        )
+    print("log output: %.0f records/s" % results["log"]["records_per_second"])
+    print(
+        "entity details after a context switch: %.2f ms prefetched, %.2f ms on demand"
+        % (
+            results["context_prefetch"]["prefetch"]["median_get_ms"],
+            results["context_prefetch"]["on_demand"]["median_get_ms"],
+        )
+    )
+    print(
+        "%d takes exported in %.2fs with 1 worker, %.2fs with 4 workers"
+        % (
+            results["take_export"]["takes"],
+            results["take_export"]["1_workers_s"],
+            results["take_export"]["4_workers_s"],
+        )
+    )
+    print(
+        "take fingerprint of %d curves: %.1f ms cold, %.1f ms unchanged, "
+        "%.1f ms after editing %d curves (%s)"
+        % (
+            results["fingerprint"]["curves"],
+            results["fingerprint"]["cold_ms"],
+            results["fingerprint"]["unchanged_ms"],
+            results["fingerprint"]["edited_ms"],
+            results["fingerprint"]["edited_curves_read"],
+            "detected" if results["fingerprint"]["edit_detected"] else "MISSED",
+        )
+    )
+    print(
+        "publish of a %d MB session file: %.2fs hashing first, %.2fs hashing "
+        "in the background (identical republish %s)"
+        % (
+            results["publish_hash"]["file_mb"],
+            results["publish_hash"]["sequential_s"],
+            results["publish_hash"]["overlapped_s"],
+            "detected" if results["publish_hash"]["identical_detected"] else "MISSED",
+        )
+    )
+    print(
+        "event handlers after %d context switches: %s"
+        % (
+            results["event_handlers"]["context_switches"],
+            "ok" if results["event_handlers"]["passed"] else "LEAKING",
+        )
+    )
+    print("results written to %s" % args.output)
+    return 0 if results["event_handlers"]["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
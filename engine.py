@@ -13,9 +13,12 @@ A MotionBuilder engine for Shotgun.
 
 """
 
+import contextlib
 import logging
 import math
+import os
 import sys
+import time
 
 # application libs
 import pyfbsdk
@@ -28,6 +31,13 @@ VERSION_NEWEST_SUPPORTED = 2027
 # Caution: make sure compatibility_dialog_min_version default value in info.yml
 # is equal to VERSION_NEWEST_SUPPORTED
 
+# Give a standard format to the log messages:
+#     PTR <basename>: <message>
+# where "basename" is the leaf part of the logging record name,
+# for example "tk-multi-shotgunpanel" or "qt_importer".
+LOG_FORMATTER = logging.Formatter("PTR %(basename)s: %(message)s")
+DEBUG_LOG_FORMATTER = logging.Formatter("Debug: PTR %(basename)s: %(message)s")
+
 
 # custom exception handler for motion builder
 def sgtk_mobu_exception_trap(ex_cls, ex, tb):
@@ -47,6 +57,16 @@ def sgtk_mobu_exception_trap(ex_cls, ex, tb):
     except Exception:
         pass
 
+    # report it through the engine, identical errors are grouped and shown in
+    # a single non-modal dialog.
+    try:
+        engine = sgtk.platform.current_engine()
+        if engine and getattr(engine, "error_aggregator", None):
+            engine.error_aggregator.add_exception(ex_cls, ex, tb)
+            return
+    except Exception:
+        pass
+
     # now output it
     try:
         from sgtk.util.qt_importer import QtImporter
@@ -62,6 +82,17 @@ def sgtk_mobu_exception_trap(ex_cls, ex, tb):
 
 class MotionBuilderEngine(sgtk.platform.Engine):
     _version_year = None
+    _log_sink = None
+    _error_aggregator = None
+    _startup_tracer = None
+    _process_launcher = None
+    _context_prefetcher = None
+    _command_palette_shortcut = None
+    _usage_stats = None
+    _file_transfer_queue = None
+    _scene_inventory = None
+    _take_fingerprinter = None
+    _publish_hash_index = None
 
     @property
     def version_year(self):
@@ -110,6 +141,150 @@ class MotionBuilderEngine(sgtk.platform.Engine):
 
         return host_info
 
+    @property
+    def error_aggregator(self):
+        """
+        The :class:`~tk_motionbuilder.ErrorAggregator` reporting the errors
+        logged or raised in Motionbuilder, or None if the engine hasn't been
+        initialized.
+        """
+        return self._error_aggregator
+
+    @property
+    def process_launcher(self):
+        """
+        The :class:`~tk_motionbuilder.ProcessLauncher` starting external
+        processes, like file browsers, without blocking Motionbuilder.
+        """
+        return self._process_launcher
+
+    @property
+    def file_transfer_queue(self):
+        """
+        The :class:`~tk_motionbuilder.FileTransferQueue` moving the files saved
+        to the local staging folder to their final location, or None if saves
+        aren't staged.
+        """
+        return self._file_transfer_queue
+
+    @property
+    def scene_inventory(self):
+        """
+        The :class:`~tk_motionbuilder.SceneInventory` listing the takes,
+        characters, cameras and story clips of the scene, traversed once
+        until the scene changes.
+        """
+        if self._scene_inventory is None:
+            tk_motionbuilder = self.import_module("tk_motionbuilder")
+            self._scene_inventory = tk_motionbuilder.SceneInventory()
+        return self._scene_inventory
+
+    @property
+    def take_fingerprinter(self):
+        """
+        The :class:`~tk_motionbuilder.SceneFingerprinter` computing the
+        fingerprints of the takes of the scene, to only publish the takes
+        which changed.
+        """
+        if self._take_fingerprinter is None:
+            tk_motionbuilder = self.import_module("tk_motionbuilder")
+            self._take_fingerprinter = tk_motionbuilder.SceneFingerprinter()
+        return self._take_fingerprinter
+
+    @property
+    def publish_hash_index(self):
+        """
+        The :class:`~tk_motionbuilder.PublishHashIndex` recording the content
+        hashes of the published session files, to detect identical
+        republishes.
+        """
+        if self._publish_hash_index is None:
+            tk_motionbuilder = self.import_module("tk_motionbuilder")
+            self._publish_hash_index = tk_motionbuilder.PublishHashIndex(
+                os.path.join(self.cache_location, "publish_hashes.json")
+            )
+        return self._publish_hash_index
+
+    @property
+    def context_prefetcher(self):
+        """
+        The :class:`~tk_motionbuilder.ContextPrefetcher` holding the values
+        derived from the engine contexts, like their Flow Production Tracking
+        url and their locations on disk.
+        """
+        return self._context_prefetcher
+
+    def show_command_palette(self):
+        """
+        Show the command palette, to search and run the Flow Production
+        Tracking commands from the keyboard.
+        """
+        self._menu_generator.show_command_palette(self._get_dialog_parent())
+
+    def get_error_history(self):
+        """
+        Return the distinct errors which occurred during this session, including
+        the ones which were not shown when they happened.
+
+        :returns: A list of dictionaries with ``message``, ``count``,
+            ``first_seen`` and ``last_seen`` keys, oldest first.
+        """
+        if self._error_aggregator is None:
+            return []
+        return self._error_aggregator.get_history()
+
+    def get_context_prefetch_metrics(self):
+        """
+        Return timings for the values derived from the contexts, like their
+        Flow Production Tracking url and their locations on disk.
+
+        :returns: A list of dictionaries, one per value, with the number of
+            times it was served from the prefetched values, and the number of
+            times and average time in milliseconds it was computed in the
+            background and on demand.
+        """
+        if self._context_prefetcher is None:
+            return []
+        return self._context_prefetcher.get_metrics()
+
+    def get_usage_stats(self):
+        """
+        Return the statistics of the commands run in this and the previous
+        sessions.
+
+        :returns: A list of dictionaries, one per command, with its name, the
+            number of times it ran, its average and maximum duration in
+            milliseconds and when it was last used, slowest first.
+        """
+        if self._usage_stats is None:
+            return []
+        return self._usage_stats.get_stats()
+
+    def export_usage_stats(self, path):
+        """
+        Export the statistics of the commands run, see :meth:`get_usage_stats`.
+
+        :param str path: Path to the file to write, a csv file if it ends with
+            ``.csv``, a json file otherwise.
+        """
+        if self._usage_stats is None:
+            raise sgtk.TankError("Usage statistics are disabled.")
+        self._usage_stats.export(path)
+
+    def get_command_metrics(self):
+        """
+        Return timings for the menu commands run during this session.
+
+        :returns: A list of dictionaries, one per command, with the number of
+            times it ran, the number of activations ignored because it was
+            already waiting to run, and the average and maximum delay between
+            the click and the command starting and command duration, in
+            milliseconds.
+        """
+        if not getattr(self, "_menu_generator", None):
+            return []
+        return self._menu_generator.dispatcher.get_metrics()
+
     @property
     def context_change_allowed(self):
         """
@@ -118,6 +293,7 @@ class MotionBuilderEngine(sgtk.platform.Engine):
         return True
 
     def init_engine(self):
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
         self.logger.debug("%s: Initializing..." % self)
 
         if self.context.project is None:
@@ -130,9 +306,76 @@ class MotionBuilderEngine(sgtk.platform.Engine):
         # motionbuilder doesn't have good exception handling, so install our own trap
         sys.excepthook = sgtk_mobu_exception_trap
 
+        tk_motionbuilder = self.import_module("tk_motionbuilder")
+
+        # startup phases are recorded and written to a Chrome trace file if
+        # enabled through the SGTK_MOTIONBUILDER_STARTUP_TRACE environment
+        # variable.
+        self._startup_tracer = tk_motionbuilder.StartupTracer.from_environment(
+            wall_start
+        )
+
+        # contexts resolved from the files opened are cached for the session.
+        tk_motionbuilder.get_context_cache().configure(
+            max_size=self.get_setting("context_cache_size"),
+            persist=self.get_setting("context_cache_persist"),
+        )
+
+        # the engine follows the context of the files opened, if enabled.
+        if self.get_setting("follow_file_open"):
+            tk_motionbuilder.watch_file_open(self.sgtk)
+
+        # errors are grouped and reported at most once per interval rather
+        # than with a modal dialog per occurrence.
+        self._error_aggregator = tk_motionbuilder.ErrorAggregator(
+            report_interval=self.get_setting("error_report_interval"),
+            dialog_parent=self._get_dialog_parent,
+        )
+
+        # log messages are buffered and written to the script editor in
+        # batches once Qt is available, see pre_app_init.
+        self._log_sink = tk_motionbuilder.BufferedLogSink(
+            _write_log_message,
+            LOG_FORMATTER,
+            debug_formatter=DEBUG_LOG_FORMATTER,
+            error_handler=self._error_aggregator.add_record,
+            flush_interval=self.get_setting("log_flush_interval"),
+            max_batch_size=self.get_setting("log_max_batch_size"),
+            buffer_size=self.get_setting("log_buffer_size"),
+        )
+
+        # file browsers and other external processes are started from
+        # worker threads.
+        self._process_launcher = tk_motionbuilder.ProcessLauncher(
+            max_workers=self.get_setting("launcher_max_workers")
+        )
+
+        # saves are written to a local folder and transferred to their
+        # final location in the background, if enabled.
+        staging_folder = self.get_setting("save_staging_folder")
+        if staging_folder:
+            self._file_transfer_queue = tk_motionbuilder.FileTransferQueue(
+                os.path.expanduser(os.path.expandvars(staging_folder)),
+                retries=self.get_setting("save_transfer_retries"),
+            )
+
+        # values derived from the context are computed in the background
+        # once the engine is running and after each context change.
+        self._context_prefetcher = tk_motionbuilder.ContextPrefetcher()
+
+        if self._startup_tracer:
+            self._startup_tracer.add_span("init_engine", wall_start, cpu_start)
+
     def pre_app_init(self):
         from sgtk.platform.qt import QtGui
 
+        if self._startup_tracer:
+            self._startup_tracer.begin("pre_app_init")
+
+        if self.has_ui:
+            self._log_sink.start()
+            self._error_aggregator.start()
+
         url_doc_supported_versions = "https://help.autodesk.com/view/SGDEV/ENU/?guid=SGD_si_integrations_engine_supported_versions_html"
 
         if self.version_year < VERSION_OLDEST_COMPATIBLE:
@@ -283,13 +526,36 @@ Please report any issues to:
                     ),
                 )
 
+        if self._startup_tracer:
+            self._startup_tracer.end()
+            # time each app initialization until post_app_init is called.
+            self._startup_tracer.begin("apps")
+            self._startup_tracer.trace_calls("init_app", _get_app_span_name)
+
     def post_app_init(self):
         """
         Executes once all apps have been initialized
         """
-        # Initialie the SG Toolkit style to the application.
-        self._initialize_dark_look_and_feel()
-        self._initialize_menu()
+        if self._startup_tracer:
+            self._startup_tracer.stop_tracing_calls()
+            self._startup_tracer.end()
+
+        with self._startup_span("post_app_init"):
+            self._register_command_palette()
+
+            # Initialie the SG Toolkit style to the application.
+            with self._startup_span("_initialize_dark_look_and_feel"):
+                self._initialize_dark_look_and_feel()
+            with self._startup_span("_initialize_menu"):
+                self._initialize_menu()
+            self._initialize_command_palette_shortcut()
+
+        self._prefetch_context()
+
+        if self._startup_tracer:
+            path = self._startup_tracer.write()
+            self.logger.info("Startup trace written to %s", path)
+            self._startup_tracer = None
 
     def post_context_change(self, old_context, new_context):
         """
@@ -299,8 +565,14 @@ Please report any issues to:
         :param new_context: The sgtk.context.Context being switched to.
         """
         self.logger.debug("tk-motionbuilder context changed to %s", str(new_context))
-        self._menu_generator.destroy_menu()
-        self._initialize_menu()
+        # the commands are registered again by the apps for the new context.
+        self._register_command_palette()
+        self._menu_generator.update_menu()
+        self.logger.debug(
+            "%d menu event handlers registered.",
+            self._menu_generator.event_handler_count,
+        )
+        self._prefetch_context()
 
     def destroy_engine(self):
         """
@@ -309,6 +581,62 @@ Please report any issues to:
         self.logger.debug("%s: Destroying..." % self)
         self._menu_generator.destroy_menu()
 
+        # write out any pending log message, the ones emitted from now on
+        # are written right away.
+        if self._log_sink:
+            self._log_sink.stop()
+
+        if self._error_aggregator:
+            self._error_aggregator.stop()
+            self._error_aggregator.clear()
+
+        if self._command_palette_shortcut is not None:
+            self._command_palette_shortcut.setEnabled(False)
+            self._command_palette_shortcut.deleteLater()
+            self._command_palette_shortcut = None
+
+        if self._usage_stats:
+            self._usage_stats.stop()
+
+        if self._process_launcher:
+            self._process_launcher.shutdown()
+
+        # the files saved to the staging folder must reach their destination
+        # before Motionbuilder exits.
+        if self._file_transfer_queue:
+            self._file_transfer_queue.shutdown()
+
+        if self._context_prefetcher:
+            self._context_prefetcher.shutdown()
+
+        if self._scene_inventory:
+            self._scene_inventory.close()
+
+        if self._take_fingerprinter:
+            self._take_fingerprinter.close()
+
+        if self._publish_hash_index:
+            self._publish_hash_index.shutdown()
+
+    def _prefetch_context(self):
+        """
+        Start computing the values derived from the current context in the
+        background, if enabled.
+        """
+        if self.get_setting("context_prefetch"):
+            self._context_prefetcher.prefetch(self.context)
+
+    def _startup_span(self, name):
+        """
+        Return a context manager recording a span in the startup trace, or
+        doing nothing if startup tracing is disabled.
+
+        :param str name: Name of the span.
+        """
+        if self._startup_tracer is None:
+            return contextlib.nullcontext()
+        return self._startup_tracer.span(name)
+
     def _initialize_dark_look_and_feel(self):
         """
         Override the base engine method.
@@ -363,11 +691,68 @@ Please report any issues to:
         to reflect currently loaded apps.
         """
         tk_motionbuilder = self.import_module("tk_motionbuilder")
+
+        layout_cache = None
+        if self.get_setting("menu_layout_cache"):
+            layout_cache = tk_motionbuilder.MenuLayoutCache(
+                os.path.join(self.cache_location, "menu_layout")
+            )
+
+        if self.get_setting("usage_stats"):
+            self._usage_stats = tk_motionbuilder.UsageStats(
+                os.path.join(self.cache_location, "usage_stats.jsonl"),
+                max_size=self.get_setting("usage_stats_max_size") * 1024,
+            )
+            self._usage_stats.start()
+
         self._menu_generator = tk_motionbuilder.MenuGenerator(
-            self, "Flow Production Tracking"
+            self,
+            "Flow Production Tracking",
+            layout_cache=layout_cache,
+            usage_stats=self._usage_stats,
         )
         self._menu_generator.create_menu()
 
+    def _register_command_palette(self):
+        """
+        Register the command showing the command palette, listed in the
+        context menu, unless it is already registered.
+        """
+        if "Command Palette..." in self.commands:
+            return
+        self.register_command(
+            "Command Palette...",
+            self.show_command_palette,
+            {
+                "type": "context_menu",
+                "short_name": "command_palette",
+                "description": "Search and run the Flow Production Tracking "
+                "commands.",
+            },
+        )
+
+    def _initialize_command_palette_shortcut(self):
+        """
+        Add the keyboard shortcut showing the command palette to the
+        Motionbuilder main window.
+        """
+        shortcut = self.get_setting("command_palette_shortcut")
+        if not self.has_ui or not shortcut:
+            return
+
+        from sgtk.platform.qt import QtCore, QtGui
+
+        main_window = self._get_dialog_parent()
+        if main_window is None:
+            self.logger.debug("No main window to add the command palette shortcut to.")
+            return
+
+        self._command_palette_shortcut = QtGui.QShortcut(
+            QtGui.QKeySequence(shortcut), main_window
+        )
+        self._command_palette_shortcut.setContext(QtCore.Qt.ApplicationShortcut)
+        self._command_palette_shortcut.activated.connect(self.show_command_palette)
+
     def _emit_log_message(self, handler, record):
         """
         Called by the engine to log messages in Mobu script editor.
@@ -378,19 +763,48 @@ Please report any issues to:
         :param record: Standard python logging record.
         :type record: :class:`~python.logging.LogRecord`
         """
-        # Give a standard format to the message:
-        #     Shotgun <basename>: <message>
-        # where "basename" is the leaf part of the logging record name,
-        # for example "tk-multi-shotgunpanel" or "qt_importer".
+        if self._log_sink:
+            self._log_sink.emit(record)
+            return
+
+        # the engine hasn't been initialized yet, output the message right away.
         if record.levelno < logging.INFO:
-            formatter = logging.Formatter("Debug: PTR %(basename)s: %(message)s")
+            msg = DEBUG_LOG_FORMATTER.format(record)
         else:
-            formatter = logging.Formatter("PTR %(basename)s: %(message)s")
-
-        msg = formatter.format(record)
+            msg = LOG_FORMATTER.format(record)
 
         if record.levelno < logging.ERROR:
-            print(msg)
+            _write_log_message(msg)
         else:
-            # for errors, pop up a modal msgbox
-            pyfbsdk.FBMessageBox("PTR Error", str(msg), "OK")
+            _show_log_error(msg)
+
+
+def _get_app_span_name(frame):
+    """
+    Return the startup trace span name for a call to an ``init_app`` method.
+
+    :param frame: The frame of the call.
+    :returns: The span name, or None if the call isn't an app initialization.
+    """
+    app = frame.f_locals.get("self")
+    if not isinstance(app, sgtk.platform.Application):
+        return None
+    return "init_app %s" % app.instance_name
+
+
+def _write_log_message(msg):
+    """
+    Output the given message in the Mobu script editor.
+
+    :param str msg: The message to print.
+    """
+    print(msg)
+
+
+def _show_log_error(msg):
+    """
+    Pop up a modal message box for the given error message.
+
+    :param str msg: The error message to display.
+    """
+    pyfbsdk.FBMessageBox("PTR Error", str(msg), "OK")
@@ -58,6 +58,13 @@ class MotionBuilderSessionCollector(HookBaseClass):
                 "to publish plugins via the collected item's "
                 "properties. ",
             },
+            "Collect Scene Items": {
+                "type": "bool",
+                "default": False,
+                "description": "Also collect the takes, characters, cameras "
+                "and story clips of the scene as child items of the session, "
+                "for plugins publishing them individually.",
+            },
         }
 
         # update the base settings with these settings
@@ -131,4 +138,50 @@ class MotionBuilderSessionCollector(HookBaseClass):
 
         self.logger.info("Collected current Motion Builder scene")
 
+        if settings.get("Collect Scene Items").value:
+            self.collect_scene_items(session_item)
+
         return session_item
+
+    def collect_scene_items(self, session_item):
+        """
+        Creates child items of the session for its takes, characters, cameras
+        and story clips.
+
+        The scene is only traversed once, and the details of each element,
+        like the frame range of a take, are only computed when a plugin needs
+        them, through the ``scene_element`` property of the items.
+
+        :param session_item: Item of the current session.
+        :returns: The list of items created.
+        """
+
+        publisher = self.parent
+
+        icon_path = os.path.join(
+            self.disk_location, os.pardir, "icons", "motionbuilder.png"
+        )
+
+        items = []
+        for element in publisher.engine.scene_inventory.get_elements():
+            item = session_item.create_item(
+                "motionbuilder.fbx.%s" % (element.kind,),
+                _SCENE_ITEM_TYPES[element.kind],
+                element.name,
+            )
+            item.set_icon_from_path(icon_path)
+            item.properties["scene_element"] = element
+            items.append(item)
+
+        self.logger.info("Collected %d Motion Builder scene items" % (len(items),))
+
+        return items
+
+
+# display names of the items collected for each kind of scene element.
+_SCENE_ITEM_TYPES = {
+    "take": "Motion Builder Take",
+    "character": "Motion Builder Character",
+    "camera": "Motion Builder Camera",
+    "story_clip": "Motion Builder Story Clip",
+}
@@ -9,8 +9,8 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import time
 import sgtk
-from sgtk.util.filesystem import ensure_folder_exists
 
 from pyfbsdk import FBApplication, FBFilePopup, FBFilePopupStyle
 
@@ -85,6 +85,12 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
         however only the most recent publish will be available to other users.
         Warnings will be provided during validation if there are previous
         publishes.
+
+        <h3>Identical publishes</h3>
+        The content hash of each published file is recorded, and publishing a
+        file identical to the previous publish of the same path, a re-run
+        after a failed finalize for example, logs a warning, or reuses the
+        previous publish rather than copying and registering the file again.
         """ % (loader_url,)
 
     @property
@@ -110,6 +116,8 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
         # inherit the settings from the base publish plugin
         base_settings = super().settings or {}
 
+        tk_motionbuilder = _tk_motionbuilder()
+
         # settings specific to this class
         mobu_publish_settings = {
             "Publish Template": {
@@ -119,6 +127,47 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
                 "correspond to a template defined in "
                 "templates.yml.",
             },
+            "Version Up Mode": {
+                "type": "str",
+                "default": "save",
+                "description": "How the work file is bumped to the next version "
+                "after publishing. 'save' saves the session again to the next "
+                "version, 'copy' copies the file saved for the publish, which is "
+                "much faster for big scenes, and points Motion Builder to the "
+                "copy. The session is saved instead if it changed since the "
+                "publish, or if the publish and version up save profiles set "
+                "different options.",
+            },
+            "Save Profiles": {
+                "type": "dict",
+                "default": tk_motionbuilder.DEFAULT_SAVE_PROFILES,
+                "description": "Named sets of FBX options the session is saved "
+                "with, each a dictionary of FBFbxOptions attribute names and "
+                "values.",
+            },
+            "Publish Save Profile": {
+                "type": "str",
+                "default": "",
+                "description": "Name of the save profile used for the "
+                "published file, 'full publish' for example. Leave empty to "
+                "save with the default options.",
+            },
+            "Version Up Save Profile": {
+                "type": "str",
+                "default": "",
+                "description": "Name of the save profile used when saving the "
+                "next version of the work file, 'fast work save' for example. "
+                "Leave empty to save with the default options.",
+            },
+            "Identical Publish Action": {
+                "type": "str",
+                "default": "warn",
+                "description": "What to do when the saved file is identical to "
+                "the file last published to the same path, any version of it. "
+                "'warn' logs a warning and publishes it, 'skip' reuses the "
+                "previous publish rather than copying and registering the file "
+                "again. Leave empty to not check.",
+            },
         }
 
         # update the base settings
@@ -201,6 +250,10 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
         publisher = self.parent
         path = _session_path()
 
+        # the take items are validated after the session, each validation
+        # pass lists the takes to export again.
+        _tk_motionbuilder().release_item_take_export_pool(item)
+
         if not path:
             # the session still requires saving. provide a save button.
             # validation fails.
@@ -246,16 +299,26 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
 
         # check to see if the next version of the work file already exists on
         # disk. if so, warn the user and provide the ability to jump to save
-        # to that version now
+        # to that version now. the work folder is listed once and the versions
+        # are looked up in the listing, rather than checked on disk one by one.
+        version_index = _tk_motionbuilder().get_item_version_index(item, path)
         next_version_path, version = self._get_next_version_info(path, item)
-        if next_version_path and os.path.exists(next_version_path):
+        if next_version_path and version_index.exists(next_version_path):
 
-            # determine the next available version_number. just keep asking for
-            # the next one until we get one that doesn't exist.
-            while os.path.exists(next_version_path):
-                next_version_path, version = self._get_next_version_info(
-                    next_version_path, item
-                )
+            # determine the next available version_number from the versions
+            # found in the work folder.
+            free_version_path, free_version = version_index.get_next_free_version(
+                path, work_template
+            )
+            if free_version_path:
+                next_version_path, version = free_version_path, free_version
+            else:
+                # the version couldn't be parsed, just keep asking for the
+                # next one until we get one that doesn't exist.
+                while version_index.exists(next_version_path):
+                    next_version_path, version = self._get_next_version_info(
+                        next_version_path, item
+                    )
 
             error_msg = "The next version of this file already exists on disk."
             self.logger.error(
@@ -265,12 +328,32 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
                         "label": "Save to v%s" % (version,),
                         "tooltip": "Save to the next available version number, "
                         "v%s" % (version,),
-                        "callback": lambda: _save_session(next_version_path),
+                        "callback": lambda: _tk_motionbuilder().save_session(
+                            next_version_path
+                        ),
                     }
                 },
             )
             raise Exception(error_msg)
 
+        # ---- check the next version can be copied from the published file
+
+        if settings.get("Version Up Mode").value == "copy":
+            tk_motionbuilder = _tk_motionbuilder()
+            if not tk_motionbuilder.have_same_options(
+                tk_motionbuilder.get_configured_save_profile(
+                    settings, "Publish Save Profile"
+                ),
+                tk_motionbuilder.get_configured_save_profile(
+                    settings, "Version Up Save Profile"
+                ),
+            ):
+                self.logger.warning(
+                    "The publish and version up save profiles save with "
+                    "different options, the next version of the work file will "
+                    "be saved rather than copied from the published file."
+                )
+
         # ---- populate the necessary properties and call base class validation
 
         # populate the publish template on the item if found
@@ -298,18 +381,54 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
         :param item: Item to process
         """
 
-        # get the path in a normalized state. no trailing separator, separators
-        # are appropriate for current os, no double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(_session_path())
-
-        # ensure the session is saved
-        _save_session(path)
+        try:
+            # get the path in a normalized state. no trailing separator,
+            # separators are appropriate for current os, no double separators,
+            # etc.
+            path = sgtk.util.ShotgunPath.normalize(_session_path())
+
+            # ensure the session is saved, unless another plugin already saved
+            # it to this path and it wasn't modified since.
+            tk_motionbuilder = _tk_motionbuilder()
+            save_profile = tk_motionbuilder.get_configured_save_profile(
+                settings, "Publish Save Profile"
+            )
+            profile_name = save_profile.name if save_profile else None
+            tracker = tk_motionbuilder.get_item_save_tracker(item)
+            if tracker.is_saved(path, profile_name):
+                self.logger.debug("The session is already saved to %s." % (path,))
+            else:
+                start = time.perf_counter()
+                transfer = tk_motionbuilder.save_session(path, save_profile)
+                tracker.record_save(
+                    path, time.perf_counter() - start, transfer, profile_name
+                )
+            item.properties["session_save_duration"] = tracker.save_duration
+
+            # update the item with the saved session path
+            item.properties["path"] = path
+
+            # a staged save must be at its final path, and checked, before
+            # being registered.
+            start = time.perf_counter()
+            tracker.wait_for_transfer()
+            self.logger.debug(
+                "Waited %.2fs for the session file transfer."
+                % (time.perf_counter() - start,)
+            )
 
-        # update the item with the saved session path
-        item.properties["path"] = path
+            # skip the copy and registration of a file identical to the
+            # previous publish, if configured to.
+            if self._check_identical_publish(settings, item, path):
+                return
 
-        # let the base class register the publish
-        super().publish(settings, item)
+            # let the base class register the publish
+            super().publish(settings, item)
+        except Exception:
+            # finalize isn't run after a failed publish, stop tracking the
+            # scene changes and exporting the takes now.
+            _tk_motionbuilder().release_item_publish_state(item)
+            raise
 
     def finalize(self, settings, item):
         """
@@ -322,11 +441,196 @@ class MotionBuilderSessionPublishPlugin(HookBaseClass):
         :param item: Item to process
         """
 
-        # do the base class finalization
-        super().finalize(settings, item)
+        if item.properties.get("publish_skipped"):
+            self.logger.info(
+                "Reused the previous publish of %s."
+                % (item.properties["publish_path"],)
+            )
+        else:
+            # do the base class finalization
+            super().finalize(settings, item)
+            self._record_publish_hash(item)
+
+        # the file saved for the publish can only be copied to the next
+        # version if the scene wasn't modified since, and it was saved with
+        # the same options as the version up save profile.
+        tk_motionbuilder = _tk_motionbuilder()
+        save_profile = tk_motionbuilder.get_configured_save_profile(
+            settings, "Version Up Save Profile"
+        )
+        copy_source = None
+        if settings.get("Version Up Mode").value == "copy":
+            tracker = tk_motionbuilder.get_item_save_tracker(item)
+            copy_source = tracker.get_saved_path()
+            publish_profile = tk_motionbuilder.get_configured_save_profile(
+                settings, "Publish Save Profile"
+            )
+            if copy_source is None:
+                self.logger.debug(
+                    "The scene changed since it was saved for the publish, "
+                    "saving the next version rather than copying it."
+                )
+            elif tracker.profile != (
+                publish_profile.name if publish_profile else None
+            ) or not tk_motionbuilder.have_same_options(publish_profile, save_profile):
+                self.logger.debug(
+                    "The scene was saved for the publish with another save "
+                    "profile, saving the next version rather than copying it."
+                )
+                copy_source = None
+
+        # the publish is over, the next one must save the session again.
+        tk_motionbuilder.release_item_save_tracker(item)
 
         # bump the session file to the next version
-        self._save_to_next_version(item.properties["path"], item, _save_session)
+        if copy_source:
+            self._copy_to_next_version(copy_source, item, save_profile)
+        else:
+            self._save_to_next_version(
+                item.properties["path"],
+                item,
+                lambda path: tk_motionbuilder.save_session(path, save_profile),
+            )
+
+    def _check_identical_publish(self, settings, item, path):
+        """
+        Start hashing the saved session file in the background, and compare
+        it with the file last published to the same path.
+
+        The hash is only waited for if the previous publish may be identical,
+        otherwise it is computed while the file is copied and registered, and
+        recorded in finalize.
+
+        :param settings: Dictionary of Settings.
+        :param item: Item to process
+        :param str path: Path to the saved session file.
+        :returns: True if the publish is skipped.
+        """
+        item.properties["publish_skipped"] = False
+        item.properties.pop("publish_hash", None)
+        action = settings.get("Identical Publish Action").value
+        if not action:
+            return False
+
+        # the file was already hashed if it was transferred from the staging
+        # folder.
+        engine = self.parent.engine
+        hash_index = engine.publish_hash_index
+        transfer_queue = engine.file_transfer_queue
+        digest = transfer_queue.get_digest(path) if transfer_queue else None
+        publish_hash = hash_index.hash_file_async(path, digest)
+        item.properties["publish_hash"] = publish_hash
+
+        publish_path = self.get_publish_path(settings, item)
+        previous = hash_index.get(publish_path)
+        if (
+            not previous
+            or previous["size"] != os.path.getsize(path)
+            or not os.path.exists(previous["path"])
+        ):
+            return False
+
+        start = time.perf_counter()
+        identical = publish_hash.result() == previous["hash"]
+        self.logger.debug(
+            "Waited %.2fs for the session file hash." % (time.perf_counter() - start,)
+        )
+        if not identical:
+            return False
+
+        if action != "skip" or not previous.get("sg_publish_data"):
+            self.logger.warning(
+                "The session file is identical to the file published to %s."
+                % (previous["path"],),
+                extra={"action_show_folder": {"path": previous["path"]}},
+            )
+            return False
+
+        self.logger.info(
+            "The session file is identical to the file published to %s, "
+            "skipping the publish." % (previous["path"],),
+            extra={"action_show_folder": {"path": previous["path"]}},
+        )
+        item.properties["publish_path"] = previous["path"]
+        item.properties["sg_publish_data"] = previous["sg_publish_data"]
+        item.properties["publish_skipped"] = True
+        return True
+
+    def _record_publish_hash(self, item):
+        """
+        Record the content hash of the published session file.
+
+        :param item: Item to process
+        """
+        publish_hash = item.properties.pop("publish_hash", None)
+        sg_publish_data = item.properties.get("sg_publish_data")
+        if publish_hash is None or not sg_publish_data:
+            return
+
+        hash_index = self.parent.engine.publish_hash_index
+        try:
+            hash_index.set(
+                item.properties["publish_path"],
+                publish_hash.result(),
+                os.path.getsize(item.properties["path"]),
+                {"type": sg_publish_data["type"], "id": sg_publish_data["id"]},
+            )
+            hash_index.save()
+        except (IOError, OSError) as e:
+            self.logger.debug("Could not record the session file hash: %s" % (e,))
+
+    def _copy_to_next_version(self, path, item, save_profile=None):
+        """
+        Copy the session file saved for the publish to the next version, and
+        point Motion Builder to the copy, rather than saving the whole scene
+        again.
+
+        :param path: Path to the session file saved for the publish.
+        :param item: Item to process
+        :param save_profile: Optional :class:`SaveProfile` to save with, if
+            the copy can't be used.
+        :returns: The path to the next version, or None if it couldn't be
+            determined or already exists.
+        """
+        next_version_path, version = self._get_next_version_info(path, item)
+        if version is None:
+            self.logger.debug(
+                "No version number detected in the publish path. "
+                "Skipping the bump file version step."
+            )
+            return None
+
+        self.logger.info("Incrementing file version number...")
+
+        if os.path.exists(next_version_path):
+            self.logger.warning(
+                "The next version of the path already exists",
+                extra={"action_show_folder": {"path": next_version_path}},
+            )
+            return None
+
+        tk_motionbuilder = _tk_motionbuilder()
+        start = time.perf_counter()
+        method = tk_motionbuilder.copy_file(path, next_version_path)
+        duration = time.perf_counter() - start
+
+        if not tk_motionbuilder.set_session_path(next_version_path):
+            # Motion Builder couldn't be pointed to the copy, save it instead.
+            self.logger.debug("Could not set the session path, saving it instead.")
+            tk_motionbuilder.save_session(next_version_path, save_profile)
+            return next_version_path
+
+        save_duration = item.properties.get("session_save_duration")
+        if save_duration is not None:
+            self.logger.info(
+                "Versioned up with a %s in %.2fs rather than saving again "
+                "(%.2fs when saving for the publish), %.2fs saved."
+                % (method, duration, save_duration, save_duration - duration)
+            )
+        else:
+            self.logger.info("Versioned up with a %s in %.2fs." % (method, duration))
+        self.logger.info("Motion Builder file path: %s" % (next_version_path,))
+        return next_version_path
 
 
 def _session_path():
@@ -338,14 +642,11 @@ def _session_path():
     return str(mb_app.FBXFileName)
 
 
-def _save_session(path):
+def _tk_motionbuilder():
     """
-    Save the current session to the supplied path.
+    Return the tk_motionbuilder module of the current engine.
     """
-    # Motionbuilder won't ensure that the folder is created when saving, so we must make sure it exists
-    ensure_folder_exists(os.path.dirname(path))
-
-    mb_app.FileSave(path)
+    return sgtk.platform.current_engine().import_module("tk_motionbuilder")
 
 
 def _save_as_session():
@@ -0,0 +1,397 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import concurrent.futures
+import os
+import re
+import sgtk
+
+from pyfbsdk import FBApplication
+
+mb_app = FBApplication()
+
+HookBaseClass = sgtk.get_hook_baseclass()
+
+
+class MotionBuilderTakePublishPlugin(HookBaseClass):
+    """
+    Plugin for publishing the takes of the Motion Builder session to their
+    own files.
+
+    The session is snapshot once, and the takes are exported from the
+    snapshot by a pool of Motion Builder batch processes, several at once.
+    The take items are collected when the "Collect Scene Items" setting of
+    the collector is enabled.
+
+    This hook relies on functionality found in the base file publisher hook in
+    the publish2 app and should inherit from it in the configuration. The hook
+    setting for this plugin should look something like this::
+
+        hook: "{self}/publish_file.py:{engine}/tk-multi-publish2/basic/publish_takes.py"
+
+    """
+
+    # NOTE: The plugin icon is defined by the base file plugin.
+    @property
+    def name(self):
+        """
+        One line display name describing the plugin
+        """
+        return "Publish take to Flow Production Tracking"
+
+    @property
+    def description(self):
+        """
+        Verbose, multi-line description of what the plugin does. This can
+        contain simple html for formatting.
+        """
+        return """
+        Exports the take to its own file and publishes it to Flow Production
+        Tracking.<br><br>
+
+        The takes are exported from a snapshot of the current session by
+        Motion Builder batch processes, in parallel, to the path given by the
+        publish template, or to a <code>takes</code> folder next to the
+        session file if no template is configured.<br><br>
+
+        The fingerprint of the animation of each published take is recorded
+        in a manifest next to the published files, and takes which didn't
+        change since they were last published are skipped.<br><br>
+
+        If the session has not been saved, validation will fail.
+        """
+
+    @property
+    def settings(self):
+        """
+        Dictionary defining the settings that this plugin expects to receive
+        through the settings parameter in the accept, validate, publish and
+        finalize methods.
+
+        A dictionary on the following form::
+
+            {
+                "Settings Name": {
+                    "type": "settings_type",
+                    "default": "default_value",
+                    "description": "One line description of the setting"
+            }
+
+        The type string should be one of the data types that toolkit accepts as
+        part of its environment configuration.
+        """
+
+        # inherit the settings from the base publish plugin
+        base_settings = super().settings or {}
+
+        # settings specific to this class
+        take_publish_settings = {
+            "Publish Template": {
+                "type": "template",
+                "default": None,
+                "description": "Template path for published takes. Its fields "
+                "are taken from the session work file, and its name field is set "
+                "to the name of the take.",
+            },
+            "Worker Command": {
+                "type": "list",
+                "values": {"type": "str"},
+                "default": [],
+                "description": "Command starting a process exporting a take, "
+                "{script} being replaced with the path to the export script. "
+                "Motion Builder in batch mode if empty.",
+            },
+            "Worker Count": {
+                "type": "int",
+                "default": 2,
+                "description": "Maximum number of processes exporting takes "
+                "at once.",
+            },
+            "Skip Unchanged Takes": {
+                "type": "bool",
+                "default": True,
+                "description": "Skip the takes whose animation didn't change "
+                "since they were last published, according to the fingerprints "
+                "recorded next to the published takes.",
+            },
+        }
+
+        # update the base settings
+        base_settings.update(take_publish_settings)
+
+        return base_settings
+
+    @property
+    def item_filters(self):
+        """
+        List of item types that this plugin is interested in.
+
+        Only items matching entries in this list will be presented to the
+        accept() method. Strings can contain glob patters such as *, for example
+        ["motionbuilder.*", "file.motionbuilder"]
+        """
+        return ["motionbuilder.fbx.take"]
+
+    def accept(self, settings, item):
+        """
+        Method called by the publisher to determine if an item is of any
+        interest to this plugin. Only items matching the filters defined via the
+        item_filters property will be presented to this method.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+
+        :returns: dictionary with boolean keys accepted, required and enabled
+        """
+
+        if settings.get("Publish Template").value:
+            item.context_change_allowed = False
+
+        return {"accepted": True, "checked": True}
+
+    def validate(self, settings, item):
+        """
+        Validates the given item to check that it is ok to publish. Returns a
+        boolean to indicate validity.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        :returns: True if item is valid, False otherwise.
+        """
+
+        path = _session_path()
+        if not path:
+            error_msg = "The Motion Builder session has not been saved."
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
+
+        take = item.properties["scene_element"].name
+        take_path = self._get_take_path(
+            settings, item, sgtk.util.ShotgunPath.normalize(path), take
+        )
+
+        # the base class publishes the exported file in place.
+        item.properties["path"] = take_path
+        item.properties["publish_path"] = take_path
+        item.properties["publish_type"] = "Motion Builder FBX Take"
+
+        # compare the take with the one last published, in the same folder.
+        item.properties["take_unchanged"] = False
+        item.properties.pop("take_fingerprint", None)
+        if settings.get("Skip Unchanged Takes").value:
+            fingerprinter = self.parent.engine.take_fingerprinter
+            fingerprint = fingerprinter.fingerprint_takes([take]).get(take)
+            item.properties["take_fingerprint"] = fingerprint
+            manifest = _get_take_manifest(take_path)
+            if fingerprint and manifest.get_fingerprint(take_path) == fingerprint:
+                self.logger.info(
+                    "Take %s didn't change since it was published to %s, "
+                    "it will be skipped."
+                    % (take, manifest.get_published_path(take_path))
+                )
+                item.properties["take_unchanged"] = True
+                return True
+
+        # queue the take, all the takes are exported together when the first
+        # one is published. the session plugins discard the queued takes when
+        # the session is validated, so takes unchecked or found unchanged
+        # since aren't exported. a pool left by a publish which didn't
+        # complete is replaced.
+        pool = _get_take_export_pool(item, settings)
+        if pool.started:
+            _tk_motionbuilder().release_item_take_export_pool(item.parent)
+            pool = _get_take_export_pool(item, settings)
+        pool.add(take, take_path)
+
+        # run the base class validation
+        return super().validate(settings, item)
+
+    def publish(self, settings, item):
+        """
+        Executes the publish logic for the given item and settings.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+
+        if item.properties.get("take_unchanged"):
+            return
+
+        try:
+            pool = _get_take_export_pool(item, settings)
+            if not pool.started:
+                self._start_exports(item, pool)
+
+            take = item.properties["scene_element"].name
+            try:
+                pool.wait(take, on_progress=self._log_progress)
+            except concurrent.futures.CancelledError:
+                raise Exception("The export of take %s was cancelled." % (take,))
+
+            # let the base class register the publish
+            super().publish(settings, item)
+        except Exception:
+            # finalize isn't run after a failed publish, stop tracking the
+            # scene changes and exporting the takes now.
+            _tk_motionbuilder().release_item_publish_state(item.parent)
+            raise
+
+    def finalize(self, settings, item):
+        """
+        Execute the finalization pass. This pass executes once all the publish
+        tasks have completed, and can for example be used to version up files.
+
+        :param settings: Dictionary of Settings. The keys are strings, matching
+            the keys returned in the settings property. The values are `Setting`
+            instances.
+        :param item: Item to process
+        """
+
+        # all the takes are exported, stop the worker threads.
+        tk_motionbuilder = _tk_motionbuilder()
+        tk_motionbuilder.release_item_take_export_pool(item.parent)
+        tk_motionbuilder.release_item_save_tracker(item.parent)
+
+        if item.properties.get("take_unchanged"):
+            return
+
+        # do the base class finalization
+        super().finalize(settings, item)
+
+        # record the fingerprint of the published take.
+        fingerprint = item.properties.get("take_fingerprint")
+        if fingerprint:
+            manifest = _get_take_manifest(item.properties["path"])
+            manifest.set(
+                item.properties["path"],
+                fingerprint,
+                item.properties["scene_element"].name,
+            )
+            manifest.save()
+
+    def _start_exports(self, item, pool):
+        """
+        Snapshot the session and start exporting the takes from it.
+
+        :param item: The take item being published.
+        :param pool: The :class:`TakeExportPool` the takes were added to.
+        """
+
+        # reuse the session file if it was saved by the session publish and
+        # wasn't modified since, otherwise save a snapshot.
+        tracker = _tk_motionbuilder().get_item_save_tracker(item.parent)
+        source = tracker.get_saved_path()
+        if source:
+            tracker.wait_for_transfer()
+        else:
+            path = _session_path()
+            source = pool.get_temporary_path(os.path.basename(path))
+            mb_app.FileSave(source)
+            # carry on working on the session file.
+            mb_app.FBXFileName = path
+
+        done, total = pool.get_progress()
+        self.logger.info(
+            "Exporting %d takes..." % (total,),
+            extra={
+                "action_button": {
+                    "label": "Cancel",
+                    "tooltip": "Cancel the take exports",
+                    "callback": pool.cancel,
+                }
+            },
+        )
+        pool.start(source)
+
+    def _log_progress(self, take, done, total):
+        """
+        Report the export of a take completed.
+        """
+        self.logger.info("Take %s exported (%d/%d)." % (take, done, total))
+
+    def _get_take_path(self, settings, item, session_path, take):
+        """
+        Return the path to export a take to.
+
+        :param settings: Dictionary of Settings.
+        :param item: The take item.
+        :param str session_path: Path to the session file.
+        :param str take: Name of the take.
+        :returns: The path to export the take to.
+        """
+
+        publisher = self.parent
+        take_name = re.sub(r"[^0-9A-Za-z]+", "_", take).strip("_") or "take"
+
+        publish_template = publisher.engine.get_template_by_name(
+            settings.get("Publish Template").value
+        )
+        work_template = item.parent.properties.get("work_template")
+        if publish_template and work_template and work_template.validate(session_path):
+            fields = work_template.get_fields(session_path)
+            fields["name"] = take_name
+            missing_keys = publish_template.missing_keys(fields)
+            if missing_keys:
+                error_msg = (
+                    "Work file '%s' missing keys required for the take publish "
+                    "template: %s" % (session_path, missing_keys)
+                )
+                self.logger.error(error_msg)
+                raise Exception(error_msg)
+            return publish_template.apply_fields(fields)
+
+        # no template, export next to the session file.
+        root, ext = os.path.splitext(os.path.basename(session_path))
+        return os.path.join(
+            os.path.dirname(session_path),
+            "takes",
+            "%s_%s%s" % (root, take_name, ext or ".fbx"),
+        )
+
+
+def _session_path():
+    """
+    Return the path to the current session
+    :return:
+    """
+
+    return str(mb_app.FBXFileName)
+
+
+def _tk_motionbuilder():
+    """
+    Return the tk_motionbuilder module of the current engine.
+    """
+    return sgtk.platform.current_engine().import_module("tk_motionbuilder")
+
+
+def _get_take_export_pool(item, settings):
+    """
+    Return the pool exporting the takes of the session, shared by its take
+    items.
+    """
+    return _tk_motionbuilder().get_take_export_pool(
+        item.parent.properties,
+        command=settings.get("Worker Command").value or None,
+        max_workers=settings.get("Worker Count").value,
+    )
+
+
+def _get_take_manifest(take_path):
+    """
+    Return the manifest of the takes published next to the given take.
+    """
+    return _tk_motionbuilder().get_take_manifest(take_path)
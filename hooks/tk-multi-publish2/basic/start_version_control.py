@@ -9,6 +9,7 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import time
 import sgtk
 
 from pyfbsdk import FBApplication, FBFilePopup, FBFilePopupStyle
@@ -92,7 +93,30 @@ class MotionBuilderStartVersionControlPlugin(HookBaseClass):
         The type string should be one of the data types that toolkit accepts as
         part of its environment configuration.
         """
-        return {}
+        tk_motionbuilder = _tk_motionbuilder()
+        return {
+            "Keep Original File Current": {
+                "type": "bool",
+                "default": False,
+                "description": "Also save the session to the original, "
+                "unversioned, file. The versioned file is then a copy of it "
+                "rather than a second save of the scene.",
+            },
+            "Save Profiles": {
+                "type": "dict",
+                "default": tk_motionbuilder.DEFAULT_SAVE_PROFILES,
+                "description": "Named sets of FBX options the session is saved "
+                "with, each a dictionary of FBFbxOptions attribute names and "
+                "values.",
+            },
+            "Save Profile": {
+                "type": "str",
+                "default": "",
+                "description": "Name of the save profile used for the versioned "
+                "file, which is then published, 'full publish' for example. "
+                "Leave empty to save with the default options.",
+            },
+        }
 
     def accept(self, settings, item):
         """
@@ -169,6 +193,10 @@ class MotionBuilderStartVersionControlPlugin(HookBaseClass):
         publisher = self.parent
         path = _session_path()
 
+        # the take items are validated after the session, each validation
+        # pass lists the takes to export again.
+        _tk_motionbuilder().release_item_take_export_pool(item)
+
         if not path:
             # the session still requires saving. provide a save button.
             # validation fails
@@ -182,9 +210,10 @@ class MotionBuilderStartVersionControlPlugin(HookBaseClass):
         # field defined within it. Simply use the path info hook to inject a
         # version number into the current file path
 
-        # get the path to a versioned copy of the file.
+        # get the path to a versioned copy of the file, and look it up in the
+        # listing of the folder shared with the session publish plugin.
         version_path = publisher.util.get_version_path(path, "v001")
-        if os.path.exists(version_path):
+        if _tk_motionbuilder().get_item_version_index(item, path).exists(version_path):
             error_msg = "A file already exists with a version number. Please choose another name."
             self.logger.error(error_msg, extra=_get_save_as_action())
             raise Exception(error_msg)
@@ -201,24 +230,61 @@ class MotionBuilderStartVersionControlPlugin(HookBaseClass):
         :param item: Item to process
         """
 
-        publisher = self.parent
+        try:
+            publisher = self.parent
 
-        # get the path in a normalized state. no trailing separator, separators
-        # are appropriate for current os, no double separators, etc.
-        path = sgtk.util.ShotgunPath.normalize(_session_path())
+            # get the path in a normalized state. no trailing separator,
+            # separators are appropriate for current os, no double separators,
+            # etc.
+            path = sgtk.util.ShotgunPath.normalize(_session_path())
 
-        # ensure the session is saved in its current state
-        _save_session(path)
+            # get the path to a versioned copy of the file.
+            version_path = publisher.util.get_version_path(path, "v001")
 
-        # get the path to a versioned copy of the file.
-        version_path = publisher.util.get_version_path(path, "v001")
+            tk_motionbuilder = _tk_motionbuilder()
+            save_profile = tk_motionbuilder.get_configured_save_profile(
+                settings, "Save Profile"
+            )
+            profile_name = save_profile.name if save_profile else None
+            tracker = tk_motionbuilder.get_item_save_tracker(item)
+            if settings.get(
+                "Keep Original File Current"
+            ).value and not tracker.is_saved(path, profile_name):
+                # ensure the session is saved in its current state
+                start = time.perf_counter()
+                transfer = tk_motionbuilder.save_session(path, save_profile)
+                tracker.record_save(
+                    path, time.perf_counter() - start, transfer, profile_name
+                )
 
-        # save to the new version path
-        _save_session(version_path)
-        self.logger.info(
-            "A version number has been added to the Motion Builder file..."
-        )
-        self.logger.info("  Motion Builder file path: %s" % (version_path,))
+            # if the session is already saved, by this plugin or another one,
+            # copy that file rather than serializing the scene again.
+            saved_path = tracker.get_saved_path(profile_name)
+            if saved_path:
+                tracker.wait_for_transfer()
+                method = tk_motionbuilder.copy_file(saved_path, version_path)
+                self.logger.debug("Session copied to %s (%s)." % (version_path, method))
+                if tk_motionbuilder.set_session_path(version_path):
+                    tracker.record_save(version_path, profile=profile_name)
+                    saved_path = version_path
+
+            # save to the new version path
+            if saved_path != version_path:
+                start = time.perf_counter()
+                transfer = tk_motionbuilder.save_session(version_path, save_profile)
+                tracker.record_save(
+                    version_path, time.perf_counter() - start, transfer, profile_name
+                )
+
+            self.logger.info(
+                "A version number has been added to the Motion Builder file..."
+            )
+            self.logger.info("  Motion Builder file path: %s" % (version_path,))
+        except Exception:
+            # finalize isn't run after a failed publish, stop tracking the
+            # scene changes and exporting the takes now.
+            _tk_motionbuilder().release_item_publish_state(item)
+            raise
 
     def finalize(self, settings, item):
         """
@@ -231,7 +297,9 @@ class MotionBuilderStartVersionControlPlugin(HookBaseClass):
             instances.
         :param item: Item to process
         """
-        pass
+
+        # the publish is over, the next one must save the session again.
+        _tk_motionbuilder().release_item_save_tracker(item)
 
     def _get_version_number(self, path, item):
         """
@@ -279,12 +347,11 @@ def _session_path():
     return str(mb_app.FBXFileName)
 
 
-def _save_session(path):
+def _tk_motionbuilder():
     """
-    Save the current session to the supplied path.
+    Return the tk_motionbuilder module of the current engine.
     """
-
-    mb_app.FileSave(path)
+    return sgtk.platform.current_engine().import_module("tk_motionbuilder")
 
 
 def _save_as_session():
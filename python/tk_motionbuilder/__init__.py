@@ -15,15 +15,70 @@ Callbacks to manage the engine when a new file is loaded in shotgun.
 
 import os
 import sys
+import time
 import traceback
 import sgtk
 
 # application libs
+from pyfbsdk import FBApplication
 from pyfbsdk import FBMessageBox
 from pyfbsdk import FBMenuManager
 
 # local libs
-from .menu_generation import MenuGenerator
+from .menu_generation import MenuGenerator, CommandRegistry
+from .menu_cache import MenuLayoutCache
+from .log_sink import BufferedLogSink
+from .error_reporting import ErrorAggregator
+from .tracing import StartupTracer
+from .context_cache import ContextCache, get_context_cache
+from .command_dispatcher import CommandDispatcher
+from .event_handlers import EventHandlerRegistry
+from .process_launcher import ProcessLauncher
+from .context_prefetch import ContextPrefetcher
+from .command_index import CommandIndex, CommandEntry
+from .usage_stats import UsageStats
+from .version_index import VersionIndex, get_version_index, get_unversioned_path
+from .file_copy import copy_file, hash_file
+from .file_transfer import FileTransferQueue
+from .save_profiles import (
+    SaveProfile,
+    get_save_profile,
+    have_same_options,
+    DEFAULT_SAVE_PROFILES,
+)
+from .scene_inventory import SceneInventory, SceneElement
+from .take_fingerprint import (
+    TakeFingerprinter,
+    SceneFingerprinter,
+    TakeManifest,
+    get_take_manifest,
+)
+from .take_export import (
+    TakeExportPool,
+    get_take_export_pool,
+    release_take_export_pool,
+)
+from .save_tracker import SessionSaveTracker, get_save_tracker, release_save_tracker
+from .publish_hashes import PublishHashIndex
+from .session_save import (
+    save_session,
+    set_session_path,
+    get_configured_save_profile,
+    get_item_save_tracker,
+    release_item_save_tracker,
+    release_item_take_export_pool,
+    release_item_publish_state,
+    get_item_version_index,
+)
+
+logger = sgtk.platform.get_logger(__name__)
+
+# handlers added by the "disabled" and "error" menus
+_status_menu_handlers = EventHandlerRegistry()
+
+# handler refreshing the engine when a file is opened, it outlives the
+# engines it restarts.
+_file_open_handlers = EventHandlerRegistry()
 
 
 def __show_sgtk_disabled_message(details):
@@ -54,7 +109,8 @@ def __create_sgtk_disabled_menu(details):
     def menu_event(control, event):
         __show_sgtk_disabled_message(details)
 
-    menu.OnMenuActivate.Add(menu_event)
+    _status_menu_handlers.remove_all()
+    _status_menu_handlers.add(menu, "OnMenuActivate", menu_event)
 
 
 def __create_sgtk_error_menu():
@@ -80,7 +136,139 @@ def __create_sgtk_error_menu():
     def menu_event(control, event):
         FBMessageBox("PTR Error", message, "OK")
 
-    menu.OnMenuActivate.Add(menu_event)
+    _status_menu_handlers.remove_all()
+    _status_menu_handlers.add(menu, "OnMenuActivate", menu_event)
+
+
+def __get_context_change_blocker(tk, engine, engine_name, new_context):
+    """
+    Check whether the running engine can switch to the given context in place,
+    rather than being destroyed and started again.
+
+    Apps whose settings differ between the two environments are reloaded by
+    the context change itself, so only differences in the engine itself or in
+    the set of apps it runs require a restart.
+
+    :param tk: Toolkit API instance.
+    :param engine: The running engine.
+    :param str engine_name: Instance name of the engine to run.
+    :param new_context: The context to switch to.
+    :returns: A string describing why a restart is needed, or None if the
+        context can be changed in place.
+    """
+    if not engine.context_change_allowed:
+        return "the engine does not allow context changes"
+
+    if engine_name != engine.instance_name:
+        return "engine %s is requested instead of %s" % (
+            engine_name,
+            engine.instance_name,
+        )
+
+    pipeline_config = tk.pipeline_configuration
+    new_env_name = tk.execute_core_hook("pick_environment", context=new_context)
+    if not new_env_name:
+        return "no environment could be picked for the new context"
+
+    new_env = pipeline_config.get_environment(new_env_name, new_context)
+    if engine_name not in new_env.get_engines():
+        return "environment %s does not define engine %s" % (
+            new_env_name,
+            engine_name,
+        )
+
+    old_env_name = engine.environment["name"]
+    if new_env_name == old_env_name:
+        return None
+
+    old_env = pipeline_config.get_environment(old_env_name, engine.context)
+    if (
+        new_env.get_engine_descriptor(engine_name).get_uri()
+        != old_env.get_engine_descriptor(engine_name).get_uri()
+    ):
+        return "the engine version differs in environment %s" % new_env_name
+
+    if new_env.get_engine_settings(engine_name) != old_env.get_engine_settings(
+        engine_name
+    ):
+        return "the engine settings differ in environment %s" % new_env_name
+
+    new_apps = new_env.get_apps(engine_name)
+    old_apps = old_env.get_apps(engine_name)
+    if set(new_apps) != set(old_apps):
+        return "the apps differ in environment %s" % new_env_name
+
+    for app_name in new_apps:
+        if (
+            new_env.get_app_descriptor(engine_name, app_name).get_uri()
+            != old_env.get_app_descriptor(engine_name, app_name).get_uri()
+        ):
+            return "the %s version differs in environment %s" % (
+                app_name,
+                new_env_name,
+            )
+
+    return None
+
+
+def watch_file_open(tk):
+    """
+    Refresh the engine for the context of each file opened in Motionbuilder,
+    switching it to the new context in place when possible.
+
+    The handler is only registered once, and kept when the engine is
+    destroyed, so opening a file in the project starts it again. It does
+    nothing while the running engine has the ``follow_file_open`` setting
+    disabled.
+
+    :param tk: Toolkit API instance.
+    """
+    if _file_open_handlers.count:
+        return
+
+    def on_file_open(control, event):
+        path = str(FBApplication().FBXFileName)
+        if not path:
+            return
+        engine = sgtk.platform.current_engine()
+        if engine and not engine.get_setting("follow_file_open"):
+            return
+        try:
+            __engine_refresh_for_path(engine.sgtk if engine else tk, path)
+        except Exception:
+            logger.exception("Could not refresh the engine for %s.", path)
+            __create_sgtk_error_menu()
+
+    _file_open_handlers.add(FBApplication(), "OnFileOpenCompleted", on_file_open)
+
+
+def __engine_refresh_for_path(tk, path):
+    """
+    Resolves the context of the given file and refreshes the engine for it.
+
+    Contexts are cached per file, see :class:`ContextCache`.
+
+    :param tk: Toolkit API instance.
+    :param str path: Path to the file which was opened.
+    """
+    curr_engine = sgtk.platform.current_engine()
+    try:
+        new_context = get_context_cache().get_context(tk, path)
+    except sgtk.TankError as e:
+        if curr_engine:
+            # keep the engine running rather than disabling it.
+            logger.warning("Could not resolve the context of %s: %s", path, e)
+            return
+        # the path could not be resolved, disable tank!
+        __create_sgtk_disabled_menu(e)
+        return
+
+    if new_context.project is None:
+        # a file outside the pipeline, the engine couldn't start for it.
+        logger.debug("%s is not in a project, keeping the current engine.", path)
+        return
+
+    __engine_refresh(tk, new_context)
 
 
 def __engine_refresh(tk, new_context):
@@ -90,14 +278,45 @@ def __engine_refresh(tk, new_context):
 
     engine_name = os.environ.get("TANK_MOTIONBUILDER_ENGINE_INIT_NAME")
 
+    start = time.perf_counter()
+
+    # the "disabled" or "error" menu handlers must not fire for the items of
+    # the engine menu.
+    _status_menu_handlers.remove_all()
+
     curr_engine = sgtk.platform.current_engine()
     if curr_engine:
         # an old engine is running.
         if new_context == curr_engine.context:
             # no need to restart the engine!
             return
+
+        # switch the running engine to the new context if nothing but the
+        # context changes, it is much cheaper than a restart.
+        try:
+            blocker = __get_context_change_blocker(
+                tk, curr_engine, engine_name or curr_engine.instance_name, new_context
+            )
+        except Exception as e:
+            blocker = "the new environment could not be checked (%s)" % e
+
+        if blocker is None:
+            try:
+                sgtk.platform.change_context(new_context)
+            except Exception:
+                logger.exception("In-place context change failed, restarting.")
+            else:
+                logger.info(
+                    "Engine switched to %s with an in-place context change in %.3fs.",
+                    new_context,
+                    time.perf_counter() - start,
+                )
+                return
         else:
-            # shut down the engine
+            logger.debug("Restarting the engine: %s.", blocker)
+
+        # shut down the engine, unless the failed context change already did.
+        if sgtk.platform.current_engine():
             curr_engine.destroy()
 
     # try to create new engine
@@ -106,3 +325,8 @@ def __engine_refresh(tk, new_context):
     except sgtk.TankEngineInitError as e:
         # context was not sufficient! - disable tank!
         __create_sgtk_disabled_menu(e)
+        return
+
+    logger.info(
+        "Engine started for %s in %.3fs.", new_context, time.perf_counter() - start
+    )
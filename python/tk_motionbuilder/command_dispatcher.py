@@ -0,0 +1,165 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Deferred execution of the menu commands.
+
+"""
+
+import collections
+import time
+
+
+class CommandMetrics(object):
+    """
+    Timings collected for a single command.
+    """
+
+    def __init__(self, name):
+        """
+        :param str name: Name of the command.
+        """
+        self.name = name
+        self.count = 0
+        self.coalesced_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration = 0.0
+
+    def record(self, latency, duration):
+        """
+        Record a command execution.
+
+        :param float latency: Time in seconds between the click and the
+            callback being called.
+        :param float duration: Time in seconds spent in the callback.
+        """
+        self.count += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        self.last_duration = duration
+
+    def to_dict(self):
+        """
+        :returns: A dictionary with the command timings, in milliseconds.
+        """
+        count = self.count or 1
+        return {
+            "name": self.name,
+            "count": self.count,
+            "coalesced_count": self.coalesced_count,
+            "avg_latency_ms": self.total_latency / count * 1e3,
+            "max_latency_ms": self.max_latency * 1e3,
+            "avg_duration_ms": self.total_duration / count * 1e3,
+            "max_duration_ms": self.max_duration * 1e3,
+            "last_duration_ms": self.last_duration * 1e3,
+        }
+
+
+class CommandDispatcher(object):
+    """
+    Runs the menu commands on the next iteration of the Qt event loop.
+
+    Commands are not run from the menu event handler itself: apps restarting
+    the engine rebuild the menu, which crashes Motionbuilder if done while
+    the menu event is being handled. Activating a command which is already
+    waiting to run is ignored, so a double click only runs it once, and
+    commands never run nested in one another: if a command is activated while
+    another one is running, for example from a modal dialog event loop, it
+    runs once the first one has returned.
+    """
+
+    def __init__(self, on_command_run=None):
+        """
+        :param on_command_run: Optional callable called with the name of each
+            command run and the time in seconds it took.
+        """
+        self._on_command_run = on_command_run
+        # callback and activation time of the commands waiting to run, by name
+        self._pending = {}
+        self._queue = collections.deque()
+        self._running = None
+        self._metrics = {}
+
+    @property
+    def running_command(self):
+        """
+        Name of the command currently running, or None.
+        """
+        return self._running
+
+    def dispatch(self, name, callback):
+        """
+        Queue the given command to run on the next event loop iteration.
+
+        :param str name: Name of the command.
+        :param callback: Callable running the command.
+        :returns: True if the command was queued, False if it was already
+            waiting to run.
+        """
+        if name in self._pending:
+            self._get_metrics(name).coalesced_count += 1
+            return False
+
+        self._pending[name] = (callback, time.perf_counter())
+        self._queue.append(name)
+        self._schedule()
+        return True
+
+    def get_metrics(self):
+        """
+        :returns: A list of dictionaries with the timings of each command which
+            ran, see :meth:`CommandMetrics.to_dict`.
+        """
+        return [metrics.to_dict() for metrics in self._metrics.values()]
+
+    def _get_metrics(self, name):
+        """
+        :returns: The :class:`CommandMetrics` for the given command.
+        """
+        if name not in self._metrics:
+            self._metrics[name] = CommandMetrics(name)
+        return self._metrics[name]
+
+    def _schedule(self):
+        """
+        Run the next queued command on the next event loop iteration.
+        """
+        from sgtk.platform.qt import QtCore
+
+        QtCore.QTimer.singleShot(0, self._run_next)
+
+    def _run_next(self):
+        """
+        Run the next queued command, unless a command is already running.
+        """
+        if self._running is not None or not self._queue:
+            # the running command schedules the next one when it returns.
+            return
+
+        name = self._queue.popleft()
+        callback, activation_time = self._pending.pop(name)
+
+        self._running = name
+        start = time.perf_counter()
+        try:
+            callback()
+        finally:
+            duration = time.perf_counter() - start
+            self._running = None
+            self._get_metrics(name).record(start - activation_time, duration)
+            if self._on_command_run is not None:
+                self._on_command_run(name, duration)
+            if self._queue:
+                self._schedule()
@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Searchable index of the menu commands.
+
+"""
+
+import heapq
+import re
+
+
+class CommandEntry(object):
+    """
+    A command in the :class:`CommandIndex`.
+    """
+
+    def __init__(self, name, app_name=None, cmd_type="default", favourite=False):
+        """
+        :param str name: Name of the command, as displayed in the menu.
+        :param str app_name: Display name of the app the command belongs to.
+        :param str cmd_type: Type of the command.
+        :param bool favourite: Whether the command is a favourite.
+        """
+        self.name = name
+        self.app_name = app_name
+        self.type = cmd_type
+        self.favourite = favourite
+        # the name is matched first, then the app name.
+        self.search_text = name.lower()
+        if app_name:
+            self.search_text += " " + app_name.lower()
+
+    @property
+    def key(self):
+        """
+        Values identifying the entry, used to detect changes when the index
+        is updated.
+        """
+        return (self.name, self.app_name, self.type, self.favourite)
+
+
+class CommandIndex(object):
+    """
+    In memory index of the commands, searched with fuzzy matching: a command
+    matches if all the characters of the query appear in its name or app
+    name, in order.
+
+    Typing a query usually adds characters to the previous one, so its
+    matches are searched among the matches of the previous query rather than
+    among all the commands.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        # previous query and the entries it matched
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def entries(self):
+        """
+        List of the :class:`CommandEntry` in the index.
+        """
+        return list(self._entries.values())
+
+    def update(self, entries):
+        """
+        Update the index so it contains the given entries, only replacing the
+        ones which changed.
+
+        :param entries: List of :class:`CommandEntry`.
+        :returns: A tuple with the number of entries added, changed and
+            removed.
+        """
+        added = changed = 0
+        names = set()
+        for entry in entries:
+            names.add(entry.name)
+            current = self._entries.get(entry.name)
+            if current is None:
+                added += 1
+            elif current.key != entry.key:
+                changed += 1
+            else:
+                continue
+            self._entries[entry.name] = entry
+
+        removed = [name for name in self._entries if name not in names]
+        for name in removed:
+            del self._entries[name]
+
+        if added or changed or removed:
+            self._last_query = None
+            self._last_matches = None
+        return added, changed, len(removed)
+
+    def search(self, query, limit=50):
+        """
+        Return the commands matching the given query, best matches first.
+
+        :param str query: The text typed by the user.
+        :param int limit: Maximum number of results.
+        :returns: List of :class:`CommandEntry`.
+        """
+        query = query.lower().strip()
+        if not query:
+            self._last_query = None
+            self._last_matches = None
+            # favourites first, then alphabetically.
+            return heapq.nsmallest(
+                limit,
+                self._entries.values(),
+                key=lambda e: (not e.favourite, e.search_text),
+            )
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._entries.values()
+
+        # entries containing the whole query are found with a substring
+        # test, the regular expression only checks the other ones. Each
+        # character is preceded by a class excluding it rather than ".*?", so
+        # non matching entries are rejected without backtracking.
+        match = re.compile(
+            "".join("[^%s]*%s" % (re.escape(c), re.escape(c)) for c in query)
+        ).match
+        matches = [
+            entry
+            for entry in candidates
+            if query in entry.search_text or match(entry.search_text)
+        ]
+        self._last_query = query
+        self._last_matches = matches
+
+        word_query = " " + query
+
+        def score(entry):
+            # matches at the start of the name, at the start of a word and
+            # matches of the whole query rank first, then favourites and
+            # short names.
+            text = entry.search_text
+            if text.startswith(query):
+                tier = 3
+            elif word_query in text:
+                tier = 2
+            elif query in text:
+                tier = 1
+            else:
+                tier = 0
+            return (tier, entry.favourite, -len(entry.name))
+
+        return heapq.nlargest(limit, matches, key=score)
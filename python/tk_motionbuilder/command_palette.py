@@ -0,0 +1,111 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Command palette searching and running the menu commands.
+
+This module needs Qt, it is only imported when the palette is first shown.
+
+"""
+
+from sgtk.platform.qt import QtCore, QtGui
+
+
+class CommandPalette(QtGui.QDialog):
+    """
+    Popup with a search field listing the commands matching the text typed,
+    from the :class:`CommandIndex` of a :class:`MenuGenerator`. Pressing
+    Enter or double clicking a command runs it.
+    """
+
+    def __init__(self, menu_generator, parent=None):
+        """
+        :param menu_generator: The :class:`MenuGenerator` whose commands are
+            searched and run.
+        :param parent: Optional parent widget.
+        """
+        super(CommandPalette, self).__init__(parent)
+        self._menu_generator = menu_generator
+
+        self.setWindowFlags(QtCore.Qt.Popup)
+        self.setMinimumWidth(480)
+
+        self._search_field = QtGui.QLineEdit(self)
+        self._search_field.setPlaceholderText("Search commands...")
+        self._search_field.installEventFilter(self)
+        self._results = QtGui.QListWidget(self)
+        self._results.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        layout = QtGui.QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        layout.addWidget(self._search_field)
+        layout.addWidget(self._results)
+
+        self._search_field.textChanged.connect(self._update_results)
+        self._search_field.returnPressed.connect(self._run_selected)
+        self._results.itemActivated.connect(self._run_selected)
+
+    def popup(self):
+        """
+        Show the palette over its parent window, with an empty search.
+        """
+        self._search_field.clear()
+        self._update_results("")
+
+        parent = self.parentWidget()
+        if parent is not None:
+            center = parent.mapToGlobal(parent.rect().center())
+            self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self._search_field.setFocus()
+
+    def eventFilter(self, watched, event):
+        """
+        Move the selection in the results with the arrow keys while the
+        search field has the focus.
+        """
+        if watched is self._search_field and event.type() == QtCore.QEvent.KeyPress:
+            if event.key() in (QtCore.Qt.Key_Up, QtCore.Qt.Key_Down):
+                step = -1 if event.key() == QtCore.Qt.Key_Up else 1
+                row = self._results.currentRow() + step
+                if 0 <= row < self._results.count():
+                    self._results.setCurrentRow(row)
+                return True
+        return super(CommandPalette, self).eventFilter(watched, event)
+
+    def _update_results(self, text):
+        """
+        List the commands matching the given text.
+
+        :param str text: The text typed in the search field.
+        """
+        self._results.clear()
+        for entry in self._menu_generator.command_index.search(text):
+            label = entry.name
+            if entry.app_name:
+                label = "%s    (%s)" % (entry.name, entry.app_name)
+            item = QtGui.QListWidgetItem(label)
+            item.setData(QtCore.Qt.UserRole, entry.name)
+            self._results.addItem(item)
+        if self._results.count():
+            self._results.setCurrentRow(0)
+
+    def _run_selected(self, *args):
+        """
+        Run the selected command and close the palette.
+        """
+        item = self._results.currentItem()
+        if item is None:
+            return
+        self.close()
+        self._menu_generator.run_command(item.data(QtCore.Qt.UserRole))
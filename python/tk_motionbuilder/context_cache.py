@@ -0,0 +1,227 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Cache of the contexts resolved from file paths.
+
+"""
+
+import collections
+import json
+import os
+import threading
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Files and folders of the pipeline configuration the context resolution
+# depends on. Their modification times are part of the cache keys.
+CONFIG_STAMP_PATHS = [
+    os.path.join("core", "templates.yml"),
+    os.path.join("core", "roots.yml"),
+    "core",
+]
+
+
+class ContextCache(object):
+    """
+    Least recently used cache mapping file paths to the context resolved from
+    them with :meth:`sgtk.Sgtk.context_from_path`.
+
+    Keys are made of the normalized path and a stamp of the pipeline
+    configuration, built from the modification times of its templates and
+    roots files, so editing the configuration invalidates the entries
+    resolved with the previous version. Entries can optionally be persisted
+    to disk, to be reused in the next Motionbuilder sessions.
+    """
+
+    def __init__(self, max_size=32, persist=False):
+        """
+        :param int max_size: Maximum number of contexts held, 0 disables the
+            cache.
+        :param bool persist: Whether entries are saved to disk.
+        """
+        self._max_size = max_size
+        self._persist = persist
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded_from = None
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_size=None, persist=None):
+        """
+        Update the cache settings.
+
+        :param int max_size: Maximum number of contexts held, 0 disables the
+            cache. Unchanged if None.
+        :param bool persist: Whether entries are saved to disk. Unchanged if
+            None.
+        """
+        with self._lock:
+            if max_size is not None:
+                self._max_size = max_size
+                self._trim()
+            if persist is not None:
+                self._persist = persist
+
+    def get_context(self, tk, path):
+        """
+        Return the context for the given path, resolving it if it isn't cached.
+
+        :param tk: Toolkit API instance.
+        :param str path: Path to the file to get the context for.
+        :returns: A :class:`sgtk.Context`.
+        """
+        if not self._max_size:
+            return tk.context_from_path(path)
+
+        key = self._get_key(tk, path)
+        if self._persist and self._loaded_from != self._get_cache_file(tk):
+            self._load(tk)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            logger.debug("Context for %s found in cache.", path)
+            if isinstance(entry, dict):
+                # loaded from disk, rebuild the context object once.
+                entry = sgtk.Context.from_dict(tk, entry)
+                with self._lock:
+                    self._entries[key] = entry
+            return entry
+
+        self.misses += 1
+        context = tk.context_from_path(path)
+        with self._lock:
+            self._entries[key] = context
+            self._trim()
+        if self._persist:
+            self._save(tk)
+        return context
+
+    def invalidate(self, tk=None):
+        """
+        Forget all cached contexts, for example because the pipeline
+        configuration changed.
+
+        :param tk: Optional Toolkit API instance. If set, the persisted
+            entries for its pipeline configuration are removed as well.
+        """
+        with self._lock:
+            self._entries.clear()
+        if tk is not None:
+            cache_file = self._get_cache_file(tk)
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+        logger.debug("Context cache invalidated.")
+
+    def get_stats(self):
+        """
+        :returns: A dictionary with ``hits``, ``misses`` and ``size`` keys.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _trim(self):
+        """
+        Discard the least recently used entries beyond the maximum size.
+        """
+        while len(self._entries) > max(0, self._max_size):
+            self._entries.popitem(last=False)
+
+    def _get_key(self, tk, path):
+        """
+        Build the cache key for the given path.
+
+        :param tk: Toolkit API instance.
+        :param str path: Path to the file.
+        :returns: The key, as a string so it can be persisted.
+        """
+        config_location = tk.pipeline_configuration.get_config_location()
+        stamp = []
+        for stamp_path in CONFIG_STAMP_PATHS:
+            try:
+                stamp.append(
+                    str(os.stat(os.path.join(config_location, stamp_path)).st_mtime_ns)
+                )
+            except OSError:
+                stamp.append("-")
+        return "%s|%s|%s" % (
+            sgtk.util.ShotgunPath.normalize(path),
+            config_location,
+            ":".join(stamp),
+        )
+
+    def _get_cache_file(self, tk):
+        """
+        :param tk: Toolkit API instance.
+        :returns: Path to the file the entries are persisted in.
+        """
+        site_root = sgtk.util.LocalFileStorageManager.get_site_root(
+            tk.shotgun_url, sgtk.util.LocalFileStorageManager.CACHE
+        )
+        return os.path.join(site_root, "tk-motionbuilder", "context_cache.json")
+
+    def _load(self, tk):
+        """
+        Load the persisted entries, keeping the ones already in memory.
+
+        :param tk: Toolkit API instance.
+        """
+        cache_file = self._get_cache_file(tk)
+        self._loaded_from = cache_file
+        try:
+            with open(cache_file, "r") as fh:
+                data = json.load(fh)
+        except (IOError, OSError, ValueError):
+            return
+
+        with self._lock:
+            # entries are saved least recently used first.
+            for key, context_dict in reversed(data):
+                self._entries.setdefault(key, context_dict)
+                self._entries.move_to_end(key, last=False)
+            self._trim()
+
+    def _save(self, tk):
+        """
+        Persist the cached entries.
+
+        :param tk: Toolkit API instance.
+        """
+        cache_file = self._get_cache_file(tk)
+        with self._lock:
+            data = [
+                (key, entry if isinstance(entry, dict) else entry.to_dict())
+                for key, entry in self._entries.items()
+            ]
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(cache_file))
+            tmp_file = "%s.%d.tmp" % (cache_file, os.getpid())
+            with open(tmp_file, "w") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_file, cache_file)
+        except (IOError, OSError) as e:
+            logger.debug("Could not save the context cache to %s: %s", cache_file, e)
+
+
+# Cache shared by all the engine instances of the session.
+_context_cache = ContextCache()
+
+
+def get_context_cache():
+    """
+    :returns: The :class:`ContextCache` shared by the engines of this session.
+    """
+    return _context_cache
@@ -0,0 +1,296 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Background prefetch of the data derived from the engine context.
+
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+def _get_entity_details(context):
+    """
+    :returns: The main fields of the context entity, or None if the context
+        has no entity.
+    """
+    if not context.entity:
+        return None
+    return context.sgtk.shotgun.find_one(
+        context.entity["type"],
+        [["id", "is", context.entity["id"]]],
+        ["code", "description", "sg_status_list", "image"],
+    )
+
+
+def _get_task_status(context):
+    """
+    :returns: The status and main fields of the context task, or None if the
+        context has no task.
+    """
+    if not context.task:
+        return None
+    return context.sgtk.shotgun.find_one(
+        "Task",
+        [["id", "is", context.task["id"]]],
+        ["content", "sg_status_list", "due_date", "task_assignees"],
+    )
+
+
+# Values prefetched for each context, in the order they are computed.
+PREFETCHED_VALUES = collections.OrderedDict(
+    [
+        ("shotgun_url", lambda context: context.shotgun_url),
+        ("filesystem_locations", lambda context: context.filesystem_locations),
+    ]
+)
+
+# Values which each cost a Flow Production Tracking query, only prefetched
+# for the next contexts once something asked for them.
+ON_DEMAND_VALUES = collections.OrderedDict(
+    [
+        ("entity_details", _get_entity_details),
+        ("task_status", _get_task_status),
+    ]
+)
+
+
+class ContextPrefetcher(object):
+    """
+    Computes the values derived from a context in a background thread, so
+    they are readily available when a menu command needs them.
+
+    Values are computed one at a time, in a single worker thread. Getting a
+    value which is being prefetched waits for it, up to a timeout, getting
+    one which wasn't prefetched yet computes it right away. Values which are
+    only available on demand are prefetched once they were first asked for.
+    Prefetching a
+    context again, when it becomes current again for example, computes its
+    values again, so they don't go stale over the session. Prefetched values
+    are kept until the context is discarded to make room for more recent
+    ones, or until :meth:`clear` is called.
+    """
+
+    def __init__(self, max_contexts=8, values=None, on_demand_values=None, timeout=2.0):
+        """
+        :param int max_contexts: Number of contexts whose values are kept,
+            the least recently prefetched ones are discarded.
+        :param values: Optional dictionary of functions computing each value
+            from a context, by name. Defaults to :data:`PREFETCHED_VALUES`.
+        :param on_demand_values: Optional dictionary of functions computing
+            the values only prefetched once they were asked for, by name.
+            Defaults to :data:`ON_DEMAND_VALUES`.
+        :param float timeout: Maximum time in seconds :meth:`get` waits for a
+            value being prefetched before computing it itself.
+        """
+        self._max_contexts = max_contexts
+        self._timeout = timeout
+        self._values = collections.OrderedDict(
+            values if values is not None else PREFETCHED_VALUES
+        )
+        self._on_demand_values = (
+            on_demand_values if on_demand_values is not None else ON_DEMAND_VALUES
+        )
+        # futures of the values, by value name, by context key
+        self._futures = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tk-motionbuilder-prefetch"
+        )
+        # number of values computed in the background and on demand, and
+        # the time spent, by value name
+        self._timings = collections.defaultdict(
+            lambda: {
+                "hits": 0,
+                "prefetch_count": 0,
+                "prefetch_time": 0.0,
+                "on_demand_count": 0,
+                "on_demand_time": 0.0,
+            }
+        )
+
+    def prefetch(self, context):
+        """
+        Start computing the values for the given context in the background,
+        replacing the values previously prefetched for it.
+
+        :param context: The :class:`sgtk.Context` to compute the values for.
+        """
+        key = self._get_key(context)
+        with self._lock:
+            previous = self._futures.pop(key, {})
+            for future in previous.values():
+                future.cancel()
+            futures = {}
+            for name, compute in self._values.items():
+                futures[name] = self._executor.submit(
+                    self._compute, name, compute, context
+                )
+            self._futures[key] = futures
+            while len(self._futures) > self._max_contexts:
+                _, discarded = self._futures.popitem(last=False)
+                for future in discarded.values():
+                    future.cancel()
+
+    def get(self, context, name, timeout=None):
+        """
+        Return a value for the given context, computing it if it wasn't
+        prefetched, or if it is still being prefetched once the timeout is
+        over.
+
+        :param context: The :class:`sgtk.Context` to get the value for.
+        :param str name: Name of the value, one of the keys of the values
+            or on demand values the prefetcher was created with.
+        :param float timeout: Maximum time in seconds to wait for the value
+            being prefetched. Defaults to the timeout of the prefetcher.
+        :returns: The value.
+        """
+        key = self._get_key(context)
+        with self._lock:
+            future = self._futures.get(key, {}).get(name)
+            compute = self._values.get(name)
+            if compute is None:
+                # prefetch the value for the next contexts from now on.
+                compute = self._on_demand_values[name]
+                self._values[name] = compute
+
+        # values which didn't start being computed yet are computed right
+        # away rather than waiting for the ones queued before them.
+        if future is not None and not future.cancel():
+            try:
+                value = future.result(
+                    timeout=self._timeout if timeout is None else timeout
+                )
+            except concurrent.futures.TimeoutError:
+                logger.debug("Timed out waiting for the prefetched %s.", name)
+            except Exception:
+                # already logged by the worker, try again.
+                pass
+            else:
+                self._record(name, "hits")
+                return value
+
+        start = time.perf_counter()
+        value = compute(context)
+        self._record(name, "on_demand", time.perf_counter() - start)
+
+        # keep the value for the next calls if the context is prefetched.
+        done = concurrent.futures.Future()
+        done.set_result(value)
+        with self._lock:
+            if key in self._futures:
+                self._futures[key][name] = done
+        return value
+
+    def get_metrics(self):
+        """
+        :returns: A list of dictionaries with, for each value, the number of
+            times it was served from the prefetched values and the average
+            time in milliseconds spent computing it in the background and on
+            demand.
+        """
+        metrics = []
+        with self._lock:
+            for name, timings in self._timings.items():
+                metrics.append(
+                    {
+                        "name": name,
+                        "hits": timings["hits"],
+                        "prefetch_count": timings["prefetch_count"],
+                        "avg_prefetch_ms": _average_ms(
+                            timings["prefetch_time"], timings["prefetch_count"]
+                        ),
+                        "on_demand_count": timings["on_demand_count"],
+                        "avg_on_demand_ms": _average_ms(
+                            timings["on_demand_time"], timings["on_demand_count"]
+                        ),
+                    }
+                )
+        return metrics
+
+    def clear(self):
+        """
+        Discard all the prefetched values.
+        """
+        with self._lock:
+            futures = self._futures
+            self._futures = collections.OrderedDict()
+        for context_futures in futures.values():
+            for future in context_futures.values():
+                future.cancel()
+
+    def shutdown(self):
+        """
+        Discard the values which didn't start being computed, and stop the
+        worker once the running one is done.
+        """
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _compute(self, name, compute, context):
+        """
+        Compute a value in the worker thread.
+        """
+        start = time.perf_counter()
+        try:
+            return compute(context)
+        except Exception:
+            logger.debug("Failed to prefetch %s for %s.", name, context, exc_info=True)
+            raise
+        finally:
+            self._record(name, "prefetch", time.perf_counter() - start)
+
+    def _record(self, name, kind, duration=None):
+        """
+        Record a value being served.
+
+        :param str name: Name of the value.
+        :param str kind: "hits" for a prefetched value, "prefetch" or
+            "on_demand" for a value computed in the background or on demand.
+        :param float duration: Time in seconds spent computing the value.
+        """
+        with self._lock:
+            timings = self._timings[name]
+            if duration is None:
+                timings[kind] += 1
+            else:
+                timings["%s_count" % kind] += 1
+                timings["%s_time" % kind] += duration
+
+    def _get_key(self, context):
+        """
+        :returns: A hashable key identifying the given context.
+        """
+        return tuple(
+            (entity["type"], entity["id"]) if entity else None
+            for entity in (
+                context.project,
+                context.entity,
+                context.step,
+                context.task,
+                context.user,
+            )
+        )
+
+
+def _average_ms(total, count):
+    """
+    :returns: The average duration in milliseconds, from a total in seconds.
+    """
+    if not count:
+        return 0.0
+    return total / count * 1e3
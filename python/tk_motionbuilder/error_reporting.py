@@ -0,0 +1,328 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Deduplicated, rate-limited error reporting for Motionbuilder.
+
+"""
+
+import collections
+import threading
+import time
+import traceback
+
+
+class ErrorEntry(object):
+    """
+    A single distinct error, with the number of times it occurred.
+    """
+
+    def __init__(self, key, message):
+        """
+        :param key: Hashable identifying the error.
+        :param str message: The message of the first occurrence.
+        """
+        self.key = key
+        self.message = message
+        self.count = 0
+        self.reported_count = 0
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+
+    @property
+    def title(self):
+        """
+        First line of the message, used in summaries.
+        """
+        return self.message.strip().split("\n", 1)[0]
+
+    def to_dict(self):
+        """
+        :returns: A dictionary describing this error.
+        """
+        return {
+            "message": self.message,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+        }
+
+
+class ErrorAggregator(object):
+    """
+    Groups identical errors and reports them through a single non-modal dialog.
+
+    Errors are keyed by exception type and traceback signature (the file,
+    line and function of each frame) so an error raised over and over, on
+    every idle tick for example, is counted rather than reported again. At
+    most one summary is shown per report interval; errors occurring in the
+    meantime are counted and shown in the next summary, and the whole
+    history remains available through :meth:`get_history`.
+
+    Errors occurring in background threads are recorded and reported from
+    the main thread by a Qt timer, once :meth:`start` has been called.
+    """
+
+    def __init__(
+        self,
+        report_interval=30,
+        max_history=100,
+        dialog_parent=None,
+        poll_interval=1000,
+    ):
+        """
+        :param int report_interval: Minimum delay in seconds between two
+            summaries.
+        :param int max_history: Maximum number of distinct errors kept. The
+            oldest ones are discarded first.
+        :param dialog_parent: Optional callable returning the parent widget
+            for the summary dialog.
+        :param int poll_interval: Delay in milliseconds between two checks
+            for errors occurring in background threads.
+        """
+        self._report_interval = report_interval
+        self._max_history = max(1, max_history)
+        self._dialog_parent = dialog_parent
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._suppressed_count = 0
+        self._last_report_time = None
+        self._report_pending = False
+        self._background_pending = False
+        self._poll_interval = poll_interval
+        self._timer = None
+        self._dialog = None
+
+    @property
+    def suppressed_count(self):
+        """
+        Number of occurrences which were not shown when they happened.
+        """
+        return self._suppressed_count
+
+    def start(self):
+        """
+        Start reporting the errors occurring in background threads from a Qt
+        timer.
+
+        Must be called from the main thread, once Qt is available.
+        """
+        if self._timer is not None:
+            return
+
+        from sgtk.platform.qt import QtCore
+
+        self._timer = QtCore.QTimer()
+        self._timer.setInterval(self._poll_interval)
+        self._timer.timeout.connect(self._on_poll_timeout)
+        self._timer.start()
+
+    def stop(self):
+        """
+        Stop the timer reporting the errors occurring in background threads.
+        """
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    def add_exception(self, ex_cls, ex, tb):
+        """
+        Record an exception and report it if allowed.
+
+        :param ex_cls: The exception class.
+        :param ex: The exception instance.
+        :param tb: The traceback object.
+        """
+        message = "".join(traceback.format_exception(ex_cls, ex, tb))
+        self._add(_exception_key(ex_cls, tb), message)
+
+    def add_record(self, message, record):
+        """
+        Record an error log record and report it if allowed.
+
+        :param str message: The formatted message.
+        :param record: Standard python logging record.
+        :type record: :class:`~python.logging.LogRecord`
+        """
+        if record.exc_info and record.exc_info[0]:
+            key = _exception_key(record.exc_info[0], record.exc_info[2])
+        else:
+            # use the unformatted message so messages only differing by
+            # their arguments are grouped together.
+            key = (record.name, record.pathname, record.lineno, str(record.msg))
+        self._add(key, message)
+
+    def get_history(self):
+        """
+        :returns: A list of dictionaries describing the distinct errors which
+            occurred, oldest first. See :meth:`ErrorEntry.to_dict`.
+        """
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+    def clear(self):
+        """
+        Forget all errors and close the summary dialog if shown.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._suppressed_count = 0
+            self._background_pending = False
+        if self._dialog is not None:
+            self._dialog.close()
+            self._dialog = None
+
+    def _add(self, key, message):
+        """
+        Count an occurrence of the given error and report it if allowed.
+
+        :param key: Hashable identifying the error.
+        :param str message: The message of this occurrence.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                entry = ErrorEntry(key, message)
+                if len(self._entries) >= self._max_history:
+                    self._entries.popitem(last=False)
+            self._entries[key] = entry
+            entry.count += 1
+            entry.last_seen = time.time()
+
+            if threading.current_thread() is not threading.main_thread():
+                # no UI from background threads, the main thread timer
+                # reports the error.
+                self._suppressed_count += 1
+                self._background_pending = True
+                return
+
+        self._report()
+
+    def _report(self, counted=False):
+        """
+        Show the errors not reported yet if allowed, or schedule a summary
+        once the report interval is over. Must be called from the main
+        thread.
+
+        :param bool counted: Whether the errors were already counted as
+            suppressed, when they occurred in a background thread.
+        """
+        if self._dialog is not None and self._dialog.isVisible():
+            # the summary is already on screen, bring it up to date.
+            self._show_summary()
+            return
+
+        elapsed = time.time() - (self._last_report_time or 0)
+        if elapsed >= self._report_interval:
+            self._show_summary()
+            return
+
+        if not counted:
+            with self._lock:
+                self._suppressed_count += 1
+        if not self._report_pending:
+            # show what happened in the meantime once the interval is over.
+            self._report_pending = True
+            self._schedule(self._report_interval - elapsed)
+
+    def _schedule(self, delay):
+        """
+        Show a summary after the given delay.
+
+        :param float delay: Delay in seconds.
+        """
+        try:
+            from sgtk.platform.qt import QtCore
+
+            QtCore.QTimer.singleShot(int(delay * 1000), self._on_report_timeout)
+        except Exception:
+            self._report_pending = False
+
+    def _on_poll_timeout(self):
+        """
+        Called by the poll timer, report the errors which occurred in
+        background threads.
+        """
+        with self._lock:
+            pending = self._background_pending
+            self._background_pending = False
+        if pending:
+            self._report(counted=True)
+
+    def _on_report_timeout(self):
+        """
+        Called when a scheduled summary is due.
+        """
+        self._report_pending = False
+        if any(e.count > e.reported_count for e in list(self._entries.values())):
+            self._show_summary()
+
+    def _show_summary(self):
+        """
+        Show the errors not reported yet in a non-modal dialog, with the full
+        history in its expandable details section.
+        """
+        self._last_report_time = time.time()
+        with self._lock:
+            entries = list(self._entries.values())
+            new_entries = [e for e in entries if e.count > e.reported_count]
+            for entry in entries:
+                entry.reported_count = entry.count
+
+        if not new_entries:
+            new_entries = entries[-1:]
+
+        lines = []
+        for entry in new_entries:
+            if entry.count > 1:
+                lines.append("%s (x%d)" % (entry.title, entry.count))
+            else:
+                lines.append(entry.title)
+        summary = "\n".join(lines)
+        if len(new_entries) > 1:
+            summary = "%d errors occurred:\n\n%s" % (len(new_entries), summary)
+
+        details = "\n\n".join(
+            "[x%d] %s" % (entry.count, entry.message.strip())
+            for entry in reversed(entries)
+        )
+
+        try:
+            from sgtk.platform.qt import QtCore, QtGui
+
+            if self._dialog is None:
+                parent = self._dialog_parent() if self._dialog_parent else None
+                self._dialog = QtGui.QMessageBox(parent)
+                self._dialog.setIcon(QtGui.QMessageBox.Critical)
+                self._dialog.setWindowTitle("PTR Error")
+                self._dialog.setStandardButtons(QtGui.QMessageBox.Ok)
+                self._dialog.setWindowModality(QtCore.Qt.NonModal)
+            self._dialog.setText(summary)
+            self._dialog.setDetailedText(details)
+            self._dialog.show()
+            self._dialog.raise_()
+        except Exception:
+            # no Qt available, the script editor is the best we can do.
+            print(summary)
+
+
+def _exception_key(ex_cls, tb):
+    """
+    Build a key identifying an exception by its type and the location of each
+    frame of its traceback.
+
+    :param ex_cls: The exception class.
+    :param tb: The traceback object, or None.
+    :returns: A hashable key.
+    """
+    frames = tuple(
+        (frame.filename, frame.lineno, frame.name) for frame in traceback.extract_tb(tb)
+    )
+    return (getattr(ex_cls, "__name__", str(ex_cls)), frames)
@@ -0,0 +1,82 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tracking of the handlers added to Motionbuilder events.
+
+"""
+
+
+class EventHandlerRegistry(object):
+    """
+    Records the handlers added to Motionbuilder events so they can be removed.
+
+    Motionbuilder events, ``FBGenericMenu.OnMenuActivate`` for example, keep
+    their handlers alive until they are explicitly removed. Handlers which
+    are never removed keep firing, and keep alive the objects they are bound
+    to, long after the menus and engines which added them are gone.
+    """
+
+    def __init__(self):
+        # list of (owner, event name, handler) tuples
+        self._subscriptions = []
+
+    @property
+    def count(self):
+        """
+        Number of handlers currently added.
+        """
+        return len(self._subscriptions)
+
+    def add(self, owner, event_name, handler):
+        """
+        Add a handler to an event.
+
+        :param owner: The Motionbuilder object owning the event, for example
+            a ``FBGenericMenu``.
+        :param str event_name: Name of the event, for example
+            ``"OnMenuActivate"``.
+        :param handler: The callable to add.
+        """
+        getattr(owner, event_name).Add(handler)
+        self._subscriptions.append((owner, event_name, handler))
+
+    def remove(self, owner):
+        """
+        Remove all the handlers added to the events of the given object.
+
+        :param owner: The Motionbuilder object owning the events.
+        """
+        remaining = []
+        for subscription in self._subscriptions:
+            if subscription[0] is owner:
+                self._detach(*subscription)
+            else:
+                remaining.append(subscription)
+        self._subscriptions = remaining
+
+    def remove_all(self):
+        """
+        Remove all the handlers added through this registry.
+        """
+        subscriptions = self._subscriptions
+        self._subscriptions = []
+        for subscription in subscriptions:
+            self._detach(*subscription)
+
+    def _detach(self, owner, event_name, handler):
+        """
+        Remove a handler from an event, ignoring objects which are gone.
+        """
+        try:
+            getattr(owner, event_name).Remove(handler)
+        except Exception:
+            # the object owning the event has already been destroyed.
+            pass
@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Fast copies and hashes of scene files.
+
+"""
+
+import hashlib
+import os
+import shutil
+
+import sgtk
+from sgtk.util.filesystem import ensure_folder_exists
+
+logger = sgtk.platform.get_logger(__name__)
+
+# ioctl cloning a file on Linux file systems supporting it, btrfs and xfs for
+# example, see ioctl_ficlone(2).
+FICLONE = 0x40049409
+
+# Method used to copy a file, returned by copy_file.
+REFLINK = "reflink"
+COPY = "copy"
+
+# Size of the chunks files are read in when hashed, so hashing a multi
+# gigabytes scene only uses a bounded amount of memory.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def copy_file(source, destination):
+    """
+    Copy a file, as fast as the file system allows.
+
+    The copy shares the data of the source file if the file system supports
+    it, reflinks on Linux, otherwise the data is copied by the OS with
+    :func:`shutil.copyfile`, which uses in kernel copies where available.
+    Hard links are never used: the copy would then be the same file as the
+    source, and writing to one would modify the other.
+
+    :param str source: Path to the file to copy.
+    :param str destination: Path to the copy, which must not exist.
+    :returns: The method used, :data:`REFLINK` or :data:`COPY`.
+    """
+    ensure_folder_exists(os.path.dirname(destination))
+
+    if _reflink(source, destination):
+        return REFLINK
+
+    shutil.copyfile(source, destination)
+    return COPY
+
+
+def _reflink(source, destination):
+    """
+    Clone a file on Linux file systems supporting it.
+
+    :returns: True if the file was cloned, False if cloning isn't supported.
+    """
+    if not sgtk.util.is_linux():
+        return False
+
+    import fcntl
+
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            # not supported by the file system, or across file systems.
+            logger.debug("Could not clone %s: %s", source, e)
+
+    # remove the empty file created for the clone.
+    os.remove(destination)
+    return False
+
+
+def hash_file(path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Hash the content of a file with BLAKE2, reading it in chunks.
+
+    :param str path: Path to the file.
+    :param int chunk_size: Size in bytes of the chunks read.
+    :returns: The hexadecimal digest of the file content.
+    """
+    digest = hashlib.blake2b()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
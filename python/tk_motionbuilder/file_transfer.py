@@ -0,0 +1,260 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Write-behind transfers of files saved to a local staging folder.
+
+"""
+
+import concurrent.futures
+import hashlib
+import os
+import time
+import uuid
+
+import sgtk
+from sgtk.util.filesystem import ensure_folder_exists
+
+from .file_copy import HASH_CHUNK_SIZE, hash_file
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class FileTransferQueue(object):
+    """
+    Moves files saved to a local staging folder to their final location,
+    network storage for example, from a background thread.
+
+    Each transfer copies the file to a temporary name next to its
+    destination, flushes it to disk, checks its content hash matches the
+    staged file and renames it to the destination, so the destination is
+    never a partially written file. Failed transfers are retried with an
+    exponential backoff, and logged as errors once all the retries failed.
+
+    A file saved to the destination directly while its transfer was pending,
+    the artist saving the session again for example, is never replaced by
+    the older staged file: the transfer is abandoned.
+    """
+
+    def __init__(self, staging_folder, max_workers=1, retries=3, backoff=1.0):
+        """
+        :param str staging_folder: Local folder the files are saved to before
+            being transferred.
+        :param int max_workers: Maximum number of files transferred at once.
+        :param int retries: Number of times a failed transfer is retried.
+        :param float backoff: Delay in seconds before the first retry, doubled
+            for each subsequent one.
+        """
+        self._staging_folder = staging_folder
+        self._retries = retries
+        self._backoff = backoff
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="tk-motionbuilder-transfer"
+        )
+        self._pending = set()
+        # content hashes of the files transferred, by normalized destination
+        self._digests = {}
+        # modification time and size of the files transferred, by normalized
+        # destination
+        self._written = {}
+
+    @property
+    def staging_folder(self):
+        """
+        Local folder the files are saved to before being transferred.
+        """
+        return self._staging_folder
+
+    def get_staging_path(self, path):
+        """
+        Return the path in the staging folder a file is saved to before being
+        transferred to the given path.
+
+        :param str path: Final path of the file.
+        :returns: The local path to save the file to.
+        """
+        folder_key = hashlib.sha1(
+            os.path.normcase(os.path.dirname(path)).encode("utf-8")
+        ).hexdigest()[:12]
+        return os.path.join(
+            self._staging_folder, "%s_%s" % (folder_key, os.path.basename(path))
+        )
+
+    def submit(self, local_path, destination):
+        """
+        Transfer a staged file to its destination in the background. The
+        staged file is removed once transferred.
+
+        :param str local_path: Path to the staged file.
+        :param str destination: Final path of the file.
+        :returns: A :class:`concurrent.futures.Future` whose result is the
+            destination once the file was transferred and verified.
+        """
+        logger.debug("Queuing the transfer of %s to %s.", local_path, destination)
+        future = self._executor.submit(
+            self._transfer, local_path, destination, _stat(destination)
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def get_digest(self, path):
+        """
+        Return the BLAKE2 hash of the content of a file transferred, computed
+        during the transfer, see :func:`hash_file`.
+
+        :param str path: Destination of the transfer.
+        :returns: The hexadecimal digest, or None if the file wasn't
+            transferred.
+        """
+        return self._digests.get(os.path.normcase(path))
+
+    def wait(self, timeout=None):
+        """
+        Wait for the pending transfers to complete.
+
+        :param float timeout: Maximum time in seconds to wait, or None to wait
+            until they complete.
+        :returns: True if all the transfers completed.
+        """
+        pending = list(self._pending)
+        if not pending:
+            return True
+        _, not_done = concurrent.futures.wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self):
+        """
+        Complete the pending transfers and stop the background thread.
+        """
+        if self._pending:
+            logger.info("Waiting for %d pending file transfers...", len(self._pending))
+        self._executor.shutdown(wait=True)
+
+    def _transfer(self, local_path, destination, destination_stat):
+        """
+        Transfer a staged file, retrying on failures.
+
+        :param destination_stat: The modification time and size of the
+            destination when the transfer was submitted, see :func:`_stat`.
+        :returns: The destination.
+        :raises sgtk.TankError: If the file couldn't be transferred, or the
+            destination was modified since the transfer was submitted.
+        """
+        start = time.perf_counter()
+        key = os.path.normcase(destination)
+        attempt = 0
+        while True:
+            try:
+                # the destination can only have been written by this queue
+                # since the transfer was submitted.
+                digest = self._copy_verified(
+                    local_path, destination, (destination_stat, self._written.get(key))
+                )
+                self._digests[key] = digest
+                self._written[key] = _stat(destination)
+                break
+            except _DestinationModified:
+                self._remove_staged_file(local_path)
+                msg = (
+                    "%s was saved again while its previous save was being "
+                    "transferred, the previous save was discarded." % (destination,)
+                )
+                logger.warning(msg)
+                raise sgtk.TankError(msg)
+            except (IOError, OSError, sgtk.TankError) as e:
+                if attempt >= self._retries:
+                    msg = (
+                        "Could not transfer %s to %s, the file is kept in the "
+                        "staging folder: %s" % (local_path, destination, e)
+                    )
+                    logger.error(msg)
+                    raise sgtk.TankError(msg)
+                delay = self._backoff * 2**attempt
+                attempt += 1
+                logger.warning(
+                    "Transfer of %s failed (%s), retrying in %.1fs...",
+                    destination,
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+
+        self._remove_staged_file(local_path)
+
+        logger.debug(
+            "Transferred %s in %.2fs.", destination, time.perf_counter() - start
+        )
+        return destination
+
+    def _remove_staged_file(self, local_path):
+        """
+        Remove a staged file once it was transferred or discarded.
+        """
+        try:
+            os.remove(local_path)
+        except OSError as e:
+            logger.debug("Could not remove the staged file %s: %s", local_path, e)
+
+    def _copy_verified(self, local_path, destination, expected_stats):
+        """
+        Copy a file to a temporary name next to its destination, check its
+        content and rename it to the destination.
+
+        :param expected_stats: The modification times and sizes the
+            destination is allowed to have, see :func:`_stat`.
+        :returns: The hexadecimal digest of the content of the file.
+        :raises _DestinationModified: If the destination was written by
+            something else than this queue since the transfer was submitted.
+        """
+        ensure_folder_exists(os.path.dirname(destination))
+        tmp_path = "%s.%s.tmp" % (destination, uuid.uuid4().hex[:8])
+        digest = hashlib.blake2b()
+        try:
+            with open(local_path, "rb") as src, open(tmp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            # read the copy back, to catch corruptions on the way.
+            if hash_file(tmp_path) != digest.hexdigest():
+                raise sgtk.TankError("Content of %s doesn't match." % tmp_path)
+
+            if _stat(destination) not in expected_stats:
+                raise _DestinationModified()
+            os.replace(tmp_path, destination)
+            return digest.hexdigest()
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class _DestinationModified(Exception):
+    """
+    Raised when the destination of a transfer was modified since the
+    transfer was submitted.
+    """
+
+
+def _stat(path):
+    """
+    :returns: The modification time and the size of a file, or None if it
+        doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,220 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Buffered log output for the Motionbuilder script editor.
+
+"""
+
+import collections
+import itertools
+import logging
+import threading
+
+
+class BufferedLogSink(object):
+    """
+    Queues log records in a bounded ring buffer and writes them out in batches.
+
+    Writing to the Motionbuilder script editor is slow and happens on the UI
+    thread, so when a lot of records are emitted (debug logging during a
+    context switch for example) printing them one by one stalls the
+    application. Once :meth:`start` has been called, records are only
+    queued and a Qt timer flushes them periodically, writing each batch with
+    a single call. If the buffer fills up before it can be flushed, the
+    oldest debug and info records are discarded and counted in
+    :attr:`dropped_count`. Warnings and errors are held in their own queue,
+    of the same size, and are only discarded if it fills up too.
+
+    Until :meth:`start` is called, or after :meth:`stop`, records are written
+    out as soon as they are emitted.
+    """
+
+    def __init__(
+        self,
+        write,
+        formatter,
+        debug_formatter=None,
+        error_handler=None,
+        flush_interval=250,
+        max_batch_size=500,
+        buffer_size=10000,
+    ):
+        """
+        :param write: Callable receiving a string made of one or more
+            formatted messages, separated by new lines.
+        :param formatter: :class:`logging.Formatter` used for the records.
+        :param debug_formatter: Optional :class:`logging.Formatter` used for
+            records below ``logging.INFO``. Defaults to ``formatter``.
+        :param error_handler: Optional callable receiving a single formatted
+            message and its record, used for ``logging.ERROR`` records and
+            above. Errors are passed to ``write`` if not set.
+        :param int flush_interval: Delay in milliseconds between two flushes.
+        :param int max_batch_size: Maximum number of records written per flush.
+        :param int buffer_size: Maximum number of records held in the buffer.
+        """
+        self._write = write
+        self._formatter = formatter
+        self._debug_formatter = debug_formatter or formatter
+        self._error_handler = error_handler
+        self._flush_interval = flush_interval
+        self._max_batch_size = max(1, max_batch_size)
+        self._buffer_size = max(1, buffer_size)
+        # (sequence number, record) tuples, the sequence numbers keep the
+        # order of the records across the two queues.
+        self._records = collections.deque()
+        self._high_records = collections.deque()
+        self._sequence = itertools.count()
+        # Records can be emitted from any thread, the buffer is only
+        # flushed from the main thread.
+        self._lock = threading.Lock()
+        self._dropped_count = 0
+        self._reported_dropped_count = 0
+        self._timer = None
+
+    @property
+    def dropped_count(self):
+        """
+        Number of records discarded because the buffer was full.
+        """
+        return self._dropped_count
+
+    @property
+    def is_buffering(self):
+        """
+        Whether records are currently buffered rather than written right away.
+        """
+        return self._timer is not None
+
+    def start(self):
+        """
+        Start buffering records and flushing them from a Qt timer.
+
+        Must be called from the main thread, once Qt is available.
+        """
+        if self._timer is not None:
+            return
+
+        from sgtk.platform.qt import QtCore
+
+        self._timer = QtCore.QTimer()
+        self._timer.setInterval(self._flush_interval)
+        self._timer.timeout.connect(self._on_timeout)
+        self._timer.start()
+
+    def stop(self):
+        """
+        Stop the flush timer and write out any pending records.
+
+        Records emitted afterwards are written right away.
+        """
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self.flush()
+
+    def emit(self, record):
+        """
+        Queue the given record, or write it right away if not buffering.
+
+        :param record: Standard python logging record.
+        :type record: :class:`~python.logging.LogRecord`
+        """
+        if self._timer is None:
+            self._output([record])
+            return
+
+        with self._lock:
+            entry = (next(self._sequence), record)
+            if record.levelno >= logging.WARNING:
+                if len(self._high_records) >= self._buffer_size:
+                    self._high_records.popleft()
+                    self._dropped_count += 1
+                self._high_records.append(entry)
+            else:
+                self._records.append(entry)
+            # make room by discarding the oldest debug and info records.
+            if len(self._records) + len(self._high_records) > self._buffer_size:
+                if self._records:
+                    self._records.popleft()
+                    self._dropped_count += 1
+
+    def flush(self, limit=None):
+        """
+        Write out pending records.
+
+        :param int limit: Maximum number of records to write. All pending
+            records are written if None.
+        """
+        with self._lock:
+            count = len(self._records) + len(self._high_records)
+            if limit is not None:
+                count = min(count, limit)
+            batch = [self._pop_oldest() for _ in range(count)]
+            dropped = self._dropped_count - self._reported_dropped_count
+            self._reported_dropped_count = self._dropped_count
+
+        if dropped:
+            self._write(
+                "PTR: %d log messages were dropped because they were emitted "
+                "faster than they could be displayed." % dropped
+            )
+        if batch:
+            self._output(batch)
+
+    def _pop_oldest(self):
+        """
+        Remove the oldest record from the queues, the lock being held.
+
+        :returns: The :class:`~python.logging.LogRecord`.
+        """
+        if not self._high_records or (
+            self._records and self._records[0][0] < self._high_records[0][0]
+        ):
+            return self._records.popleft()[1]
+        return self._high_records.popleft()[1]
+
+    def _on_timeout(self):
+        """
+        Called by the flush timer.
+        """
+        self.flush(self._max_batch_size)
+
+    def _output(self, records):
+        """
+        Format the given records and write them out.
+
+        Consecutive records are joined and written with a single call, errors
+        are handed individually to the error handler if there is one.
+
+        :param records: List of :class:`~python.logging.LogRecord`.
+        """
+        lines = []
+        for record in records:
+            if record.levelno < logging.INFO:
+                msg = self._debug_formatter.format(record)
+            else:
+                msg = self._formatter.format(record)
+
+            if record.levelno < logging.ERROR:
+                lines.append(msg)
+                continue
+
+            if self._error_handler is None:
+                lines.append(msg)
+                continue
+
+            if lines:
+                self._write("\n".join(lines))
+                lines = []
+            self._error_handler(msg, record)
+
+        if lines:
+            self._write("\n".join(lines))
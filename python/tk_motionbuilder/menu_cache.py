@@ -0,0 +1,164 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+On disk cache of the menu layouts.
+
+"""
+
+import hashlib
+import json
+import os
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Bumped when the format of the cached layouts changes.
+CACHE_VERSION = 1
+
+
+class MenuLayoutCache(object):
+    """
+    Cache of the menu layouts computed by the :class:`MenuGenerator`.
+
+    The layout of the menu only depends on the engine and apps settings and
+    on the versions of the apps, so it is saved to disk under a hash of the
+    environment configuration files modification times and of the apps
+    descriptors, and reused by the next sessions running the same configuration, rather
+    than being computed again from the engine commands.
+
+    A cached layout is only used if the engine registered exactly the commands
+    it was computed from, since apps can register different commands
+    depending on their environment.
+    """
+
+    def __init__(self, folder):
+        """
+        :param str folder: Folder the layouts are saved in.
+        """
+        self._folder = folder
+        # layouts already read or written during this session, by key
+        self._layouts = {}
+
+    def get_key(self, engine, *extra):
+        """
+        Compute the cache key for the given engine configuration.
+
+        The settings of the engine and apps all come from the environment
+        configuration files, so the key is computed from the modification
+        times of those files and from the descriptors of the engine and apps
+        rather than from the settings themselves, which would be as slow to
+        serialize as computing the layout.
+
+        :param engine: The engine the menu is built for.
+        :param extra: Additional values the layout depends on.
+        :returns: The key, as a hexadecimal string, or None if the environment
+            configuration files can't be found, in which case the layout
+            shouldn't be cached.
+        """
+        env_files = _get_environment_files(engine.environment.get("disk_location"))
+        if not env_files:
+            return None
+
+        data = [
+            CACHE_VERSION,
+            engine.environment.get("name"),
+            engine.instance_name,
+            engine.descriptor.get_uri(),
+            [
+                (name, app.descriptor.get_uri())
+                for name, app in sorted(engine.apps.items())
+            ],
+            env_files,
+            extra,
+        ]
+        payload = json.dumps(data, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key, command_names):
+        """
+        Return the layout saved under the given key.
+
+        :param str key: Key returned by :meth:`get_key`.
+        :param command_names: Names of the commands currently registered.
+        :returns: The layout, as saved with :meth:`save`, or None if it isn't
+            cached or was computed from other commands.
+        """
+        data = self._layouts.get(key)
+        if data is None:
+            try:
+                with open(self._get_path(key), "r") as fh:
+                    data = json.load(fh)
+            except (IOError, OSError, ValueError):
+                return None
+            self._layouts[key] = data
+
+        if set(data["commands"]) != set(command_names):
+            logger.debug("Cached menu layout %s doesn't match the commands.", key)
+            return None
+        return data["layout"]
+
+    def save(self, key, layout, command_names):
+        """
+        Save a layout under the given key.
+
+        :param str key: Key returned by :meth:`get_key`.
+        :param layout: The layout to save, which must be serializable as json.
+        :param command_names: Names of the commands the layout was computed
+            from.
+        """
+        data = {"commands": sorted(command_names), "layout": layout}
+        self._layouts[key] = data
+
+        path = self._get_path(key)
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(self._folder)
+            tmp_path = "%s.%d.tmp" % (path, os.getpid())
+            with open(tmp_path, "w") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as e:
+            logger.debug("Could not save the menu layout to %s: %s", path, e)
+
+    def _get_path(self, key):
+        """
+        :param str key: Key returned by :meth:`get_key`.
+        :returns: Path to the file the layout is saved in.
+        """
+        return os.path.join(self._folder, "%s.json" % key)
+
+
+def _get_environment_files(env_path):
+    """
+    List the configuration files an environment is read from, with their
+    modification times.
+
+    Environments include files from their folder and its sub folders, so all
+    the yml files found there are listed.
+
+    :param str env_path: Path to the environment file.
+    :returns: Sorted list of ``(path, mtime)`` tuples, empty if the file
+        doesn't exist.
+    """
+    if not env_path or not os.path.isfile(env_path):
+        return []
+
+    env_files = []
+    for root, _, file_names in os.walk(os.path.dirname(env_path)):
+        for file_name in file_names:
+            if not file_name.endswith(".yml"):
+                continue
+            path = os.path.join(root, file_name)
+            try:
+                env_files.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                continue
+    return sorted(env_files)
@@ -13,8 +13,7 @@ Menu handling for Motionbuilder
 
 """
 
-import os
-import sys
+import difflib
 import sgtk
 import webbrowser
 import unicodedata
@@ -23,19 +22,102 @@ from pyfbsdk import FBSystem
 from pyfbsdk import FBMenuManager
 from pyfbsdk import FBGenericMenu
 
+from .command_dispatcher import CommandDispatcher
+from .command_index import CommandEntry, CommandIndex
+from .event_handlers import EventHandlerRegistry
+
 logger = sgtk.platform.get_logger(__name__)
 
 
+class MenuNode(object):
+    """
+    Model of an item of the menu: a command, a separator or a sub menu.
+    """
+
+    COMMAND = "command"
+    SEPARATOR = "separator"
+    SUBMENU = "submenu"
+
+    def __init__(self, kind, label="", children=None):
+        """
+        :param str kind: One of COMMAND, SEPARATOR or SUBMENU.
+        :param str label: The label displayed in the menu.
+        :param children: List of :class:`MenuNode` for a sub menu.
+        """
+        self.kind = kind
+        self.label = label
+        self.children = children or []
+        # Motionbuilder objects, set once the node has been added to the menu.
+        self.item = None
+        self.menu = None
+
+    @property
+    def key(self):
+        """
+        Key used to match nodes when updating the menu.
+        """
+        return (self.kind, self.label)
+
+    def to_dict(self):
+        """
+        :returns: A json serializable dictionary describing the node and its
+            children.
+        """
+        data = {"kind": self.kind, "label": self.label}
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a node from a dictionary returned by :meth:`to_dict`.
+
+        :param dict data: The node description.
+        :returns: A :class:`MenuNode`.
+        """
+        return cls(
+            data["kind"],
+            data["label"],
+            [cls.from_dict(child) for child in data.get("children", [])],
+        )
+
+
 class MenuGenerator(object):
     """
     Menu generation functionality for Motionbuilder
+
+    The generator keeps a model of the menu it built, so that it can be
+    updated with only the changes needed when the context or the commands
+    change, rather than being deleted and built again.
     """
 
-    def __init__(self, engine, menu_name):
+    def __init__(self, engine, menu_name, layout_cache=None, usage_stats=None):
+        """
+        :param engine: The engine the menu is built for.
+        :param str menu_name: Name of the menu.
+        :param layout_cache: Optional :class:`MenuLayoutCache` the computed
+            layouts are saved to and loaded from.
+        :param usage_stats: Optional :class:`UsageStats` recording the commands
+            run, and listing the ones shown in the recent commands section.
+        """
         self._engine = engine
         self._menu_name = menu_name
+        self._layout_cache = layout_cache
+        self._usage_stats = usage_stats
         self.__menu_index = 1
         self._callbacks = {}
+        self._menu_nodes = []
+        self._command_registry = None
+        self._dispatcher = CommandDispatcher(
+            on_command_run=usage_stats.record if usage_stats else None
+        )
+        # searchable commands, updated on demand after the menu changed
+        self._command_index = CommandIndex()
+        self._command_index_stale = True
+        self._command_palette = None
+        # handlers added to the menus, removed when the menu is destroyed
+        self._event_handlers = EventHandlerRegistry()
 
         # Currently, root-level menu items seem to cause Motionbuilder 2011 & 2012 to
         # crash (2013+ works fine though).  sub-menus work correctly so for <=2012 we
@@ -46,91 +128,98 @@ class MenuGenerator(object):
     ##########################################################################################
     # public methods
 
+    @property
+    def dispatcher(self):
+        """
+        The :class:`CommandDispatcher` running the menu commands.
+        """
+        return self._dispatcher
+
+    @property
+    def command_index(self):
+        """
+        The :class:`CommandIndex` of the menu commands, updated with the
+        changes made to the menu since it was last used.
+        """
+        if self._command_index_stale:
+            self._update_command_index()
+        return self._command_index
+
+    @property
+    def event_handler_count(self):
+        """
+        Number of handlers currently added to the menu events.
+        """
+        return self._event_handlers.count
+
     def create_menu(self):
         """
         Render the entire Shotgun menu.
         """
         # create main menu
-        menu_mgr = FBMenuManager()
-        sg_menu = menu_mgr.GetMenu(self._menu_name)
-        if not sg_menu:
-            menu_mgr.InsertBefore(None, "&Help", self._menu_name)
-            sg_menu = menu_mgr.GetMenu(self._menu_name)
+        sg_menu = self._get_sg_menu()
 
         if not self.__all_menus_nested:
             # need to handle root-level menu items
-            sg_menu.OnMenuActivate.Add(self.__menu_event)
+            self._event_handlers.add(sg_menu, "OnMenuActivate", self.__menu_event)
 
-        # now add the context item on top of the main menu
-        context_menu = self._add_context_menu(sg_menu)
+        self._menu_nodes = self._sync_menu(sg_menu, [], self._compute_layout())
 
-        # now enumerate all items and create menu objects for them
-        menu_items = []
-        for cmd_name, cmd_details in self._engine.commands.items():
-            menu_items.append(AppCommand(cmd_name, cmd_details))
+    def update_menu(self):
+        """
+        Update the Shotgun menu to reflect the current context and commands,
+        only inserting, deleting and renaming the items which changed.
+        """
+        if not self._menu_nodes:
+            self.create_menu()
+            return
 
-        # add separator:
-        sg_menu.InsertLast("", self.__next_menu_index())
+        self._menu_nodes = self._sync_menu(
+            self._get_sg_menu(), self._menu_nodes, self._compute_layout()
+        )
 
-        # now add favourites
-        favourites_menu = None
-        for fav in self._engine.get_setting("menu_favourites"):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-
-            # scan through all menu items
-            for cmd in menu_items:
-                if (
-                    cmd.get_app_instance_name() == app_instance_name
-                    and cmd.name == menu_name
-                ):
-                    # found our match!
-                    if self.__all_menus_nested:
-                        # workaround for bug in 2012 which causes Motionbuilder to crash
-                        # when clicking on root-level menu items
-                        if not favourites_menu:
-                            favourites_menu = FBGenericMenu()
-                            favourites_menu.OnMenuActivate.Add(self.__menu_event)
-                            sg_menu.InsertLast(
-                                "Favorites", self.__next_menu_index(), favourites_menu
-                            )
-                    else:
-                        favourites_menu = sg_menu
-
-                    # add to the favourites section of the menu:
-                    cmd.add_command_to_menu(favourites_menu, self.__next_menu_index())
-                    self._add_event_callback(cmd.name, cmd.callback)
+    def run_command(self, name):
+        """
+        Run a command of the menu on the next event loop iteration.
 
-                    # mark as a favourite item
-                    cmd.favourite = True
+        :param str name: Name of the command, as displayed in the menu.
+        :returns: True if the command was queued, False if it doesn't exist
+            or is already waiting to run.
+        """
+        callback = self._callbacks.get(name)
+        if callback is None and name in self._engine.commands:
+            # menu loaded from the layout cache, commands are bound by name.
+            callback = self._engine.commands[name]["callback"]
+        if callback is None:
+            return False
+
+        # execute callback on the next event loop iteration
+        # to disconnect the command from the menu.  Otherwise
+        # any apps that restart the engine (causing the menu to
+        # be rebuilt) can cause Motionbuilder to crash!
+        return self._dispatcher.dispatch(name, callback)
+
+    def show_command_palette(self, parent=None):
+        """
+        Show the command palette, to search and run the menu commands.
 
-        if favourites_menu:
-            # add separator:
-            sg_menu.InsertLast("", self.__next_menu_index())
+        :param parent: Optional widget the palette is shown over.
+        """
+        if self._command_palette is None:
+            # imported on demand, it needs Qt.
+            from .command_palette import CommandPalette
 
-        # now go through all of the menu items.
-        # separate them out into various sections
-        commands_by_app = {}
+            self._command_palette = CommandPalette(self, parent)
+        self._command_palette.popup()
 
-        for cmd in menu_items:
-            if cmd.get_type() == "context_menu":
-                # context menu!
-                cmd.add_command_to_menu(context_menu, self.__next_menu_index())
-                self._add_event_callback(cmd.name, cmd.callback)
-            else:
-                # normal menu
-                app_name = cmd.get_app_name()
-                if app_name is None:
-                    # un-parented app
-                    app_name = "Other Items"
-                if not app_name in commands_by_app:
-                    commands_by_app[app_name] = []
-                commands_by_app[app_name].append(cmd)
+    def destroy_menu(self):
+        self._event_handlers.remove_all()
 
-        # now add all apps to main menu
-        self._add_app_menu(sg_menu, commands_by_app)
+        if self._command_palette is not None:
+            self._command_palette.close()
+            self._command_palette.deleteLater()
+            self._command_palette = None
 
-    def destroy_menu(self):
         menu_mgr = FBMenuManager()
         menu = menu_mgr.GetMenu(self._menu_name)
 
@@ -142,11 +231,191 @@ class MenuGenerator(object):
                 item = next_item
             self.__menu_index = 1
             self._callbacks = {}
+        self._menu_nodes = []
+
+    ##########################################################################################
+    # menu layout
+
+    def _compute_layout(self):
+        """
+        Compute the layout of the menu for the current context and commands,
+        and register the callbacks of its items.
+
+        :returns: List of :class:`MenuNode` for the root menu.
+        """
+        self._command_index_stale = True
+        layout = self._get_layout()
+        self._add_recent_menu(layout)
+        return layout
+
+    def _get_layout(self):
+        """
+        Get the layout of the menu, without the recent commands.
+
+        The layout is loaded from the layout cache if it holds one for the
+        current configuration, in which case the commands callbacks are
+        looked up by name when they are clicked.
+
+        :returns: List of :class:`MenuNode` for the root menu.
+        """
+        if self._layout_cache is None:
+            return self._build_layout()
+
+        cache_key = self._layout_cache.get_key(self._engine, self.__all_menus_nested)
+        if cache_key is None:
+            return self._build_layout()
+
+        cached_layout = self._layout_cache.load(cache_key, self._engine.commands)
+        if cached_layout is not None:
+            self._callbacks = {}
+            self._command_registry = None
+            layout = [MenuNode.from_dict(data) for data in cached_layout]
+            # the context menu comes first, its label is the current context.
+            layout[0].label = str(self._engine.context)
+            self._add_context_callbacks()
+            return layout
+
+        layout = self._build_layout()
+        self._layout_cache.save(
+            cache_key, [node.to_dict() for node in layout], self._engine.commands
+        )
+        return layout
+
+    def _add_recent_menu(self, layout):
+        """
+        Add a sub menu with the commands used the most recently, after the
+        context menu, if enabled.
+
+        :param layout: List of :class:`MenuNode` for the root menu.
+        """
+        count = self._engine.get_setting("menu_recent_commands")
+        if not count or self._usage_stats is None:
+            return
+
+        # commands used in other configurations may not be available.
+        names = [
+            name
+            for name in self._usage_stats.get_recent()
+            if name in self._callbacks or name in self._engine.commands
+        ]
+        recent = [MenuNode(MenuNode.COMMAND, name) for name in names[:count]]
+        if recent:
+            # after the context menu and its separator
+            layout[2:2] = [
+                MenuNode(MenuNode.SUBMENU, "Recent", recent),
+                MenuNode(MenuNode.SEPARATOR),
+            ]
+
+    def _build_layout(self):
+        """
+        Build the layout of the menu from the engine commands, and register
+        the callbacks of its items.
+
+        :returns: List of :class:`MenuNode` for the root menu.
+        """
+        self._callbacks = {}
+        layout = []
+
+        # now add the context item on top of the main menu
+        context_menu = self._add_context_menu(layout)
+
+        # now index all commands
+        self._command_registry = CommandRegistry(self._engine)
+
+        # add separator:
+        layout.append(MenuNode(MenuNode.SEPARATOR))
+
+        # now add favourites
+        favourites = []
+        for cmd in self._get_favourite_commands(self._command_registry):
+            favourites.append(MenuNode(MenuNode.COMMAND, cmd.name))
+            self._add_event_callback(cmd.name, cmd.callback)
+
+        if favourites:
+            if self.__all_menus_nested:
+                # workaround for bug in 2012 which causes Motionbuilder to crash
+                # when clicking on root-level menu items
+                layout.append(MenuNode(MenuNode.SUBMENU, "Favorites", favourites))
+            else:
+                # add to the favourites section of the menu:
+                layout.extend(favourites)
+
+            # add separator:
+            layout.append(MenuNode(MenuNode.SEPARATOR))
+
+        # context menu!
+        for cmd in self._command_registry.get_by_type("context_menu"):
+            context_menu.children.append(MenuNode(MenuNode.COMMAND, cmd.name))
+            self._add_event_callback(cmd.name, cmd.callback)
+
+        # normal menu, separate commands by app
+        commands_by_app = {}
+        for app_name in self._command_registry.app_names:
+            cmds = [
+                cmd
+                for cmd in self._command_registry.get_by_app_name(app_name)
+                if cmd.get_type() != "context_menu"
+            ]
+            if cmds:
+                # un-parented commands are grouped under "Other Items"
+                commands_by_app.setdefault(app_name or "Other Items", []).extend(cmds)
+
+        # now add all apps to main menu
+        self._add_app_menu(layout, commands_by_app)
+
+        return layout
+
+    def _get_favourite_commands(self, registry):
+        """
+        Find the commands listed in the favourites setting, and mark them as
+        favourites.
+
+        :param registry: The :class:`CommandRegistry` of the engine commands.
+        :returns: List of :class:`AppCommand`.
+        """
+        favourites = []
+        for fav in self._engine.get_setting("menu_favourites"):
+            cmd = registry.get(fav["app_instance"], fav["name"])
+            if cmd:
+                # found our match!
+                favourites.append(cmd)
+
+                # mark as a favourite item
+                cmd.favourite = True
+        return favourites
+
+    def _update_command_index(self):
+        """
+        Update the command index with the current commands.
+        """
+        # the registry isn't built when the menu is loaded from the cache.
+        registry = self._command_registry or CommandRegistry(self._engine)
+        self._get_favourite_commands(registry)
+
+        entries = [
+            CommandEntry("Jump to Flow Production Tracking", cmd_type="context_menu"),
+            CommandEntry("Jump to File System", cmd_type="context_menu"),
+        ]
+        for cmd in registry.commands:
+            entries.append(
+                CommandEntry(
+                    cmd.name, cmd.get_app_name(), cmd.get_type(), cmd.favourite
+                )
+            )
+
+        added, changed, removed = self._command_index.update(entries)
+        self._command_index_stale = False
+        logger.debug(
+            "Command index updated: %d added, %d changed, %d removed.",
+            added,
+            changed,
+            removed,
+        )
 
     ##########################################################################################
     # context menu and UI
 
-    def _add_context_menu(self, menu):
+    def _add_context_menu(self, layout):
         """
         Adds a context menu which displays the current context
         """
@@ -154,22 +423,25 @@ class MenuGenerator(object):
         ctx = self._engine.context
         ctx_name = str(ctx)
 
-        # create the menu object
-        ctx_menu = FBGenericMenu()
+        # create the menu node
+        ctx_menu = MenuNode(MenuNode.SUBMENU, ctx_name)
 
-        ctx_menu.InsertLast(
-            "Jump to Flow Production Tracking", self.__next_menu_index()
+        ctx_menu.children.append(
+            MenuNode(MenuNode.COMMAND, "Jump to Flow Production Tracking")
         )
-        self._add_event_callback("Jump to Flow Production Tracking", self._jump_to_sg)
-
-        ctx_menu.InsertLast("Jump to File System", self.__next_menu_index())
-        self._add_event_callback("Jump to File System", self._jump_to_fs)
+        ctx_menu.children.append(MenuNode(MenuNode.COMMAND, "Jump to File System"))
+        self._add_context_callbacks()
 
-        ctx_menu.OnMenuActivate.Add(self.__menu_event)
-
-        menu.InsertFirst(ctx_name, self.__next_menu_index(), ctx_menu)
+        layout.append(ctx_menu)
         return ctx_menu
 
+    def _add_context_callbacks(self):
+        """
+        Register the callbacks of the context menu items.
+        """
+        self._add_event_callback("Jump to Flow Production Tracking", self._jump_to_sg)
+        self._add_event_callback("Jump to File System", self._jump_to_fs)
+
     def _add_event_callback(self, event_name, callback):
         """
         Creates a mapping between the menu item name and the callback that should be
@@ -181,35 +453,26 @@ class MenuGenerator(object):
         """
         Jump to shotgun, launch web browser
         """
-        url = self._engine.context.shotgun_url
+        url = self._engine.context_prefetcher.get(self._engine.context, "shotgun_url")
         webbrowser.open(url)
 
     def _jump_to_fs(self):
         """
         Jump from context to FS
         """
-        # launch one window for each location on disk
-        paths = self._engine.context.filesystem_locations
-        for disk_location in paths:
-
-            # run the app
-            if sgtk.util.is_linux():
-                cmd = 'xdg-open "%s"' % disk_location
-            elif sgtk.util.is_windows():
-                cmd = 'cmd.exe /C start "Folder" "%s"' % disk_location
-            elif sgtk.util.is_macos():
-                cmd = 'open "%s"' % disk_location
-            else:
-                raise Exception("Platform '%s' is not supported." % sys.platform)
-
-            exit_code = os.system(cmd)
-            if exit_code != 0:
-                logger.error("Failed to launch '%s'!" % cmd)
+        # launch one window for each location on disk, from worker threads:
+        # resolving the locations and starting file browsers can take a
+        # while on network file systems.
+        context = self._engine.context
+        prefetcher = self._engine.context_prefetcher
+        self._engine.process_launcher.open_locations(
+            lambda: prefetcher.get(context, "filesystem_locations")
+        )
 
     ##########################################################################################
     # app menus
 
-    def _add_app_menu(self, menu, commands_by_app):
+    def _add_app_menu(self, layout, commands_by_app):
         """
         Add all apps to the main menu, process them one by one.
         """
@@ -218,12 +481,11 @@ class MenuGenerator(object):
             if self.__all_menus_nested or len(commands_by_app[app_name]) > 1:
                 # more than one menu entry for this app
                 # make a sub menu and put all items in the sub menu
-                app_menu = FBGenericMenu()
+                app_menu = MenuNode(MenuNode.SUBMENU, app_name)
                 for j, cmd in enumerate(commands_by_app[app_name]):
-                    cmd.add_command_to_menu(app_menu, self.__next_menu_index())
+                    app_menu.children.append(MenuNode(MenuNode.COMMAND, cmd.name))
                     self._add_event_callback(cmd.name, cmd.callback)
-                app_menu.OnMenuActivate.Add(self.__menu_event)
-                menu.InsertLast(app_name, self.__next_menu_index(), app_menu)
+                layout.append(app_menu)
             else:
                 # this app only has a single entry.
                 # display that on the menu
@@ -231,9 +493,122 @@ class MenuGenerator(object):
                 # or the name of the menu item? Not sure.
                 cmd_obj = commands_by_app[app_name][0]
                 if not cmd_obj.favourite:
-                    cmd_obj.add_command_to_menu(menu, self.__next_menu_index())
+                    layout.append(MenuNode(MenuNode.COMMAND, cmd_obj.name))
                     self._add_event_callback(cmd_obj.name, cmd_obj.callback)
 
+    ##########################################################################################
+    # menu update
+
+    def _get_sg_menu(self):
+        """
+        Return the Shotgun menu, creating it if needed.
+        """
+        menu_mgr = FBMenuManager()
+        sg_menu = menu_mgr.GetMenu(self._menu_name)
+        if not sg_menu:
+            menu_mgr.InsertBefore(None, "&Help", self._menu_name)
+            sg_menu = menu_mgr.GetMenu(self._menu_name)
+        return sg_menu
+
+    def _sync_menu(self, fb_menu, nodes, new_nodes):
+        """
+        Update a Motionbuilder menu so it matches the given layout.
+
+        :param fb_menu: The FBGenericMenu to update.
+        :param nodes: List of :class:`MenuNode` currently in the menu.
+        :param new_nodes: List of :class:`MenuNode` the menu should contain.
+        :returns: ``new_nodes``, bound to the Motionbuilder menu items.
+        """
+        matcher = difflib.SequenceMatcher(
+            None,
+            [node.key for node in nodes],
+            [node.key for node in new_nodes],
+            autojunk=False,
+        )
+        # new items are inserted after the last item processed
+        prev_item = None
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            old_block = nodes[i1:i2]
+            new_block = new_nodes[j1:j2]
+            for k in range(max(len(old_block), len(new_block))):
+                old = old_block[k] if k < len(old_block) else None
+                new = new_block[k] if k < len(new_block) else None
+                if old and new and old.kind == new.kind:
+                    # same item, possibly with a different label
+                    self._update_node(fb_menu, old, new, prev_item)
+                else:
+                    if old:
+                        self._delete_node(fb_menu, old)
+                    if new:
+                        self._insert_node(fb_menu, new, prev_item)
+                if new:
+                    prev_item = new.item
+
+        return new_nodes
+
+    def _update_node(self, fb_menu, old, new, prev_item):
+        """
+        Bind a new node to the menu item of an old one, updating its label and
+        sub menu if they changed.
+
+        :param fb_menu: The FBGenericMenu holding the item.
+        :param old: The :class:`MenuNode` currently in the menu.
+        :param new: The :class:`MenuNode` replacing it.
+        :param prev_item: The FBGenericMenuItem preceding the item.
+        """
+        new.item = old.item
+        new.menu = old.menu
+
+        if new.kind == MenuNode.SUBMENU:
+            new.children = self._sync_menu(new.menu, old.children, new.children)
+
+        if old.label != new.label:
+            try:
+                new.item.Caption = new.label
+            except Exception:
+                # the item can't be renamed, replace it.
+                fb_menu.DeleteItem(old.item)
+                self._insert_node(fb_menu, new, prev_item)
+
+    def _delete_node(self, fb_menu, node):
+        """
+        Remove the given node from a Motionbuilder menu, along with the
+        handlers added to its sub menus.
+
+        :param fb_menu: The FBGenericMenu holding the item.
+        :param node: The :class:`MenuNode` to remove.
+        """
+        if node.menu is not None:
+            for child in node.children:
+                if child.menu is not None:
+                    self._delete_node(node.menu, child)
+            self._event_handlers.remove(node.menu)
+        fb_menu.DeleteItem(node.item)
+
+    def _insert_node(self, fb_menu, node, prev_item):
+        """
+        Add the given node to a Motionbuilder menu.
+
+        :param fb_menu: The FBGenericMenu to add the item to.
+        :param node: The :class:`MenuNode` to add.
+        :param prev_item: The FBGenericMenuItem to insert the item after, or
+            None to insert it first.
+        """
+        args = [node.label, self.__next_menu_index()]
+        if node.kind == MenuNode.SUBMENU:
+            if node.menu is None:
+                node.menu = FBGenericMenu()
+                self._event_handlers.add(node.menu, "OnMenuActivate", self.__menu_event)
+                node.children = self._sync_menu(node.menu, [], node.children)
+            args.append(node.menu)
+
+        if prev_item is None:
+            node.item = fb_menu.InsertFirst(*args)
+        else:
+            node.item = fb_menu.InsertAfter(prev_item, *args)
+        if node.item is None:
+            node.item = fb_menu.GetItem(args[1])
+
     ##########################################################################################
     # private methods
 
@@ -251,15 +626,76 @@ class MenuGenerator(object):
         """
         Handles menu events.
         """
-        callback = self._callbacks.get(event.Name)
-        if callback:
-            # execute callback through a Qt singleShot timer event
-            # to disconnect the command from the menu.  Otherwise
-            # any apps that restart the engine (causing the menu to
-            # be rebuilt) can cause Motionbuilder to crash!
-            from sgtk.platform.qt import QtCore
+        self.run_command(event.Name)
 
-            QtCore.QTimer.singleShot(100, callback)
+
+class CommandRegistry(object):
+    """
+    Index of the engine commands, built once per menu generation.
+
+    Commands are wrapped in :class:`AppCommand` objects and indexed by app
+    instance name and command name, by app display name and by type, so
+    looking them up doesn't require scanning all the commands and apps.
+    """
+
+    def __init__(self, engine):
+        """
+        :param engine: The engine whose commands are indexed.
+        """
+        # resolve all the app instance names at once, rather than scanning
+        # the apps for each command.
+        app_instance_names = dict((app, name) for name, app in engine.apps.items())
+
+        self._commands = []
+        self._by_instance_and_name = {}
+        self._by_app_name = {}
+        self._by_type = {}
+
+        for cmd_name, cmd_details in engine.commands.items():
+            cmd = AppCommand(cmd_name, cmd_details)
+            app = cmd.properties.get("app")
+            if app is not None:
+                cmd.app_instance_name = app_instance_names.get(app)
+
+            self._commands.append(cmd)
+            self._by_instance_and_name[(cmd.app_instance_name, cmd.name)] = cmd
+            self._by_app_name.setdefault(cmd.get_app_name(), []).append(cmd)
+            self._by_type.setdefault(cmd.get_type(), []).append(cmd)
+
+    @property
+    def commands(self):
+        """
+        List of all the :class:`AppCommand`, in registration order.
+        """
+        return self._commands
+
+    @property
+    def app_names(self):
+        """
+        List of the app display names having commands, None standing for the
+        commands which don't belong to an app.
+        """
+        return list(self._by_app_name.keys())
+
+    def get(self, app_instance_name, name):
+        """
+        Returns the command with the given name registered by an app instance,
+        or None if not found.
+        """
+        return self._by_instance_and_name.get((app_instance_name, name))
+
+    def get_by_app_name(self, app_name):
+        """
+        Returns the list of commands registered by apps with the given display
+        name, None returning the commands which don't belong to an app.
+        """
+        return self._by_app_name.get(app_name, [])
+
+    def get_by_type(self, cmd_type):
+        """
+        Returns the list of commands of the given type.
+        """
+        return self._by_type.get(cmd_type, [])
 
 
 class AppCommand(object):
@@ -273,6 +709,8 @@ class AppCommand(object):
         self.callback = command_dict["callback"]
         self.favourite = False
         self.name = name
+        # set by the CommandRegistry, resolved on demand otherwise.
+        self.app_instance_name = None
 
     def get_app_name(self):
         """
@@ -290,6 +728,9 @@ class AppCommand(object):
         if "app" not in self.properties:
             return None
 
+        if self.app_instance_name is not None:
+            return self.app_instance_name
+
         app_instance = self.properties["app"]
         engine = app_instance.engine
 
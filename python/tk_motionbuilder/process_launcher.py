@@ -0,0 +1,160 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Background launching of external processes.
+
+"""
+
+import concurrent.futures
+import os
+import subprocess
+import sys
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class ProcessLauncher(object):
+    """
+    Launches external processes, like file browsers, from worker threads so
+    Motionbuilder's UI doesn't wait for them to start.
+
+    At most ``max_workers`` processes are being launched at once, the other
+    ones wait for a worker to be available. Failures are reported through the
+    logger, from the worker threads, rather than raised to the caller.
+    """
+
+    def __init__(self, max_workers=4, timeout=10):
+        """
+        :param int max_workers: Maximum number of processes launched at once.
+        :param float timeout: Time in seconds to wait for a launched process
+            to return before giving up on its exit code.
+        """
+        self._timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="tk-motionbuilder-launcher",
+        )
+
+    def open_locations(self, get_paths):
+        """
+        Open the given folders in the file browser of the OS.
+
+        :param get_paths: Callable returning the list of paths to open. It is
+            called from a worker thread, so slow paths resolution doesn't
+            block the UI either.
+        :returns: A :class:`concurrent.futures.Future` for the paths
+            resolution.
+        """
+        return self._executor.submit(self._open_locations, get_paths)
+
+    def open_location(self, path):
+        """
+        Open the given folder in the file browser of the OS.
+
+        :param str path: Path to the folder to open.
+        :returns: A :class:`concurrent.futures.Future` for the launch,
+            resolving to True if it succeeded.
+        """
+        return self._executor.submit(self._open_location, path)
+
+    def shutdown(self):
+        """
+        Discard the launches which haven't started yet, and stop the workers
+        once the running ones are done.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _open_locations(self, get_paths):
+        """
+        Resolve the paths to open and queue their launch.
+
+        :param get_paths: Callable returning the list of paths to open.
+        """
+        try:
+            paths = get_paths()
+        except Exception:
+            logger.exception("Failed to resolve the locations to open.")
+            return
+
+        if not paths:
+            logger.info("No locations on disk to open.")
+        for path in paths:
+            try:
+                self.open_location(path)
+            except RuntimeError:
+                # the launcher was shut down meanwhile.
+                return
+
+    def _open_location(self, path):
+        """
+        Open a folder in the file browser of the OS.
+
+        :param str path: Path to the folder to open.
+        :returns: True if it was opened successfully.
+        """
+        if sgtk.util.is_linux():
+            return self._launch(["xdg-open", path])
+        elif sgtk.util.is_macos():
+            return self._launch(["open", path])
+        elif sgtk.util.is_windows():
+            return self._start_file(path)
+
+        logger.error("Platform '%s' is not supported." % sys.platform)
+        return False
+
+    def _launch(self, args):
+        """
+        Run a process and report its failure.
+
+        :param args: The command line to run, as a list of arguments.
+        :returns: True if the process started and returned successfully.
+        """
+        try:
+            process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            _, stderr = process.communicate(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            # the process is still running, it didn't fail to start at least.
+            logger.debug("'%s' is still running, not waiting for it.", args[0])
+            return True
+        except OSError as e:
+            logger.error("Failed to launch '%s': %s", subprocess.list2cmdline(args), e)
+            return False
+
+        if process.returncode != 0:
+            logger.error(
+                "Failed to launch '%s'! (exit code %d) %s",
+                subprocess.list2cmdline(args),
+                process.returncode,
+                stderr.decode("utf-8", "replace").strip(),
+            )
+            return False
+        return True
+
+    def _start_file(self, path):
+        """
+        Open a path with its associated application on Windows.
+
+        :param str path: Path to open.
+        :returns: True if it was opened successfully.
+        """
+        try:
+            os.startfile(path)
+        except OSError as e:
+            logger.error("Failed to open '%s': %s", path, e)
+            return False
+        return True
@@ -0,0 +1,154 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Content hashes of the published session files, to detect republishes of
+identical files.
+
+"""
+
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+import sgtk
+
+from .file_copy import hash_file
+from .version_index import get_unversioned_path
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class PublishHashIndex(object):
+    """
+    Local json file recording the content hash of the last file published
+    for each publish path, regardless of its version number.
+
+    Files are hashed from a background thread, so the hash of a file can be
+    computed while the publish goes on, and only waited for when it is
+    needed.
+    """
+
+    def __init__(self, path, max_entries=500):
+        """
+        :param str path: Path to the index file.
+        :param int max_entries: Maximum number of publish paths recorded, the
+            least recently published ones are dropped first.
+        """
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tk-motionbuilder-hash"
+        )
+        try:
+            with open(path, "r") as fh:
+                self._entries = json.load(fh).get("publishes", {})
+        except (IOError, OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    @property
+    def path(self):
+        """
+        Path to the index file.
+        """
+        return self._path
+
+    @staticmethod
+    def get_key(path):
+        """
+        Return the key a file is recorded under, its path without its version
+        number, so all the versions of a file share the same entry.
+
+        :param str path: Path to a published file.
+        :returns: The key of the file.
+        """
+        return get_unversioned_path(path)
+
+    def get(self, path):
+        """
+        :param str path: Path to a published file, any version of it.
+        :returns: A dictionary with the ``hash``, ``size``, ``path`` and
+            ``sg_publish_data`` of the file last published to this path, or
+            None.
+        """
+        with self._lock:
+            entry = self._entries.get(self.get_key(path))
+            return dict(entry) if entry else None
+
+    def set(self, path, digest, size, sg_publish_data=None):
+        """
+        Record a published file.
+
+        :param str path: Path the file was published to.
+        :param str digest: Content hash of the file, see :func:`hash_file`.
+        :param int size: Size of the file in bytes.
+        :param dict sg_publish_data: The ``type`` and ``id`` of the
+            PublishedFile entity registered for the file.
+        """
+        with self._lock:
+            self._entries[self.get_key(path)] = {
+                "hash": digest,
+                "size": size,
+                "path": path,
+                "sg_publish_data": sg_publish_data,
+                "time": time.time(),
+            }
+            if len(self._entries) > self._max_entries:
+                oldest = sorted(
+                    self._entries, key=lambda key: self._entries[key]["time"]
+                )
+                for key in oldest[: len(self._entries) - self._max_entries]:
+                    del self._entries[key]
+
+    def save(self):
+        """
+        Write the index.
+        """
+        with self._lock:
+            data = {"publishes": dict(self._entries)}
+        sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(self._path))
+        tmp_path = "%s.%d.tmp" % (self._path, os.getpid())
+        with open(tmp_path, "w") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._path)
+
+    def hash_file_async(self, path, digest=None):
+        """
+        Hash the content of a file in the background.
+
+        :param str path: Path to the file.
+        :param str digest: The hash of the file if it is already known,
+            computed when it was transferred for example.
+        :returns: A :class:`concurrent.futures.Future` whose result is the
+            hexadecimal digest of the file.
+        """
+        if digest is not None:
+            future = concurrent.futures.Future()
+            future.set_result(digest)
+            return future
+        return self._executor.submit(self._hash_file, path)
+
+    def shutdown(self):
+        """
+        Stop the background thread, once the pending hashes are computed.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _hash_file(self, path):
+        """
+        :returns: The hexadecimal digest of a file.
+        """
+        start = time.perf_counter()
+        digest = hash_file(path)
+        logger.debug("Hashed %s in %.2fs.", path, time.perf_counter() - start)
+        return digest
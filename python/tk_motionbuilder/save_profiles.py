@@ -0,0 +1,134 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Named sets of FBX options the session is saved with.
+
+"""
+
+import os
+import time
+
+import sgtk
+from pyfbsdk import FBApplication, FBElementAction, FBFbxOptions
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Profiles available when none are configured. "fast work save" is meant for
+# the intermediate work files, "full publish" for the published files. They
+# are only used when a hook setting names them.
+DEFAULT_SAVE_PROFILES = {
+    "fast work save": {
+        "UseASCIIFormat": False,
+        "EmbedMedia": False,
+    },
+    "full publish": {
+        "UseASCIIFormat": False,
+        "EmbedMedia": True,
+    },
+}
+
+
+class SaveProfile(object):
+    """
+    A named set of ``FBFbxOptions`` values the session is saved with.
+
+    The options are given as a dictionary of ``FBFbxOptions`` attribute
+    names to values, for example ``{"EmbedMedia": False}``. Values naming an
+    ``FBElementAction``, like ``"kFBElementActionDiscard"``, are converted
+    to it, so elements can be left out of the saved file::
+
+        {"EmbedMedia": False, "Audio": "kFBElementActionDiscard"}
+    """
+
+    def __init__(self, name, options):
+        """
+        :param str name: Name of the profile, for the logs.
+        :param dict options: ``FBFbxOptions`` attribute names and values.
+        """
+        self.name = name
+        self.options = dict(options)
+
+    def create_fbx_options(self):
+        """
+        :returns: A ``FBFbxOptions`` for saving with this profile.
+        """
+        fbx_options = FBFbxOptions(False)
+        # never prompt the user while publishing.
+        fbx_options.ShowFileDialog = False
+        fbx_options.ShowOptionsDialog = False
+        for attribute, value in self.options.items():
+            if isinstance(value, str) and hasattr(FBElementAction, value):
+                value = getattr(FBElementAction, value)
+            try:
+                setattr(fbx_options, attribute, value)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.warning(
+                    "Ignoring the %s option of the '%s' save profile: %s",
+                    attribute,
+                    self.name,
+                    e,
+                )
+        return fbx_options
+
+    def save(self, path):
+        """
+        Save the session to the given path with this profile, logging the
+        time the save took and the size of the file.
+
+        :param str path: Path to save the session to.
+        """
+        fbx_options = self.create_fbx_options()
+        start = time.perf_counter()
+        FBApplication().FileSave(path, fbx_options)
+        duration = time.perf_counter() - start
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        logger.info(
+            "Saved with the '%s' profile in %.2fs, %.1f MB: %s",
+            self.name,
+            duration,
+            size / (1024.0 * 1024.0),
+            path,
+        )
+
+
+def get_save_profile(profiles, name):
+    """
+    Return the save profile with the given name.
+
+    :param dict profiles: Profile options by profile name, see
+        :class:`SaveProfile`.
+    :param str name: Name of the profile to return.
+    :returns: A :class:`SaveProfile`, or None if no name is given or no
+        profile has this name, in which case the session is saved with the
+        default Motionbuilder options.
+    """
+    if not name:
+        return None
+    if name not in profiles:
+        logger.warning(
+            "Unknown save profile '%s', saving with the default options.", name
+        )
+        return None
+    return SaveProfile(name, profiles[name])
+
+
+def have_same_options(profile, other):
+    """
+    Check whether two save profiles save the session with the same options.
+
+    :param profile: A :class:`SaveProfile`, or None for the default options.
+    :param other: A :class:`SaveProfile`, or None for the default options.
+    :returns: True if both profiles set the same options.
+    """
+    return (profile.options if profile else {}) == (other.options if other else {})
@@ -0,0 +1,195 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tracking of the session saves done during a publish.
+
+"""
+
+import os
+
+import sgtk
+
+from .event_handlers import EventHandlerRegistry
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class SessionSaveTracker(object):
+    """
+    Records where the session was last saved during a publish, so the
+    plugins don't serialize the whole scene again when it hasn't changed
+    since.
+
+    The scene is considered modified, dirty, as soon as the scene ``OnChange``
+    event fires after the save, or if the saved file was modified on disk.
+    Saves staged locally are tracked along with their transfer to the final
+    path, see :class:`FileTransferQueue`.
+    """
+
+    def __init__(self, scene=None):
+        """
+        :param scene: Optional ``FBScene`` whose changes mark the save as
+            dirty.
+        """
+        self._path = None
+        self._stat = None
+        self._dirty = True
+        self._duration = None
+        self._transfer = None
+        self._profile = None
+        self._event_handlers = EventHandlerRegistry()
+        if scene is not None:
+            self._event_handlers.add(scene, "OnChange", self._on_scene_change)
+
+    @property
+    def path(self):
+        """
+        Path the session was last saved to, or None.
+        """
+        return self._path
+
+    @property
+    def profile(self):
+        """
+        Name of the :class:`SaveProfile` the session was last saved with, or
+        None if it was saved with the default options.
+        """
+        return self._profile
+
+    @property
+    def save_duration(self):
+        """
+        Time in seconds the last save took, or None.
+        """
+        return self._duration
+
+    @property
+    def dirty(self):
+        """
+        True if the scene was modified since it was last saved, or was never
+        saved.
+        """
+        if self._dirty or self._path is None:
+            return True
+        if self._transfer is not None:
+            if not self._transfer.done():
+                # the file is still being written to its final path.
+                return False
+            if self._transfer.exception() is not None:
+                return True
+            self._stat = _stat(self._path)
+            self._transfer = None
+        return _stat(self._path) != self._stat
+
+    def record_save(self, path, duration=None, transfer=None, profile=None):
+        """
+        Record the session was saved.
+
+        :param str path: Path the session was saved to.
+        :param float duration: Optional time in seconds the save took.
+        :param transfer: Optional :class:`concurrent.futures.Future` of the
+            transfer of the file to the path, if it was saved to a staging
+            folder.
+        :param str profile: Optional name of the :class:`SaveProfile` the
+            session was saved with.
+        """
+        self._path = path
+        self._profile = profile
+        self._transfer = transfer
+        self._stat = None if transfer is not None else _stat(path)
+        self._dirty = False
+        if duration is not None:
+            self._duration = duration
+
+    def wait_for_transfer(self):
+        """
+        Wait for the file saved last to be transferred to its path, if it was
+        saved to a staging folder.
+
+        :raises sgtk.TankError: If the transfer failed.
+        """
+        if self._transfer is not None:
+            self._transfer.result()
+
+    def get_saved_path(self, profile=None):
+        """
+        :param str profile: Optional name of the :class:`SaveProfile` the
+            session must have been saved with.
+        :returns: The path the session was saved to, if it wasn't modified
+            since, None otherwise.
+        """
+        if self.dirty or (profile is not None and profile != self._profile):
+            return None
+        return self._path
+
+    def is_saved(self, path, profile=None):
+        """
+        :param str path: Path to the session file.
+        :param str profile: Optional name of the :class:`SaveProfile` the
+            session must have been saved with.
+        :returns: True if the session was saved to the given path and wasn't
+            modified since.
+        """
+        saved_path = self.get_saved_path(profile)
+        return saved_path is not None and os.path.normcase(
+            saved_path
+        ) == os.path.normcase(path)
+
+    def close(self):
+        """
+        Stop tracking the changes of the scene.
+        """
+        self._event_handlers.remove_all()
+
+    def _on_scene_change(self, control, event):
+        """
+        Mark the save as dirty when the scene changes.
+        """
+        self._dirty = True
+
+
+def _stat(path):
+    """
+    :returns: The modification time and the size of a file, or None if it
+        doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_save_tracker(cache, scene=None):
+    """
+    Return the save tracker of a publish, creating it if needed.
+
+    :param dict cache: Dictionary holding the tracker, the properties of a
+        publish item for example, so it is shared by the plugins.
+    :param scene: Optional ``FBScene`` whose changes mark the save as dirty,
+        used when the tracker is created.
+    :returns: A :class:`SessionSaveTracker`.
+    """
+    tracker = cache.get("session_save_tracker")
+    if tracker is None:
+        tracker = cache["session_save_tracker"] = SessionSaveTracker(scene)
+    return tracker
+
+
+def release_save_tracker(cache):
+    """
+    Stop tracking the saves of a publish, once it is over.
+
+    :param dict cache: Dictionary holding the tracker.
+    """
+    tracker = cache.pop("session_save_tracker", None)
+    if tracker is not None:
+        tracker.close()
@@ -0,0 +1,192 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Inventory of the publishable elements of the Motionbuilder scene.
+
+"""
+
+import time
+
+import sgtk
+from pyfbsdk import FBStory, FBSystem
+
+from .event_handlers import EventHandlerRegistry
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Kinds of scene elements.
+TAKE = "take"
+CHARACTER = "character"
+CAMERA = "camera"
+STORY_CLIP = "story_clip"
+
+
+class SceneElement(object):
+    """
+    A publishable element of the scene, like a take or a character.
+
+    Only its kind and name are known when the scene is traversed, its
+    details, which take longer to gather, are only computed when first
+    needed.
+    """
+
+    def __init__(self, kind, name, component, parent_name=None):
+        """
+        :param str kind: Kind of the element, :data:`TAKE`, :data:`CHARACTER`,
+            :data:`CAMERA` or :data:`STORY_CLIP`.
+        :param str name: Name of the element.
+        :param component: The Motionbuilder object of the element.
+        :param str parent_name: Optional name of the element containing it,
+            the story track of a clip for example.
+        """
+        self.kind = kind
+        self.name = name
+        self.component = component
+        self.parent_name = parent_name
+        self._details = None
+
+    def __repr__(self):
+        return "<SceneElement %s %s>" % (self.kind, self.name)
+
+    @property
+    def details(self):
+        """
+        Dictionary of the details of the element, like its frame range,
+        computed on first access.
+        """
+        if self._details is None:
+            try:
+                self._details = _DETAIL_GETTERS[self.kind](self)
+            except Exception as e:
+                # the object was deleted from the scene, for example.
+                logger.debug("Could not get the details of %r: %s", self, e)
+                self._details = {}
+        return self._details
+
+
+class SceneInventory(object):
+    """
+    Lists the takes, characters, cameras and story clips of the scene in a
+    single traversal, kept until the scene changes.
+    """
+
+    def __init__(self, scene=None):
+        """
+        :param scene: The ``FBScene`` to list, the current one if None.
+        """
+        self._scene = scene if scene is not None else FBSystem().Scene
+        self._elements = None
+        self._event_handlers = EventHandlerRegistry()
+        self._event_handlers.add(self._scene, "OnChange", self._on_scene_change)
+
+    def get_elements(self, kind=None):
+        """
+        Return the elements of the scene, traversing it if it changed since
+        it was last traversed.
+
+        :param str kind: Optional kind of the elements to return, all of them
+            if None.
+        :returns: A list of :class:`SceneElement`.
+        """
+        if self._elements is None:
+            self._elements = self._traverse()
+        if kind is None:
+            return list(self._elements)
+        return [element for element in self._elements if element.kind == kind]
+
+    def invalidate(self):
+        """
+        Discard the elements listed, the scene is traversed again when they
+        are next needed.
+        """
+        self._elements = None
+
+    def close(self):
+        """
+        Stop tracking the changes of the scene.
+        """
+        self._event_handlers.remove_all()
+        self._elements = None
+
+    def _on_scene_change(self, control, event):
+        """
+        Discard the elements listed when the scene changes.
+        """
+        self._elements = None
+
+    def _traverse(self):
+        """
+        :returns: A list of the :class:`SceneElement` of the scene.
+        """
+        start = time.perf_counter()
+        elements = []
+        for take in self._scene.Takes:
+            elements.append(SceneElement(TAKE, take.Name, take))
+        for character in self._scene.Characters:
+            elements.append(SceneElement(CHARACTER, character.LongName, character))
+        for camera in self._scene.Cameras:
+            # skip the producer cameras Motionbuilder creates.
+            if not camera.SystemCamera:
+                elements.append(SceneElement(CAMERA, camera.LongName, camera))
+
+        folders = [FBStory().RootFolder]
+        while folders:
+            folder = folders.pop()
+            for track in folder.Tracks:
+                for clip in track.Clips:
+                    elements.append(
+                        SceneElement(STORY_CLIP, clip.Name, clip, track.Name)
+                    )
+            folders.extend(folder.Childs)
+
+        logger.debug(
+            "Listed %d scene elements in %.3fs.",
+            len(elements),
+            time.perf_counter() - start,
+        )
+        return elements
+
+
+def _get_take_details(element):
+    span = element.component.LocalTimeSpan
+    return {
+        "first_frame": span.GetStart().GetFrame(),
+        "last_frame": span.GetStop().GetFrame(),
+    }
+
+
+def _get_character_details(element):
+    return {"characterized": bool(element.component.GetCharacterize())}
+
+
+def _get_camera_details(element):
+    return {
+        "resolution": (
+            element.component.ResolutionWidth,
+            element.component.ResolutionHeight,
+        )
+    }
+
+
+def _get_story_clip_details(element):
+    return {
+        "track": element.parent_name,
+        "first_frame": element.component.Start.GetFrame(),
+        "last_frame": element.component.Stop.GetFrame(),
+    }
+
+
+_DETAIL_GETTERS = {
+    TAKE: _get_take_details,
+    CHARACTER: _get_character_details,
+    CAMERA: _get_camera_details,
+    STORY_CLIP: _get_story_clip_details,
+}
@@ -0,0 +1,150 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Session saves and publish item state shared by the publish plugins.
+
+"""
+
+import os
+
+import sgtk
+from sgtk.util.filesystem import ensure_folder_exists
+from pyfbsdk import FBApplication, FBSystem
+
+from .save_profiles import get_save_profile
+from .save_tracker import get_save_tracker, release_save_tracker
+from .take_export import release_take_export_pool
+from .version_index import get_version_index
+
+
+def save_session(path, save_profile=None):
+    """
+    Save the current session to the supplied path.
+
+    If the engine stages saves, the session is saved to the local staging
+    folder and moved to the path in the background.
+
+    :param str path: Path to save the session to.
+    :param save_profile: Optional :class:`SaveProfile` to save with.
+
+    :returns: The :class:`concurrent.futures.Future` of the transfer to the
+        path if the save was staged, None otherwise.
+    """
+    transfer_queue = sgtk.platform.current_engine().file_transfer_queue
+    if transfer_queue is None:
+        # Motionbuilder won't ensure that the folder is created when saving,
+        # so we must make sure it exists
+        ensure_folder_exists(os.path.dirname(path))
+        _file_save(path, save_profile)
+        return None
+
+    local_path = transfer_queue.get_staging_path(path)
+    ensure_folder_exists(os.path.dirname(local_path))
+    _file_save(local_path, save_profile)
+    transfer = transfer_queue.submit(local_path, path)
+
+    # carry on working on the file at its final path.
+    set_session_path(path)
+    return transfer
+
+
+def set_session_path(path):
+    """
+    Point the current session to the supplied path, without saving it.
+
+    :param str path: Normalized path of the session.
+    :returns: True if the session path was set.
+    """
+    mb_app = FBApplication()
+    try:
+        mb_app.FBXFileName = path
+    except Exception:
+        return False
+    return sgtk.util.ShotgunPath.normalize(str(mb_app.FBXFileName)) == path
+
+
+def get_configured_save_profile(settings, profile_setting):
+    """
+    Return the :class:`SaveProfile` named by a setting of a publish plugin.
+
+    :param settings: Dictionary of the plugin Settings, with a
+        ``Save Profiles`` setting.
+    :param str profile_setting: Name of the setting naming the profile.
+    :returns: A :class:`SaveProfile`, or None to save with the default
+        options.
+    """
+    return get_save_profile(
+        settings.get("Save Profiles").value, settings.get(profile_setting).value
+    )
+
+
+def get_item_save_tracker(item):
+    """
+    Return the tracker of the session saves of the current publish, shared
+    by the plugins acting on the given item.
+
+    :param item: The publish item of the session.
+    :returns: A :class:`SessionSaveTracker`.
+    """
+    return get_save_tracker(item.properties, FBSystem().Scene)
+
+
+def release_item_save_tracker(item):
+    """
+    Stop tracking the session saves of the current publish.
+
+    :param item: The publish item of the session.
+    """
+    release_save_tracker(item.properties)
+
+
+def release_item_take_export_pool(item):
+    """
+    Shut down the pool exporting the takes of the session, discarding the
+    takes queued for export.
+
+    :param item: The publish item of the session.
+    """
+    release_take_export_pool(item.properties)
+
+
+def release_item_publish_state(item):
+    """
+    Stop tracking the session saves and exporting the takes of the current
+    publish, when it failed and won't be finalized.
+
+    :param item: The publish item of the session.
+    """
+    release_take_export_pool(item.properties)
+    release_save_tracker(item.properties)
+
+
+def get_item_version_index(item, path):
+    """
+    Return the index of the versions in the folder of the given path, shared
+    by the plugins acting on the given item.
+
+    :param item: The publish item of the session.
+    :param str path: Path of a file in the indexed folder.
+    :returns: A :class:`VersionIndex`.
+    """
+    return get_version_index(item.properties, os.path.dirname(path))
+
+
+def _file_save(path, save_profile=None):
+    """
+    Write the current session to the supplied path, with the options of the
+    given :class:`SaveProfile`, or the default ones.
+    """
+    if save_profile is None:
+        FBApplication().FileSave(path)
+    else:
+        save_profile.save(path)
@@ -0,0 +1,376 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Export of takes to their own files from a pool of worker processes.
+
+"""
+
+import concurrent.futures
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Environment variable giving the worker processes the path to their job.
+JOB_ENVIRONMENT_VARIABLE = "TK_MOTIONBUILDER_TAKE_EXPORT_JOB"
+
+# Script exporting a take, run by the worker processes.
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "take_export_worker.py")
+
+
+def get_default_worker_command():
+    """
+    :returns: The command starting a Motionbuilder batch process running the
+        take export script, Motionbuilder being the running executable.
+    """
+    return [sys.executable, "-batch", "-suspendMessages", "{script}"]
+
+
+class TakeExportPool(object):
+    """
+    Exports takes of a scene file to their own files, each in a separate
+    worker process, a Motionbuilder batch process by default, running
+    several at once.
+
+    The takes to export are added first, and all exported once the pool is
+    started with the scene file to export them from. Each worker is given
+    the path to a json file describing its job, through the
+    :data:`JOB_ENVIRONMENT_VARIABLE` environment variable, and writes the
+    result of the export to the ``result`` path of the job.
+    """
+
+    def __init__(self, command=None, max_workers=2, timeout=None):
+        """
+        :param list command: Command starting a worker process, ``{script}``
+            is replaced with the path to the take export script. Motionbuilder
+            in batch mode if None.
+        :param int max_workers: Maximum number of worker processes running at
+            once.
+        :param float timeout: Maximum time in seconds a worker process can
+            run, or None for no limit.
+        """
+        self._command = [
+            arg.replace("{script}", WORKER_SCRIPT)
+            for arg in (command or get_default_worker_command())
+        ]
+        self._timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="tk-motionbuilder-take-export",
+        )
+        self._destinations = {}
+        self._futures = {}
+        self._reported = set()
+        self._processes = set()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._started = False
+        self._job_folder = None
+        # dialog shown while waiting for the exports, False if it can't be
+        # shown.
+        self._progress_dialog = None
+
+    @property
+    def started(self):
+        """
+        True once the exports were started.
+        """
+        return self._started
+
+    def add(self, take, destination):
+        """
+        Add a take to export.
+
+        :param str take: Name of the take.
+        :param str destination: Path to export the take to.
+        """
+        self._destinations[take] = destination
+
+    def start(self, source):
+        """
+        Start exporting the takes added.
+
+        :param str source: Path to the scene file to export the takes from.
+        """
+        self._started = True
+        for take, destination in self._destinations.items():
+            self._futures[take] = self._executor.submit(
+                self._export, source, take, destination
+            )
+        logger.debug(
+            "Exporting %d takes from %s with: %s",
+            len(self._futures),
+            source,
+            " ".join(self._command),
+        )
+
+    def get_temporary_path(self, name):
+        """
+        Return a path in the folder of the pool job files, to save a snapshot
+        of the scene to export the takes from for example. The folder is
+        removed when the pool is shut down.
+
+        :param str name: Name of the file.
+        :returns: The path to the file.
+        """
+        return os.path.join(self._get_job_folder(), name)
+
+    def get_future(self, take):
+        """
+        :param str take: Name of the take.
+        :returns: The :class:`concurrent.futures.Future` of the export of the
+            take, whose result is the path it was exported to.
+        """
+        return self._futures[take]
+
+    def get_progress(self):
+        """
+        :returns: A tuple with the number of takes whose export is over, and
+            the number of takes to export.
+        """
+        done = sum(1 for future in self._futures.values() if future.done())
+        return done, len(self._destinations)
+
+    def wait(self, take, on_progress=None, interval=0.1):
+        """
+        Wait for the export of a take to be over, reporting the exports
+        completing in the meantime. Each export is only reported once, across
+        the calls.
+
+        An application modal progress dialog is shown while waiting, so the UI
+        stays responsive without the scene being edited or the publish being
+        started again, and the exports can be cancelled from it.
+
+        :param str take: Name of the take.
+        :param on_progress: Optional callable called with the name of each
+            take whose export completes, the number of exports over and the
+            number of takes to export.
+        :param float interval: Maximum time in seconds between two checks.
+        :returns: The path the take was exported to.
+        :raises concurrent.futures.CancelledError: If the export was
+            cancelled.
+        :raises sgtk.TankError: If the export failed.
+        """
+        future = self._futures[take]
+        while True:
+            if on_progress:
+                for other_take, other_future in self._futures.items():
+                    if other_future.done() and other_take not in self._reported:
+                        self._reported.add(other_take)
+                        on_progress(other_take, *self.get_progress())
+            if future.done():
+                if all(other.done() for other in self._futures.values()):
+                    self._close_progress_dialog()
+                return future.result()
+            self._update_progress_dialog()
+            concurrent.futures.wait(
+                [f for f in self._futures.values() if not f.done()],
+                timeout=interval,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+    def cancel(self):
+        """
+        Cancel the exports not started yet and stop the running ones.
+        """
+        self._cancelled = True
+        self._close_progress_dialog()
+        for future in self._futures.values():
+            future.cancel()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            process.kill()
+        logger.info("Cancelled the take exports.")
+
+    def shutdown(self):
+        """
+        Wait for the running exports and remove the job files.
+        """
+        self._close_progress_dialog()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._job_folder:
+            shutil.rmtree(self._job_folder, ignore_errors=True)
+
+    def _update_progress_dialog(self):
+        """
+        Show the progress of the exports, and process the Qt events. The
+        exports are cancelled if the Cancel button of the dialog was clicked.
+        """
+        if self._progress_dialog is None:
+            self._progress_dialog = _create_progress_dialog(len(self._destinations))
+        if not self._progress_dialog:
+            return
+
+        self._progress_dialog.setValue(self.get_progress()[0])
+        # the dialog is application modal, the events processed can't come
+        # from the input to the other windows.
+        _process_events()
+        if self._progress_dialog.wasCanceled():
+            self.cancel()
+
+    def _close_progress_dialog(self):
+        """
+        Close the progress dialog if it is shown.
+        """
+        if self._progress_dialog:
+            self._progress_dialog.close()
+            self._progress_dialog.deleteLater()
+            self._progress_dialog = None
+
+    def _get_job_folder(self):
+        """
+        :returns: The folder of the job files, created on first use.
+        """
+        with self._lock:
+            if self._job_folder is None:
+                self._job_folder = tempfile.mkdtemp(prefix="tk-motionbuilder-takes-")
+        return self._job_folder
+
+    def _export(self, source, take, destination):
+        """
+        Export a take from a worker process.
+
+        :returns: The destination.
+        """
+        if self._cancelled:
+            raise concurrent.futures.CancelledError()
+
+        start = time.perf_counter()
+        fd, job_path = tempfile.mkstemp(suffix=".json", dir=self._get_job_folder())
+        result_path = job_path + ".result"
+        with os.fdopen(fd, "w") as fh:
+            json.dump(
+                {
+                    "source": source,
+                    "take": take,
+                    "destination": destination,
+                    "result": result_path,
+                },
+                fh,
+            )
+
+        env = dict(os.environ)
+        env[JOB_ENVIRONMENT_VARIABLE] = job_path
+        process = subprocess.Popen(
+            self._command,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        with self._lock:
+            self._processes.add(process)
+        try:
+            output, _ = process.communicate(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            output, _ = process.communicate()
+            raise sgtk.TankError(
+                "Export of take %s timed out after %ss." % (take, self._timeout)
+            )
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        if self._cancelled:
+            raise concurrent.futures.CancelledError()
+
+        try:
+            with open(result_path, "r") as fh:
+                result = json.load(fh)
+        except (IOError, OSError, ValueError):
+            result = {
+                "error": "the worker exited with code %d without a result: %s"
+                % (process.returncode, output.decode("utf-8", "replace")[-2000:])
+            }
+        if result.get("error"):
+            raise sgtk.TankError(
+                "Export of take %s failed: %s" % (take, result["error"])
+            )
+
+        logger.debug(
+            "Exported take %s to %s in %.2fs.",
+            take,
+            destination,
+            time.perf_counter() - start,
+        )
+        return destination
+
+
+def _create_progress_dialog(total):
+    """
+    Show an application modal dialog with the progress of the exports and a
+    Cancel button.
+
+    :param int total: Number of takes to export.
+    :returns: The ``QProgressDialog``, or False if Qt isn't available.
+    """
+    try:
+        from sgtk.platform.qt import QtCore, QtGui
+    except ImportError:
+        return False
+    if QtGui is None:
+        return False
+
+    dialog = QtGui.QProgressDialog("Exporting the takes...", "Cancel", 0, total)
+    dialog.setWindowTitle("Flow Production Tracking")
+    dialog.setWindowModality(QtCore.Qt.ApplicationModal)
+    dialog.setMinimumDuration(0)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.show()
+    return dialog
+
+
+def _process_events():
+    """
+    Process the pending Qt events.
+    """
+    from sgtk.platform.qt import QtCore
+
+    QtCore.QCoreApplication.processEvents()
+
+
+def get_take_export_pool(cache, command=None, max_workers=2):
+    """
+    Return the take export pool of a publish, creating it if needed.
+
+    :param dict cache: Dictionary holding the pool, the properties of the
+        session publish item for example, so it is shared by its take items.
+    :param list command: Command starting a worker process, used when the
+        pool is created, see :class:`TakeExportPool`.
+    :param int max_workers: Maximum number of worker processes, used when the
+        pool is created.
+    :returns: A :class:`TakeExportPool`.
+    """
+    pool = cache.get("take_export_pool")
+    if pool is None:
+        pool = cache["take_export_pool"] = TakeExportPool(command, max_workers)
+    return pool
+
+
+def release_take_export_pool(cache):
+    """
+    Shut down the take export pool of a publish, once it is over.
+
+    :param dict cache: Dictionary holding the pool.
+    """
+    pool = cache.pop("take_export_pool", None)
+    if pool is not None:
+        pool.shutdown()
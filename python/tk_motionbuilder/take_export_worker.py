@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Script run by a Motionbuilder batch process to export a take of a scene to
+its own file, see :class:`TakeExportPool`.
+
+This script is run on its own, it must not import the rest of the package.
+
+"""
+
+import json
+import os
+import traceback
+
+from pyfbsdk import FBApplication, FBFbxOptions
+
+JOB_ENVIRONMENT_VARIABLE = "TK_MOTIONBUILDER_TAKE_EXPORT_JOB"
+
+
+def export_take(source, take, destination):
+    """
+    Export a take of a scene file to its own file.
+
+    :param str source: Path to the scene file.
+    :param str take: Name of the take to export.
+    :param str destination: Path to export the take to.
+    """
+    app = FBApplication()
+    if not app.FileOpen(source, False):
+        raise RuntimeError("Could not open %s" % source)
+
+    options = FBFbxOptions(False)
+    options.ShowFileDialog = False
+    options.ShowOptionsDialog = False
+    found = False
+    for index in range(options.GetTakeCount()):
+        selected = options.GetTakeName(index) == take
+        options.SetTakeSelect(index, selected)
+        found = found or selected
+    if not found:
+        raise RuntimeError("Take %s not found in %s" % (take, source))
+
+    folder = os.path.dirname(destination)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    if not app.FileSave(destination, options):
+        raise RuntimeError("Could not save %s" % destination)
+
+
+def main():
+    with open(os.environ[JOB_ENVIRONMENT_VARIABLE], "r") as fh:
+        job = json.load(fh)
+
+    result = {"destination": job["destination"]}
+    try:
+        export_take(job["source"], job["take"], job["destination"])
+    except Exception:
+        result["error"] = traceback.format_exc()
+
+    with open(job["result"], "w") as fh:
+        json.dump(result, fh)
+
+    FBApplication().FileExit()
+
+
+# Motionbuilder runs the scripts given on its command line as __builtin__.
+if __name__ in ("__main__", "__builtin__", "builtins"):
+    main()
@@ -0,0 +1,357 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Fingerprints of the animation of the takes, to only publish the takes which
+changed.
+
+"""
+
+import hashlib
+import itertools
+import json
+import operator
+import os
+import struct
+import time
+
+import sgtk
+from pyfbsdk import FBAnimationNode, FBApplication, FBModel, FBSystem
+
+from .event_handlers import EventHandlerRegistry
+from .version_index import get_unversioned_path
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Size in bytes of the digests of the curves and takes.
+DIGEST_SIZE = 16
+
+# Enumerated attributes of the FBFCurveKey shaping the curve around the keys.
+KEY_MODE_ATTRIBUTES = (
+    "Interpolation",
+    "TangentMode",
+    "TangentClampMode",
+    "TangentConstantMode",
+    "TangentBreak",
+)
+
+# Numeric attributes of the FBFCurveKey shaping the curve around the keys.
+KEY_SHAPE_ATTRIBUTES = (
+    "LeftDerivative",
+    "RightDerivative",
+    "LeftTangentWeight",
+    "RightTangentWeight",
+    "Tension",
+    "Continuity",
+    "Bias",
+)
+
+# Getters of the attributes of a FBFCurveKey, as tuples.
+_get_key_modes = operator.attrgetter(*KEY_MODE_ATTRIBUTES)
+_get_key_shapes = operator.attrgetter(*KEY_SHAPE_ATTRIBUTES)
+
+
+def hash_curve(times, values, modes=(), shapes=()):
+    """
+    :param times: Sequence of the key times, in seconds.
+    :param values: Sequence of the key values.
+    :param modes: Sequence of the values of the :data:`KEY_MODE_ATTRIBUTES`
+        of the keys, one after the other, as integers.
+    :param shapes: Sequence of the values of the
+        :data:`KEY_SHAPE_ATTRIBUTES` of the keys, one after the other.
+    :returns: The digest of the keys of a curve.
+    """
+    count = len(times)
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(struct.pack("<I", count))
+    digest.update(struct.pack("<%dd" % count, *times))
+    digest.update(struct.pack("<%dd" % count, *values))
+    digest.update(struct.pack("<%dq" % len(modes), *modes))
+    digest.update(struct.pack("<%dd" % len(shapes), *shapes))
+    return digest.hexdigest()
+
+
+class TakeFingerprinter(object):
+    """
+    Computes fingerprints of takes from the digests of their curves.
+
+    The fingerprint of a take covers the set of its animated curves, named
+    after their object and property, and the keys of each curve. The digest
+    of each curve is kept along with a revision of the curve, and only
+    computed again when the revision changes, so fingerprinting again a scene
+    where a few curves were edited only reads the keys of those.
+    """
+
+    def __init__(self):
+        # (take, curve key) -> (revision, digest)
+        self._digests = {}
+        self.curves_read = 0
+
+    def fingerprint(self, take, curves):
+        """
+        Compute the fingerprint of a take.
+
+        :param str take: Name of the take.
+        :param curves: Iterable of ``(key, revision, read)`` tuples, one per
+            curve of the take. ``key`` is a string naming the curve,
+            ``revision`` any value changing when the curve changes, or None if
+            unknown, and ``read`` a callable returning the ``(times, values)``
+            of the keys of the curve, optionally followed by their ``modes``
+            and ``shapes``, see :func:`hash_curve`.
+        :returns: The hexadecimal fingerprint of the take.
+        """
+        lines = []
+        for key, revision, read in curves:
+            cached = self._digests.get((take, key))
+            if revision is not None and cached is not None and cached[0] == revision:
+                digest = cached[1]
+            else:
+                digest = hash_curve(*read())
+                self._digests[(take, key)] = (revision, digest)
+                self.curves_read += 1
+            lines.append("%s=%s" % (key, digest))
+
+        lines.sort()
+        fingerprint = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        fingerprint.update("\n".join(lines).encode("utf-8"))
+        return fingerprint.hexdigest()
+
+    def invalidate(self):
+        """
+        Discard the digests of all the curves.
+        """
+        self._digests = {}
+
+
+class SceneFingerprinter(TakeFingerprinter):
+    """
+    Fingerprints the takes of the Motionbuilder scene.
+
+    The revision of a curve is the number of its keys along with a counter
+    of the data changes notified for its animation node, so only the curves
+    edited since the last fingerprint are read again. The revisions are only
+    trusted once a data change was notified since the scene was loaded, all
+    the curves are read until then, in case the notifications aren't sent.
+    Opening or creating a file discards all the digests.
+    """
+
+    def __init__(self):
+        super(SceneFingerprinter, self).__init__()
+        # names of the animation nodes from the model root node -> number of
+        # changes notified
+        self._changes = {}
+        # whether a data change was notified since the scene was loaded
+        self._notified = False
+        self._paused = False
+        self._event_handlers = EventHandlerRegistry()
+        self._event_handlers.add(
+            FBSystem(), "OnConnectionDataNotify", self._on_data_change
+        )
+        app = FBApplication()
+        for event_name in ("OnFileNewCompleted", "OnFileOpenCompleted"):
+            self._event_handlers.add(app, event_name, self._on_file_change)
+
+    def fingerprint_takes(self, take_names):
+        """
+        Compute the fingerprints of takes of the scene.
+
+        :param take_names: Names of the takes.
+        :returns: A dictionary of the fingerprints, by take name.
+        """
+        start = time.perf_counter()
+        curves_read = self.curves_read
+
+        if not self._notified:
+            # the changes of the curves can't be told from their revisions.
+            self.invalidate()
+
+        system = FBSystem()
+        takes = dict((take.Name, take) for take in system.Scene.Takes)
+        current_take = system.CurrentTake
+        fingerprints = {}
+        # switching takes notifies data changes for all the animation nodes.
+        self._paused = True
+        try:
+            for name in take_names:
+                if name not in takes:
+                    continue
+                system.CurrentTake = takes[name]
+                fingerprints[name] = self.fingerprint(name, self._iter_curves())
+        finally:
+            system.CurrentTake = current_take
+            self._paused = False
+
+        logger.debug(
+            "Fingerprinted %d takes in %.3fs, %d curves read.",
+            len(fingerprints),
+            time.perf_counter() - start,
+            self.curves_read - curves_read,
+        )
+        return fingerprints
+
+    def close(self):
+        """
+        Stop tracking the changes of the scene.
+        """
+        self._event_handlers.remove_all()
+        self.invalidate()
+
+    def _iter_curves(self):
+        """
+        Iterate over the animated curves of the current take.
+
+        :yields: ``(key, revision, read)`` tuples, see
+            :meth:`TakeFingerprinter.fingerprint`.
+        """
+        for component in FBSystem().Scene.Components:
+            if not isinstance(component, FBModel):
+                continue
+            root = component.AnimationNode
+            nodes = [(root, (root.Name,))]
+            while nodes:
+                node, node_names = nodes.pop()
+                for child in node.Nodes:
+                    child_names = node_names + (child.Name,)
+                    nodes.append((child, child_names))
+                    fcurve = child.FCurve
+                    if fcurve is None:
+                        continue
+                    key_count = len(fcurve.Keys)
+                    if not key_count:
+                        continue
+                    revision = (key_count, self._changes.get(child_names, 0))
+                    yield (
+                        "/".join((component.LongName,) + child_names[1:]),
+                        revision,
+                        lambda fcurve=fcurve: _read_keys(fcurve),
+                    )
+
+    def _on_data_change(self, control, event):
+        """
+        Count the data changes of the animation nodes.
+        """
+        if self._paused:
+            return
+        plug = event.Plug
+        if isinstance(plug, FBAnimationNode):
+            # the names of the nodes up to the root node of the model, models
+            # with identical node names just have their curves read again.
+            names = []
+            node = plug
+            while node is not None:
+                names.append(node.Name)
+                node = node.Parent
+            key = tuple(reversed(names))
+            self._changes[key] = self._changes.get(key, 0) + 1
+            self._notified = True
+
+    def _on_file_change(self, control, event):
+        """
+        Discard the digests when another file is opened.
+        """
+        self._changes = {}
+        self._notified = False
+        self.invalidate()
+
+
+def _read_keys(fcurve):
+    """
+    :returns: The times, values, modes and shapes of the keys of a
+        ``FBFCurve``, see :func:`hash_curve`.
+    """
+    keys = fcurve.Keys
+    return (
+        [key.Time.GetSecondDouble() for key in keys],
+        [key.Value for key in keys],
+        list(itertools.chain.from_iterable(map(_get_key_modes, keys))),
+        list(itertools.chain.from_iterable(map(_get_key_shapes, keys))),
+    )
+
+
+class TakeManifest(object):
+    """
+    Json file recording the fingerprint of the takes last published, next
+    to their published files.
+
+    Takes are recorded by their publish path without its version number,
+    see :func:`get_unversioned_path`, so takes with the same name from
+    other scenes published to the same folder don't share an entry, while
+    the successive versions of a take do.
+    """
+
+    # Name of the manifest files.
+    FILE_NAME = "takes_manifest.json"
+
+    def __init__(self, path):
+        """
+        :param str path: Path to the manifest file.
+        """
+        self._path = path
+        try:
+            with open(path, "r") as fh:
+                self._takes = json.load(fh).get("takes", {})
+        except (IOError, OSError, ValueError, AttributeError):
+            self._takes = {}
+
+    @property
+    def path(self):
+        """
+        Path to the manifest file.
+        """
+        return self._path
+
+    def get_fingerprint(self, path):
+        """
+        :param str path: Path the take is published to, any version of it.
+        :returns: The fingerprint of the take when it was last published, or
+            None.
+        """
+        return self._takes.get(get_unversioned_path(path), {}).get("fingerprint")
+
+    def get_published_path(self, path):
+        """
+        :param str path: Path the take is published to, any version of it.
+        :returns: The path the take was last published to, or None.
+        """
+        return self._takes.get(get_unversioned_path(path), {}).get("path")
+
+    def set(self, path, fingerprint, take=None):
+        """
+        Record a published take.
+
+        :param str path: Path the take was published to.
+        :param str fingerprint: Fingerprint of the take.
+        :param str take: Optional name of the take, for reference.
+        """
+        self._takes[get_unversioned_path(path)] = {
+            "fingerprint": fingerprint,
+            "path": path,
+            "take": take,
+        }
+
+    def save(self):
+        """
+        Write the manifest.
+        """
+        sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(self._path))
+        tmp_path = "%s.%d.tmp" % (self._path, os.getpid())
+        with open(tmp_path, "w") as fh:
+            json.dump({"takes": self._takes}, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._path)
+
+
+def get_take_manifest(take_path):
+    """
+    :param str take_path: Path to a published take.
+    :returns: The :class:`TakeManifest` of the folder of the take.
+    """
+    return TakeManifest(
+        os.path.join(os.path.dirname(take_path), TakeManifest.FILE_NAME)
+    )
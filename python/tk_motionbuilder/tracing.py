@@ -0,0 +1,209 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Engine startup tracing, written in the Chrome trace event format.
+
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Environment variable enabling startup tracing. Its value is either the path
+# to the json file to write, a folder to write it in, or "1" to write it in
+# the temp folder.
+TRACE_ENV_VAR = "SGTK_MOTIONBUILDER_STARTUP_TRACE"
+
+
+class StartupTracer(object):
+    """
+    Records nested spans with their wall and CPU time, and writes them as a
+    Chrome trace json file which can be opened in ``chrome://tracing`` or
+    https://ui.perfetto.dev.
+    """
+
+    def __init__(self, path, wall_origin=None):
+        """
+        :param str path: Path to the json file to write.
+        :param float wall_origin: Optional :func:`time.perf_counter` value used
+            as the start of the trace. Defaults to now.
+        """
+        self._path = path
+        self._origin = wall_origin if wall_origin is not None else time.perf_counter()
+        self._events = []
+        self._stack = []
+        self._pid = os.getpid()
+        self._tid = threading.get_ident()
+        self._traced_function = None
+
+    @classmethod
+    def from_environment(cls, wall_origin=None):
+        """
+        Create a tracer if startup tracing is enabled in the environment.
+
+        :param float wall_origin: Optional :func:`time.perf_counter` value used
+            as the start of the trace.
+        :returns: A :class:`StartupTracer` or None if tracing is disabled.
+        """
+        value = os.environ.get(TRACE_ENV_VAR)
+        if not value or value.lower() in ("0", "false"):
+            return None
+
+        if value.lower() in ("1", "true"):
+            value = tempfile.gettempdir()
+        if os.path.isdir(value):
+            value = os.path.join(
+                value,
+                "tk-motionbuilder-startup-%s-%d.json"
+                % (time.strftime("%Y%m%d-%H%M%S"), os.getpid()),
+            )
+        return cls(value, wall_origin)
+
+    @property
+    def path(self):
+        """
+        Path to the json file the trace is written to.
+        """
+        return self._path
+
+    @contextlib.contextmanager
+    def span(self, name, category="engine"):
+        """
+        Context manager recording a span for the enclosed code.
+
+        :param str name: Name of the span.
+        :param str category: Category of the span.
+        """
+        self.begin(name, category)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def begin(self, name, category="engine"):
+        """
+        Open a span, nested in the currently opened one if any.
+
+        :param str name: Name of the span.
+        :param str category: Category of the span.
+        """
+        self._stack.append((name, category, time.perf_counter(), time.thread_time()))
+
+    def end(self):
+        """
+        Close the last opened span.
+        """
+        if not self._stack:
+            return
+        name, category, wall_start, cpu_start = self._stack.pop()
+        self.add_span(name, wall_start, cpu_start, category)
+
+    def add_span(self, name, wall_start, cpu_start, category="engine"):
+        """
+        Record a span which started in the past and ends now.
+
+        :param str name: Name of the span.
+        :param float wall_start: :func:`time.perf_counter` value at the start.
+        :param float cpu_start: :func:`time.thread_time` value at the start.
+        :param str category: Category of the span.
+        """
+        wall_end = time.perf_counter()
+        cpu_end = time.thread_time()
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (wall_start - self._origin) * 1e6,
+                "dur": (wall_end - wall_start) * 1e6,
+                "pid": self._pid,
+                "tid": self._tid,
+                "args": {
+                    "wall_ms": round((wall_end - wall_start) * 1e3, 3),
+                    "cpu_ms": round((cpu_end - cpu_start) * 1e3, 3),
+                },
+            }
+        )
+
+    def trace_calls(self, function_name, get_label, category="app"):
+        """
+        Record a span for each call to a function with the given name, until
+        :meth:`stop_tracing_calls` is called.
+
+        This relies on a profiling function, which slows down all Python calls
+        made in the meantime, so the spans recorded meanwhile are inflated.
+
+        :param str function_name: Name of the function to trace.
+        :param get_label: Callable receiving the frame of a call and returning
+            the name of its span, or None to skip it.
+        :param str category: Category of the spans.
+        """
+        skipped = set()
+
+        def profile(frame, event, arg):
+            if frame.f_code.co_name != function_name:
+                return
+            if event == "call":
+                label = get_label(frame)
+                if label is None:
+                    skipped.add(frame)
+                else:
+                    self.begin(label, category)
+            elif event == "return":
+                if frame in skipped:
+                    skipped.discard(frame)
+                else:
+                    self.end()
+
+        self._traced_function = function_name
+        sys.setprofile(profile)
+
+    def stop_tracing_calls(self):
+        """
+        Stop recording the calls started with :meth:`trace_calls`.
+        """
+        if self._traced_function:
+            sys.setprofile(None)
+            self._traced_function = None
+
+    def write(self):
+        """
+        Close any opened span and write the trace to disk.
+
+        :returns: The path to the written file.
+        """
+        self.stop_tracing_calls()
+        while self._stack:
+            self.end()
+
+        folder = os.path.dirname(self._path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        trace = {
+            "traceEvents": [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "args": {"name": "Motionbuilder"},
+                },
+            ]
+            + sorted(self._events, key=lambda e: (e["ts"], -e["dur"])),
+            "displayTimeUnit": "ms",
+        }
+        with open(self._path, "w") as fh:
+            json.dump(trace, fh, indent=1)
+        return self._path
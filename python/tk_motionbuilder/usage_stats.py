@@ -0,0 +1,372 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Local statistics of the commands usage.
+
+"""
+
+import contextlib
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+
+class CommandUsage(object):
+    """
+    Usage statistics of a single command.
+    """
+
+    def __init__(self, name):
+        """
+        :param str name: Name of the command.
+        """
+        self.name = name
+        self.count = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_used = 0.0
+
+    def add(self, count, total_duration, max_duration, last_used):
+        """
+        Add runs of the command.
+
+        :param int count: Number of runs.
+        :param float total_duration: Time in seconds spent running the command.
+        :param float max_duration: Longest run, in seconds.
+        :param float last_used: Time of the last run, in seconds since the
+            epoch.
+        """
+        self.count += count
+        self.total_duration += total_duration
+        self.max_duration = max(self.max_duration, max_duration)
+        self.last_used = max(self.last_used, last_used)
+
+    def get_rank(self, now, half_life):
+        """
+        Rank of the command in the recent commands: the number of runs, with
+        the weight of the runs halving every ``half_life`` seconds since the
+        command was last used.
+
+        :param float now: The current time, in seconds since the epoch.
+        :param float half_life: Time in seconds for the rank to halve.
+        :returns: The rank, higher is better.
+        """
+        return self.count * 0.5 ** (max(0.0, now - self.last_used) / half_life)
+
+    def to_dict(self):
+        """
+        :returns: A dictionary with the command statistics, the durations in
+            milliseconds.
+        """
+        return {
+            "name": self.name,
+            "count": self.count,
+            "avg_duration_ms": self.total_duration / (self.count or 1) * 1e3,
+            "max_duration_ms": self.max_duration * 1e3,
+            "last_used": time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(self.last_used)
+            ),
+        }
+
+
+class UsageStats(object):
+    """
+    Records the commands run, how often and how long they take, in a json
+    lines file shared by the Motionbuilder sessions.
+
+    Recording a command only updates the statistics in memory and queues it,
+    the file is written in batches from a background thread. Each command run
+    is appended to the file as a line, and once the file grows bigger than
+    its maximum size it is compacted to a single line per command, from the
+    lines written by all the sessions. Appending and compacting are done
+    holding a lock file, so the runs appended by other sessions aren't lost.
+    """
+
+    # Age in seconds of a lock file considered left by a session which
+    # crashed.
+    STALE_LOCK_AGE = 30.0
+
+    def __init__(self, path, max_size=512 * 1024, flush_interval=5.0, lock_timeout=5.0):
+        """
+        :param str path: Path to the json lines file.
+        :param int max_size: Size in bytes the file is compacted at.
+        :param float flush_interval: Maximum time in seconds the recorded runs
+            wait before being written.
+        :param float lock_timeout: Maximum time in seconds to wait for the
+            lock file held by another session.
+        """
+        self._path = path
+        self._lock_path = path + ".lock"
+        self._lock_timeout = lock_timeout
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._usages = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._load()
+
+    @property
+    def path(self):
+        """
+        Path to the json lines file the statistics are written to.
+        """
+        return self._path
+
+    def start(self):
+        """
+        Start the thread writing the recorded runs.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write_loop, name="tk-motionbuilder-usage-stats"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """
+        Write the pending runs and stop the writing thread.
+
+        :param float timeout: Maximum time in seconds to wait for the pending
+            runs to be written.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def record(self, name, duration):
+        """
+        Record a command run.
+
+        :param str name: Name of the command.
+        :param float duration: Time in seconds spent running the command.
+        """
+        now = time.time()
+        with self._lock:
+            self._get_usage(name).add(1, duration, duration, now)
+        self._queue.put({"name": name, "time": now, "duration": duration})
+
+    def get_recent(self, count=None, half_life=7 * 24 * 3600):
+        """
+        Return the commands used the most, recently.
+
+        :param int count: Maximum number of commands to return, all the
+            commands used if None.
+        :param float half_life: Time in seconds for the weight of a run to
+            halve, see :meth:`CommandUsage.get_rank`.
+        :returns: List of command names, best ranked first.
+        """
+        now = time.time()
+        with self._lock:
+            usages = sorted(
+                self._usages.values(),
+                key=lambda usage: usage.get_rank(now, half_life),
+                reverse=True,
+            )
+        return [usage.name for usage in usages[:count]]
+
+    def get_stats(self):
+        """
+        :returns: A list of dictionaries with the statistics of each command,
+            see :meth:`CommandUsage.to_dict`, slowest first.
+        """
+        with self._lock:
+            stats = [usage.to_dict() for usage in self._usages.values()]
+        return sorted(stats, key=lambda s: s["avg_duration_ms"], reverse=True)
+
+    def export(self, path):
+        """
+        Export the statistics, as a csv file if the path ends with ``.csv``,
+        as a json file otherwise.
+
+        :param str path: Path to the file to write.
+        """
+        stats = self.get_stats()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as fh:
+                writer = csv.DictWriter(
+                    fh,
+                    [
+                        "name",
+                        "count",
+                        "avg_duration_ms",
+                        "max_duration_ms",
+                        "last_used",
+                    ],
+                )
+                writer.writeheader()
+                writer.writerows(stats)
+        else:
+            with open(path, "w") as fh:
+                json.dump(stats, fh, indent=2)
+
+    def _get_usage(self, name):
+        """
+        :returns: The :class:`CommandUsage` for the given command.
+        """
+        if name not in self._usages:
+            self._usages[name] = CommandUsage(name)
+        return self._usages[name]
+
+    def _load(self):
+        """
+        Read the statistics recorded by the previous sessions.
+        """
+        self._usages = _read_usages(self._path)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """
+        Context manager holding the lock file shared by the sessions, created
+        exclusively.
+
+        :raises IOError: If the lock couldn't be acquired before the timeout.
+        """
+        deadline = time.time() + self._lock_timeout
+        while True:
+            try:
+                fd = os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self._lock_path) > (
+                        self.STALE_LOCK_AGE
+                    ):
+                        os.remove(self._lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.time() > deadline:
+                    raise IOError("%s is locked by another session" % self._lock_path)
+                time.sleep(0.05)
+        try:
+            os.close(fd)
+            yield
+        finally:
+            try:
+                os.remove(self._lock_path)
+            except OSError:
+                pass
+
+    def _write_loop(self):
+        """
+        Write the recorded runs in batches, until stopped.
+        """
+        stopped = False
+        while not stopped:
+            try:
+                batch = [self._queue.get(timeout=self._flush_interval)]
+            except queue.Empty:
+                continue
+
+            # gather the runs recorded meanwhile
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopped = True
+                batch = [run for run in batch if run is not None]
+            if batch:
+                self._write(batch)
+
+            if not stopped:
+                # wait a little for more runs, so they are written together.
+                time.sleep(min(self._flush_interval, 1.0))
+
+    def _write(self, batch):
+        """
+        Append runs to the file, compacting it if it is too big.
+
+        :param batch: List of dictionaries describing the runs.
+        """
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(self._path))
+            with self._file_lock():
+                with open(self._path, "a") as fh:
+                    fh.write("".join(json.dumps(run) + "\n" for run in batch))
+                    size = fh.tell()
+                if size > self._max_size:
+                    self._compact()
+        except (IOError, OSError) as e:
+            logger.debug(
+                "Could not write the usage statistics to %s: %s", self._path, e
+            )
+
+    def _compact(self):
+        """
+        Rewrite the file with a single line per command, from all the lines
+        of the file, the lock file being held.
+        """
+        usages = _read_usages(self._path)
+        lines = [
+            json.dumps(
+                {
+                    "name": usage.name,
+                    "count": usage.count,
+                    "total_duration": usage.total_duration,
+                    "max_duration": usage.max_duration,
+                    "last_used": usage.last_used,
+                }
+            )
+            + "\n"
+            for usage in usages.values()
+        ]
+        tmp_path = "%s.%d.tmp" % (self._path, os.getpid())
+        with open(tmp_path, "w") as fh:
+            fh.write("".join(lines))
+        os.replace(tmp_path, self._path)
+        logger.debug("Usage statistics compacted to %d commands.", len(lines))
+
+
+def _read_usages(path):
+    """
+    Read the statistics of a json lines file.
+
+    :param str path: Path to the file.
+    :returns: A dictionary of :class:`CommandUsage`, by command name.
+    """
+    usages = {}
+    try:
+        with open(path, "r") as fh:
+            lines = fh.readlines()
+    except (IOError, OSError):
+        return usages
+
+    for line in lines:
+        try:
+            data = json.loads(line)
+            usage = usages.get(data["name"]) or CommandUsage(data["name"])
+            if "count" in data:
+                # a line written when the file was compacted
+                usage.add(
+                    data["count"],
+                    data["total_duration"],
+                    data["max_duration"],
+                    data["last_used"],
+                )
+            else:
+                usage.add(1, data["duration"], data["duration"], data["time"])
+            usages[usage.name] = usage
+        except (ValueError, KeyError, TypeError):
+            # partially written line
+            continue
+    return usages
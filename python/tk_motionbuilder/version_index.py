@@ -0,0 +1,247 @@
+# Copyright (c) 2026 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Index of the versioned files of a folder.
+
+"""
+
+import os
+import re
+
+import sgtk
+
+logger = sgtk.platform.get_logger(__name__)
+
+# Version token recognized in file names without a work template, the same
+# formats as the publisher: filename.v###.ext, filename_v###.ext and
+# filename-v###.ext.
+VERSION_REGEX = re.compile(r"^(.*[._-]v)(\d+)(.*)$", re.IGNORECASE)
+
+
+class VersionIndex(object):
+    """
+    Lists the files of a folder once, so checking whether versions of a file
+    exist and finding the next free version doesn't require a file system
+    access per version, which is slow on network file systems.
+    """
+
+    def __init__(self, folder):
+        """
+        :param str folder: The folder to index.
+        """
+        self._folder = folder
+        self._mtime = None
+        # file names, by normalized case name
+        self._names = {}
+        self.refresh()
+
+    @property
+    def folder(self):
+        """
+        The indexed folder.
+        """
+        return self._folder
+
+    def refresh(self):
+        """
+        List the files of the folder again.
+        """
+        try:
+            self._mtime = os.stat(self._folder).st_mtime_ns
+            with os.scandir(self._folder) as entries:
+                self._names = dict(
+                    (os.path.normcase(entry.name), entry.name) for entry in entries
+                )
+        except OSError:
+            # the folder doesn't exist (yet)
+            self._mtime = None
+            self._names = {}
+
+    def is_stale(self):
+        """
+        :returns: True if files were added to or removed from the folder since
+            it was indexed, according to its modification time.
+        """
+        try:
+            mtime = os.stat(self._folder).st_mtime_ns
+        except OSError:
+            mtime = None
+        return mtime != self._mtime
+
+    def contains(self, path):
+        """
+        :param str path: Path to a file.
+        :returns: True if the file is in the indexed folder, rather than in
+            another version folder for example.
+        """
+        return _normalize_folder(os.path.dirname(path)) == _normalize_folder(
+            self._folder
+        )
+
+    def exists(self, path):
+        """
+        :param str path: Path to a file. Files outside the indexed folder are
+            checked on the file system.
+        :returns: True if the file exists.
+        """
+        if not self.contains(path):
+            return os.path.exists(path)
+        return os.path.normcase(os.path.basename(path)) in self._names
+
+    def add(self, path):
+        """
+        Record a file written to the indexed folder. Files outside the folder
+        are ignored.
+
+        :param str path: Path to the file.
+        """
+        if not self.contains(path):
+            return
+        name = os.path.basename(path)
+        self._names[os.path.normcase(name)] = name
+
+    def get_versions(self, path, work_template=None):
+        """
+        Find the versions of the given file in the folder.
+
+        :param str path: Path to a versioned file in the indexed folder.
+        :param work_template: Optional template the path matches, its
+            ``version`` field is used rather than the version token of the
+            file name.
+        :returns: A tuple with the version of the file and the set of the
+            versions found, or (None, None) if the path has no version.
+        """
+        if work_template is not None and work_template.validate(path):
+            fields = work_template.get_fields(path)
+            if "version" not in fields:
+                return None, None
+            versions = set()
+            for name in self._names.values():
+                other_path = os.path.join(self._folder, name)
+                if not work_template.validate(other_path):
+                    continue
+                other_fields = work_template.get_fields(other_path)
+                version = other_fields.pop("version", None)
+                if version is not None and _same_fields(fields, other_fields):
+                    versions.add(version)
+            return fields["version"], versions
+
+        match = VERSION_REGEX.match(os.path.basename(path))
+        if not match:
+            return None, None
+        prefix, digits, suffix = match.groups()
+        pattern = re.compile(
+            r"^%s(\d+)%s$"
+            % (
+                re.escape(os.path.normcase(prefix)),
+                re.escape(os.path.normcase(suffix)),
+            ),
+            re.IGNORECASE,
+        )
+        versions = set()
+        for name in self._names:
+            other_match = pattern.match(name)
+            if other_match:
+                versions.add(int(other_match.group(1)))
+        return int(digits), versions
+
+    def get_next_free_version(self, path, work_template=None):
+        """
+        Find the first version after the one of the given file which doesn't
+        exist, in the folder or in its own version folder.
+
+        :param str path: Path to a versioned file in the indexed folder.
+        :param work_template: Optional template the path matches.
+        :returns: A tuple with the path to the next free version and its
+            number, or (None, None) if the path has no version.
+        """
+        version, versions = self.get_versions(path, work_template)
+        if version is None:
+            return None, None
+
+        # versions in other folders, version folders for example, aren't
+        # indexed and are checked on the file system.
+        next_version = version + 1
+        while True:
+            next_path = self._get_version_path(path, next_version, work_template)
+            if next_version not in versions and not self.exists(next_path):
+                return next_path, next_version
+            next_version += 1
+
+    def _get_version_path(self, path, version, work_template=None):
+        """
+        :returns: The path to the given version of a file.
+        """
+        if work_template is not None and work_template.validate(path):
+            fields = work_template.get_fields(path)
+            fields["version"] = version
+            return work_template.apply_fields(fields)
+
+        prefix, digits, suffix = VERSION_REGEX.match(os.path.basename(path)).groups()
+        name = "%s%0*d%s" % (prefix, len(digits), version, suffix)
+        return os.path.join(os.path.dirname(path), name)
+
+
+def get_unversioned_path(path):
+    """
+    Return a path with the version number of its file name replaced with
+    ``#``, normalized so it can be used as a key, so all the versions of a
+    file share the same key.
+
+    :param str path: Path to a file.
+    :returns: The normalized path without version number.
+    """
+    folder, name = os.path.split(path)
+    match = VERSION_REGEX.match(name)
+    if match:
+        prefix, _, suffix = match.groups()
+        name = "%s#%s" % (prefix, suffix)
+    return os.path.normcase(os.path.join(folder, name))
+
+
+def _normalize_folder(folder):
+    """
+    :returns: The normalized path of a folder, to compare folders.
+    """
+    return os.path.normcase(os.path.normpath(folder))
+
+
+def _same_fields(fields, other_fields):
+    """
+    :returns: True if two sets of template fields are identical, ignoring the
+        version.
+    """
+    return all(
+        other_fields.get(key) == value
+        for key, value in fields.items()
+        if key != "version"
+    ) and all(key in fields for key in other_fields)
+
+
+def get_version_index(cache, folder):
+    """
+    Return the index of the given folder, listing it only if it isn't in the
+    cache or files were added or removed since it was indexed.
+
+    :param dict cache: Dictionary holding the indexes, the properties of a
+        publish item for example, so they are shared by the plugins.
+    :param str folder: The folder to index.
+    :returns: A :class:`VersionIndex`.
+    """
+    indexes = cache.setdefault("version_indexes", {})
+    key = _normalize_folder(folder)
+    index = indexes.get(key)
+    if index is None:
+        index = indexes[key] = VersionIndex(folder)
+    elif index.is_stale():
+        logger.debug("%s changed, indexing it again.", folder)
+        index.refresh()
+    return index